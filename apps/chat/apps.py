@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ChatConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.chat"
+
+    def ready(self):
+        import apps.chat.signals  # 시그널 연결
@@ -1,13 +1,48 @@
-import json
+import asyncio
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.contrib.auth import get_user_model
 
-from .models import GroupChatMembership, GroupChatMessage, GroupChatRoom
+from .models import GroupChatMembership, GroupChatMessage
+from .services.message_writer import (
+    ChatBackpressureError,
+    ChatWriteError,
+    get_message_writer,
+    get_write_behind_config,
+)
+from .services.presence import (
+    get_presence_config,
+    get_presence_notifier,
+    get_presence_store,
+)
+from .services.protocol import (
+    MSGPACK_SUBPROTOCOL,
+    decode,
+    encode,
+    encode_chat_frames,
+    encode_user_frame,
+)
+from .services.read_state import mark_read
 
 User = get_user_model()
 
+# 멤버십이 삭제되어 연결을 끊을 때 사용하는 종료 코드
+MEMBERSHIP_REVOKED_CLOSE_CODE = 4403
+
+# 읽음 처리를 모아서 저장하는 간격 (초)
+READ_FLUSH_INTERVAL = 2
+READ_LATEST = object()  # 마지막 메시지까지 읽음
+
+
+def room_group_name(room_id):
+    return f"chat_{room_id}"
+
+
+def member_group_name(room_id, user_id):
+    # 한 유저의 해당 방 연결만 모아두는 그룹 (멤버십 취소 알림용)
+    return f"chat_{room_id}_member_{user_id}"
+
 
 class GroupChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -20,96 +55,226 @@ class GroupChatConsumer(AsyncWebsocketConsumer):
             return
 
         # URL에서 room_id 추출 -> 그룹 이름 지정
-        self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
-        self.room_group_name = f"chat_{self.room_id}"
+        self.room_id = int(self.scope["url_route"]["kwargs"]["room_id"])
+        self.room_group_name = room_group_name(self.room_id)
+        self.member_group_name = member_group_name(self.room_id, self.user.id)
 
-        # 이 유저가 해당 방의 멤버인지 DB에서 확인
-        is_member = await database_sync_to_async(
-            GroupChatMembership.objects.filter(
-                room_id=self.room_id, user=self.user
-            ).exists
-        )()
+        self.write_behind = get_write_behind_config()["ENABLED"]
+        # msgpack 서브프로토콜을 요청한 연결은 바이너리 프레임 사용
+        self.binary = MSGPACK_SUBPROTOCOL in self.scope.get("subprotocols", [])
+        self.nicknames = {}  # 이 연결에 보낸 닉네임 사전 (user_id → 닉네임)
+        self.pending_read = None  # 저장 대기 중인 읽음 위치
+        self.read_flush_task = None
 
-        if not is_member:
+        # 이 유저가 해당 방의 멤버인지 연결할 때 한 번만 DB에서 확인
+        # 이후 멤버십이 삭제되면 membership_revoked 이벤트로 연결이 끊김
+        self.membership_id = await self.get_membership_id()
+        if self.membership_id is None:
             await self.close()  # 참여자가 아니면 연결 종료
             return
 
+        # 토큰 클레임에 닉네임이 없을 때만 DB에서 유저 조회
+        self.nickname = self.user.nickname
+        if self.nickname is None and hasattr(self.user, "aget_user"):
+            self.nickname = (await self.user.aget_user()).nickname
+
         # 채널 그룹에 참여
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name,
-        )
+        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
+        await self.channel_layer.group_add(self.member_group_name, self.channel_name)
 
         # 연결 수락
-        await self.accept()
+        await self.accept(subprotocol=MSGPACK_SUBPROTOCOL if self.binary else None)
+
+        # 접속 상태 등록, 처음 접속한 유저면 방 전체에 입장 변경분 전송 (모아서)
+        self.presence = get_presence_store()
+        if await self.presence.join(self.room_id, self.user.id):
+            get_presence_notifier().add(self.room_id, joined=[self.user.id])
+        self.heartbeat_task = asyncio.create_task(self.heartbeat())
+
+        # 현재 접속자 목록은 접속한 본인에게만 한 번 전송, 이후에는 변경분만 받음
+        await self.send_data(
+            {
+                "type": "presence",
+                "online": await self.presence.online_count(self.room_id),
+                "user_ids": await self.presence.online_user_ids(self.room_id),
+            }
+        )
 
     async def disconnect(self, close_code):
         """
         연결 종료 시 호출되는 메서드
         그룹에서 안전하게 퇴장 처리
         """
-        # self.room_group_name이 정의되어 있으면 제거
-        if hasattr(self, "room_group_name"):
+        # 접속 상태 해제, 마지막 연결이었으면 퇴장 변경분 전송
+        if getattr(self, "heartbeat_task", None) is not None:
+            self.heartbeat_task.cancel()
+            if await self.presence.leave(self.room_id, self.user.id):
+                get_presence_notifier().add(self.room_id, left=[self.user.id])
+
+        # 모아둔 읽음 처리가 있으면 바로 저장
+        if getattr(self, "read_flush_task", None) is not None:
+            self.read_flush_task.cancel()
+            await self.flush_read()
+
+        # 그룹에 참여한 상태일 때만 제거
+        if getattr(self, "membership_id", None) is not None:
             await self.channel_layer.group_discard(
-                self.room_group_name,
-                self.channel_name,
+                self.room_group_name, self.channel_name
+            )
+            await self.channel_layer.group_discard(
+                self.member_group_name, self.channel_name
             )
 
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """
         클라이언트로부터 메시지를 수신했을 때 호출됨
+        방과 멤버십은 연결 시 확인했으므로 메시지마다 INSERT 한 번만 실행 (지연 저장이면 여러 메시지를 모아 한 번)
         """
-        data = json.loads(text_data)
+        data = decode(text_data, bytes_data)
+        if data.get("type") == "read":
+            self.queue_read(data.get("message_id"))
+            return
         content = data.get("message", "")
-        user = self.scope["user"]
 
-        # 인증되지 않은 사용자 메시지 차단
-        if not user.is_authenticated:
-            await self.close()
+        # 메시지를 DB에 저장 (지연 저장이면 백그라운드에서 바로 저장, 동시에 들어온 메시지와는 함께 저장)
+        # 저장된 뒤에 전송해야 클라이언트가 받은 id로 after 조회, 읽음 처리를 할 수 있음
+        try:
+            message = await self.save_message(content)
+        except ChatBackpressureError:
+            await self.send_data(
+                {
+                    "error": "메시지가 많아 전송하지 못했습니다. 잠시 후 다시 시도해주세요."
+                }
+            )
+            return
+        except ChatWriteError:
+            await self.send_data({"error": "메시지를 저장하지 못했습니다."})
             return
 
-        # 메시지를 DB에 저장
-        await self.save_message(self.room_id, user, content)
-
-        # 그룹 내 모든 유저에게 메시지 전송
+        # 프레임은 여기서 한 번만 인코딩하고, 그룹 내 모든 유저에게 그대로 전송
+        text, binary = encode_chat_frames(
+            message.id,
+            self.user.id,
+            self.nickname,
+            content,
+            message.created_at.isoformat(),
+        )
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 "type": "chat_message",
-                "user_id": user.id,
-                "nickname": user.nickname,
-                "message": content,
+                "user_id": self.user.id,
+                "nickname": self.nickname,
+                "text": text,
+                "binary": binary,
             },
         )
 
     async def chat_message(self, event):
         """
-        그룹 메시지를 받아 클라이언트에 전송
+        그룹 메시지를 받아 클라이언트에 전송 (인코딩된 프레임을 그대로 보냄)
+        msgpack 연결에는 처음 보는 (또는 닉네임이 바뀐) 유저일 때만 닉네임을 먼저 보냄
         """
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "user_id": event["user_id"],
-                    "nickname": event["nickname"],
-                    "message": event["message"],
-                }
+        if not self.binary:
+            await self.send(text_data=event["text"])
+            return
+        user_id, nickname = event["user_id"], event["nickname"]
+        if user_id not in self.nicknames or self.nicknames[user_id] != nickname:
+            self.nicknames[user_id] = nickname
+            await self.send(bytes_data=encode_user_frame(user_id, nickname))
+        await self.send(bytes_data=event["binary"])
+
+    async def send_data(self, data):
+        """연결의 프로토콜에 맞게 인코딩해서 전송 (JSON 텍스트 또는 msgpack 바이너리)"""
+        if self.binary:
+            await self.send(bytes_data=encode(data, binary=True))
+        else:
+            await self.send(text_data=encode(data, binary=False))
+
+    def queue_read(self, message_id):
+        """
+        읽음 처리 요청을 READ_FLUSH_INTERVAL 동안 모아서 가장 뒤 위치만 한 번 저장
+        message_id가 없으면 채팅방의 마지막 메시지까지 읽음 처리
+        """
+        if message_id is None:
+            self.pending_read = READ_LATEST
+        elif isinstance(message_id, int) and message_id > 0:
+            if self.pending_read is not READ_LATEST:
+                self.pending_read = max(self.pending_read or 0, message_id)
+        else:
+            return
+        if self.read_flush_task is None:
+            self.read_flush_task = asyncio.create_task(self.flush_read_later())
+
+    async def flush_read_later(self):
+        await asyncio.sleep(READ_FLUSH_INTERVAL)
+        self.read_flush_task = None
+        await self.flush_read()
+
+    async def flush_read(self):
+        message_id = self.pending_read
+        self.pending_read = None
+        self.read_flush_task = None
+        if message_id is None:
+            return
+        await database_sync_to_async(mark_read)(
+            self.membership_id, None if message_id is READ_LATEST else message_id
+        )
+
+    async def presence_delta(self, event):
+        """
+        입장/퇴장 변경분과 현재 접속자 수를 클라이언트에 전송
+        """
+        await self.send_data(
+            {
+                "type": "presence",
+                "joined": event["joined"],
+                "left": event["left"],
+                "online": event["online"],
+            }
+        )
+
+    async def heartbeat(self):
+        """
+        연결이 살아 있는 동안 주기적으로 접속 상태를 갱신
+        프로세스가 비정상 종료되어 갱신이 끊긴 접속자는 TTL 후 정리해서 퇴장 처리
+        """
+        interval = get_presence_config()["HEARTBEAT_INTERVAL"]
+        while True:
+            await asyncio.sleep(interval)
+            await self.presence.heartbeat(self.room_id, self.user.id)
+            if expired := await self.presence.sweep(self.room_id):
+                get_presence_notifier().add(self.room_id, left=expired)
+
+    async def membership_revoked(self, event):
+        """
+        멤버십이 삭제되었다는 알림을 받으면 연결 종료
+        """
+        await self.close(code=MEMBERSHIP_REVOKED_CLOSE_CODE)
+
+    @database_sync_to_async
+    def get_membership_id(self):
+        return (
+            GroupChatMembership.objects.filter(
+                room_id=self.room_id, user_id=self.user.id
             )
+            .values_list("id", flat=True)
+            .first()
         )
 
+    async def save_message(self, content):
+        if self.write_behind:
+            saved = await get_message_writer().enqueue(
+                self.room_id, self.user.id, content
+            )
+            return await saved
+        return await self.create_message(content)
+
     @database_sync_to_async
-    def save_message(self, room_id, user, content):
+    def create_message(self, content):
         # 데이터베이스에 메시지 저장 (동기 -> 비동기 변환)
-        try:
-            room = GroupChatRoom.objects.get(id=room_id)
-        except GroupChatRoom.DoesNotExist:
-            raise ValueError("채팅방이 존재하지 않습니다.")
-
-        # user가 AnonymousUser가 아니면 그대로 사용
-        if user.is_authenticated:
-            return GroupChatMessage.objects.create(
-                room=room,
-                user=user,
-                content=content,
-            )
-        else:
-            raise ValueError("인증되지 않은 사용자입니다.")
+        return GroupChatMessage.objects.create(
+            room_id=self.room_id,
+            user_id=self.user.id,
+            content=content,
+        )
@@ -0,0 +1,16 @@
+from apps.chat.services.message_writer import close_message_writer
+
+
+async def lifespan_app(scope, receive, send):
+    """
+    ASGI lifespan 처리 (uvicorn 시작/종료 시 호출)
+    종료 시 저장 대기 중인 채팅 메시지를 모두 저장한 뒤 종료
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_message_writer()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.chat.models import GroupChatMessage
+from apps.chat.services.archive import archive_old_messages, get_archive_config
+
+
+class Command(BaseCommand):
+    help = "오래된 채팅 메시지를 방별 압축 보관 파일로 옮기고 테이블에서 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, help="이 기간(일)이 지난 메시지를 옮김 (기본: 설정값)"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="옮기지 않고 대상 수만 출력"
+        )
+
+    def handle(self, *args, **options):
+        config = get_archive_config()
+        if options["days"] is not None:
+            config["AFTER_DAYS"] = options["days"]
+
+        if options["dry_run"]:
+            cutoff = timezone.now() - timedelta(days=config["AFTER_DAYS"])
+            summary = GroupChatMessage.objects.filter(created_at__lt=cutoff).aggregate(
+                messages=Count("id"), rooms=Count("room_id", distinct=True)
+            )
+            self.stdout.write(
+                f"[dry-run] 채팅방 {summary['rooms']}개, 메시지 {summary['messages']}건"
+            )
+            return
+
+        moved = archive_old_messages(config)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"채팅방 {len(moved)}개, 메시지 {sum(moved.values())}건 보관 완료"
+            )
+        )
+
+
+# 명령어
+# python3 manage.py archive_chat_messages --days 90
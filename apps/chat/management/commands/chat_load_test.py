@@ -0,0 +1,87 @@
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.chat.services.load_test import (
+    compare_reports,
+    create_load_test_rooms,
+    delete_load_test_rooms,
+    run_load_test,
+)
+
+IN_MEMORY_CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "채팅방 N개 × 클라이언트 M명으로 웹소켓 채팅 부하 테스트를 실행하고 "
+        "처리량/전달 지연/메시지당 쿼리 수를 출력합니다. (테스트 데이터를 만들었다가 삭제하므로 운영 DB에서 실행 금지)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=10, help="채팅방 수")
+        parser.add_argument("--clients", type=int, default=10, help="방마다 접속자 수")
+        parser.add_argument(
+            "--messages", type=int, default=20, help="접속자마다 보낼 메시지 수"
+        )
+        parser.add_argument(
+            "--interval", type=float, default=0.0, help="메시지 전송 간격(초)"
+        )
+        parser.add_argument(
+            "--in-memory",
+            action="store_true",
+            help="설정과 상관없이 InMemoryChannelLayer와 프로세스 내 접속자 저장소 사용 (Redis 없이 실행)",
+        )
+        parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+        parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일 경로")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="기준 대비 허용하는 악화 비율 (0.2 = 20%%), 넘으면 실패",
+        )
+
+    def handle(self, *args, **options):
+        # 채널 레이어와 접속자 저장소(get_presence_store)가 함께 바뀌도록 설정째 교체
+        in_memory = (
+            override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+            if options["in_memory"]
+            else nullcontext()
+        )
+        with in_memory:
+            backend = settings.CHANNEL_LAYERS["default"]["BACKEND"].rsplit(".", 1)[-1]
+            fixture = create_load_test_rooms(options["rooms"], options["clients"])
+            try:
+                report = async_to_sync(run_load_test)(
+                    fixture,
+                    options["messages"],
+                    interval=options["interval"],
+                    channel_layer=backend,
+                ).to_dict()
+            finally:
+                delete_load_test_rooms(fixture)
+
+        self.stdout.write(json.dumps(report, indent=2))
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            rows = compare_reports(report, baseline, options["max_regression"])
+            for name, base, value, change, regressed in rows:
+                line = f"{name}: {base} → {value} ({change:+.1%})"
+                self.stdout.write(self.style.ERROR(line) if regressed else line)
+            if any(row[-1] for row in rows):
+                raise CommandError("기준 결과보다 성능이 나빠졌습니다.")
+
+
+# 명령어
+# python3 manage.py chat_load_test --rooms 10 --clients 20 --messages 50 --in-memory --output chat_load.json
+# python3 manage.py chat_load_test --baseline chat_load.json
@@ -5,30 +5,93 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from apps.chat.models import GroupChatMessage
+from apps.chat.models import ChatArchiveSegment, GroupChatMessage
+from apps.chat.services.archive import purge_archived_messages
 from apps.user.models import User
+from utils.purge import DEFAULT_BATCH_SIZE, BatchPurger
 
 
 class Command(BaseCommand):
-    help = "탈퇴한지 7일 이상 지난 유저의 채팅 메시지를 삭제합니다."
+    help = "탈퇴한지 7일 이상 지난 유저의 채팅 메시지를 삭제합니다. (보관 파일 포함)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="한 번에 삭제할 메시지 수",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=0.0, help="배치 사이 대기 시간(초)"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="삭제하지 않고 대상 수만 출력"
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="체크포인트를 지우고 처음부터 실행"
+        )
 
     def handle(self, *args, **options):
-        # 7일 전 시간 계산
-        cutoff_date = timezone.now() - timedelta(days=7)
+        # 7일 전 시간 계산 (날짜 단위로 잘라서 같은 날 다시 실행하면 체크포인트를 이어받음)
+        cutoff_date = timezone.localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=7)
 
-        # 7일 이상 지난 탈퇴 유저 조회
+        # 7일 이상 지난 탈퇴 유저의 메시지 (유저 조건은 서브쿼리로)
         users_to_cleanup = User.objects.filter(
             is_deleted=True, deleted_at__lte=cutoff_date
         )
+        messages = GroupChatMessage.objects.filter(
+            user_id__in=users_to_cleanup.values("id")
+        )
+
+        purger = BatchPurger(
+            "chat.old_messages",
+            messages,
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+        )
+        if options["reset"]:
+            purger.reset()
 
-        # 삭제 진행
-        for user in users_to_cleanup:
-            deleted_count, _ = GroupChatMessage.objects.filter(user=user).delete()
+        if options["dry_run"]:
+            segments = ChatArchiveSegment.objects.filter(
+                users__user_id__in=users_to_cleanup.values("id")
+            ).distinct()
             self.stdout.write(
-                self.style.SUCCESS(
-                    f"[삭제 완료] {user.email} - 삭제된 메시지 수: {deleted_count}"
-                )
+                f"[dry-run] 삭제 예정 메시지 수: {purger.estimate()} "
+                f"(체크포인트 id: {purger.get_checkpoint()}), "
+                f"정리할 보관 파일 수: {segments.count()}"
             )
+            return
+
+        def report(stats):
+            self.stdout.write(
+                f"[배치 {stats.batches}] 누적 {stats.deleted}건, "
+                f"마지막 id {stats.last_id}, {stats.rate:.0f}건/초"
+            )
+
+        stats = purger.run(on_batch=report)
+        # 보관 파일로 옮겨진 메시지도 삭제 (해당 유저가 있는 파일만 다시 씀)
+        archived = purge_archived_messages(users_to_cleanup.values("id"))
+        if archived:
+            self.stdout.write(f"[보관 파일] 메시지 {archived}건 삭제")
+        if stats.batches == 0:
+            if not archived:
+                self.stdout.write(self.style.WARNING("삭제할 메시지가 없습니다."))
+            return
+
+        resumed = (
+            f" (id {stats.resumed_from} 이후부터 이어서)" if stats.resumed_from else ""
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[삭제 완료] 메시지 {stats.deleted}건, 배치 {stats.batches}회, "
+                f"{stats.elapsed:.1f}초, {stats.rate:.0f}건/초{resumed}"
+            )
+        )
+
 
-        if not users_to_cleanup.exists():
-            self.stdout.write(self.style.WARNING("삭제 대상 유저가 없습니다."))
+# 명령어
+# python3 manage.py delete_old_messages --batch-size 1000 --sleep 0.1
+# python3 manage.py delete_old_messages --dry-run
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.chat.services.chatroom_service import sync_chat_memberships
+
+
+class Command(BaseCommand):
+    help = "모임 리더와 지원자가 모두 채팅방 멤버가 되도록 채팅방/멤버십을 채웁니다."
+
+    def handle(self, *args, **options):
+        count = sync_chat_memberships()
+        self.stdout.write(self.style.SUCCESS(f"멤버십 {count}건 확인 완료"))
+
+
+# 명령어
+# python3 manage.py sync_chat_memberships
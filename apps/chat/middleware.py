@@ -1,22 +1,75 @@
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs
 
-from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
 from rest_framework_simplejwt.tokens import AccessToken
 
 User = get_user_model()
 
 
-@database_sync_to_async
+class TokenPrincipal(TokenUser):
+    """
+    액세스 토큰 클레임(user_id, nickname, role 등)만으로 만든 유저 (DB 조회 없음)
+    클레임에 없는 필드가 필요할 때만 aget_user()로 DB에서 가져옴
+    """
+
+    _user = None
+
+    async def aget_user(self):
+        if self._user is None:
+            self._user = await User.objects.aget(id=self.id)
+        return self._user
+
+
+class VerifiedTokenCache:
+    """검증이 끝난 토큰 → TokenPrincipal (최근 사용 순 최대 maxsize개, ttl초 또는 토큰 만료까지)"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, token):
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return principal
+
+    def set(self, token, principal):
+        expires_at = min(time.time() + self.ttl, principal.token["exp"])
+        self._entries[token] = (principal, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
 def get_user_from_token(token):
+    # 재접속이 몰려도 같은 토큰은 다시 검증하지 않음
+    if (principal := verified_tokens.get(token)) is not None:
+        return principal
     try:
         access_token = AccessToken(token)
-        user_id = access_token["user_id"]
-        return User.objects.get(id=user_id)
-    except Exception:
+    except TokenError:
         return None
+    principal = TokenPrincipal(access_token)
+    verified_tokens.set(token, principal)
+    return principal
 
 
 class JWTAuthMiddleware(BaseMiddleware):
@@ -27,7 +80,7 @@ class JWTAuthMiddleware(BaseMiddleware):
 
         if token_list:
             token = token_list[0]
-            user = await get_user_from_token(token)
+            user = get_user_from_token(token)
             scope["user"] = user if user else AnonymousUser()
         else:
             scope["user"] = AnonymousUser()
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0002_remove_groupchatmembership_joined_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="groupchatmessage",
+            index=models.Index(
+                fields=["room", "-created_at", "-id"],
+                name="chat_groupc_room_id_683ed7_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0003_created_at_cursor_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="groupchatmessage",
+            index=models.Index(
+                fields=["room", "id"], name="chat_groupc_room_id_594e7b_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0004_groupchatmessage_room_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="groupchatmembership",
+            name="last_read_message_id",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
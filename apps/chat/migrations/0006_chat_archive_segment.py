@@ -0,0 +1,56 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0005_groupchatmembership_last_read_message_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatArchiveSegment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일자"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정일자"),
+                ),
+                ("first_message_id", models.PositiveBigIntegerField()),
+                ("last_message_id", models.PositiveBigIntegerField()),
+                ("message_count", models.PositiveIntegerField()),
+                ("path", models.CharField(max_length=255)),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archive_segments",
+                        to="chat.groupchatroom",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["room", "last_message_id"],
+                        name="chat_chatar_room_id_497ccc_idx",
+                    )
+                ],
+            },
+        ),
+    ]
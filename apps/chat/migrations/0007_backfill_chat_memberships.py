@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:10
+
+from django.db import migrations
+
+
+def backfill_chat_memberships(apps, schema_editor):
+    """기존 모임의 채팅방과 리더/지원자 멤버십을 채움 (없는 것만)"""
+    Meet = apps.get_model("meet", "Meet")
+    MeetApply = apps.get_model("meet", "MeetApply")
+    GroupChatRoom = apps.get_model("chat", "GroupChatRoom")
+    GroupChatMembership = apps.get_model("chat", "GroupChatMembership")
+
+    meets = Meet.objects.filter(is_deleted=False)
+    GroupChatRoom.objects.bulk_create(
+        [
+            GroupChatRoom(meet_id=meet_id)
+            for meet_id in meets.filter(groupchatroom__isnull=True).values_list(
+                "id", flat=True
+            )
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+    rooms = dict(GroupChatRoom.objects.values_list("meet_id", "id"))
+    members = set(meets.values_list("id", "user_id"))
+    members.update(
+        MeetApply.objects.filter(meet__is_deleted=False).values_list(
+            "meet_id", "user_id"
+        )
+    )
+    GroupChatMembership.objects.bulk_create(
+        [
+            GroupChatMembership(room_id=rooms[meet_id], user_id=user_id)
+            for meet_id, user_id in members
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0006_chat_archive_segment"),
+        ("meet", "0009_created_at_cursor_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_chat_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:40
+
+from django.db import migrations
+
+FTS_TABLE = "chat_message_fts"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    채팅 메시지 검색 인덱스 (INSERT/DELETE 시 DB가 함께 갱신)
+    - PostgreSQL: pg_trgm GIN 인덱스 (대소문자 무시 검색용)
+    - SQLite: FTS5 trigram 테이블 + 트리거
+    """
+    table = apps.get_model("chat", "GroupChatMessage")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Django의 icontains는 UPPER(content) LIKE UPPER(%s)로 변환되므로 같은 식으로 색인
+        schema_editor.execute(
+            f"CREATE INDEX chat_message_content_trgm ON {table} "
+            "USING gin ((UPPER(content::text)) gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"content, content='{table}', content_rowid='id', tokenize='trigram')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); "
+            "END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) "
+            "VALUES ('delete', old.id, old.content); "
+            "END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF content ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) "
+            "VALUES ('delete', old.id, old.content); "
+            f"INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content); "
+            "END"
+        )
+        # 기존 메시지 색인
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS chat_message_content_trgm")
+    elif vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0007_backfill_chat_memberships"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
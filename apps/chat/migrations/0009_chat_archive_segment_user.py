@@ -0,0 +1,62 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:35
+
+import gzip
+import json
+
+import django.db.models.deletion
+from django.core.files.storage import storages
+from django.db import migrations, models
+
+
+def backfill_segment_users(apps, schema_editor):
+    """이미 만든 보관 파일을 읽어 구간마다 메시지를 쓴 유저를 채움"""
+    ChatArchiveSegment = apps.get_model("chat", "ChatArchiveSegment")
+    ChatArchiveSegmentUser = apps.get_model("chat", "ChatArchiveSegmentUser")
+
+    for segment_id, path in ChatArchiveSegment.objects.values_list("id", "path"):
+        with storages["chat_archive"].open(path, "rb") as f:
+            lines = gzip.decompress(f.read()).decode().splitlines()
+        ChatArchiveSegmentUser.objects.bulk_create(
+            [
+                ChatArchiveSegmentUser(segment_id=segment_id, user_id=user_id)
+                for user_id in {json.loads(line)["user_id"] for line in lines}
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0008_message_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatArchiveSegmentUser",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_id", models.PositiveBigIntegerField(db_index=True)),
+                (
+                    "segment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="users",
+                        to="chat.chatarchivesegment",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("segment", "user_id")},
+            },
+        ),
+        migrations.RunPython(backfill_segment_users, migrations.RunPython.noop),
+    ]
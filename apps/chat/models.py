@@ -18,6 +18,8 @@ class GroupChatMembership(TimestampModel):
         GroupChatRoom, on_delete=models.CASCADE, related_name="members"
     )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # 마지막으로 읽은 메시지 id (메시지가 정리되어도 남도록 FK가 아닌 값으로 저장)
+    last_read_message_id = models.PositiveBigIntegerField(default=0)
 
     class Meta:
         unique_together = ("room", "user")  # 같은 유저가 중복 입장 못하도록 제한
@@ -34,5 +36,42 @@ class GroupChatMessage(TimestampModel):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["room", "-created_at", "-id"]),
+            models.Index(fields=["room", "id"]),  # 채팅 기록 before/after 조회
+        ]
+
     def __str__(self):
         return f"[{self.timestamp}] {self.user.username}: {self.content}"
+
+
+# 오래되어 보관(archive) 파일로 옮긴 메시지 구간
+# 파일은 한 번 쓰면 바꾸지 않고, 방마다 id 순서대로 구간이 이어짐
+# (탈퇴 유저 메시지를 지울 때는 남은 메시지로 새 파일을 만들어 path를 바꿈)
+class ChatArchiveSegment(TimestampModel):
+    room = models.ForeignKey(
+        GroupChatRoom, on_delete=models.CASCADE, related_name="archive_segments"
+    )
+    first_message_id = models.PositiveBigIntegerField()
+    last_message_id = models.PositiveBigIntegerField()
+    message_count = models.PositiveIntegerField()
+    path = models.CharField(max_length=255)  # 저장소 내 경로 (gzip JSONL)
+
+    class Meta:
+        indexes = [models.Index(fields=["room", "last_message_id"])]
+
+    def __str__(self):
+        return f"{self.room_id}: {self.first_message_id}~{self.last_message_id}"
+
+
+# 보관 구간에 메시지가 있는 유저 (탈퇴 유저 메시지를 지울 때 파일을 열어볼 구간만 찾음)
+class ChatArchiveSegmentUser(models.Model):
+    segment = models.ForeignKey(
+        ChatArchiveSegment, on_delete=models.CASCADE, related_name="users"
+    )
+    # 유저가 완전히 삭제되어도 남도록 FK가 아닌 값으로 저장
+    user_id = models.PositiveBigIntegerField(db_index=True)
+
+    class Meta:
+        unique_together = ("segment", "user_id")
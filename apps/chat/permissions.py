@@ -0,0 +1,25 @@
+from django.shortcuts import get_object_or_404
+from rest_framework.permissions import BasePermission
+
+from apps.chat.models import GroupChatMembership, GroupChatRoom
+
+
+class IsChatRoomMember(BasePermission):
+    """
+    URL의 room_id 채팅방 멤버만 허용 (멤버십 id는 view.membership_id에 담아둠)
+    멤버가 아닐 때만 채팅방 존재 여부를 확인해 없는 방이면 404
+    """
+
+    message = "접근 권한이 없습니다."
+
+    def has_permission(self, request, view):
+        room_id = view.kwargs["room_id"]
+        view.membership_id = (
+            GroupChatMembership.objects.filter(room_id=room_id, user=request.user)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if view.membership_id is None:
+            get_object_or_404(GroupChatRoom, id=room_id)
+            return False
+        return True
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.chat.models import GroupChatMessage, GroupChatRoom
+from apps.chat.models import GroupChatMembership, GroupChatMessage, GroupChatRoom
 
 
 class GroupChatRoomSerializer(serializers.ModelSerializer):
@@ -10,10 +10,56 @@ class GroupChatRoomSerializer(serializers.ModelSerializer):
 
 
 class GroupChatMessageSerializer(serializers.ModelSerializer):
-    user_id = serializers.IntegerField(source="user.id", read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
     nickname = serializers.CharField(source="user.nickname", read_only=True)
     created_at = serializers.DateTimeField(read_only=True)  # TimestampModel에서 상속됨
 
     class Meta:
         model = GroupChatMessage
         fields = ["id", "user_id", "nickname", "content", "created_at"]
+
+
+# 채팅 검색 결과 (message_search.search_messages가 붙인 rank/snippet 사용)
+class GroupChatMessageSearchSerializer(GroupChatMessageSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)  # 검색어를 <mark>로 감싼 HTML
+
+    class Meta(GroupChatMessageSerializer.Meta):
+        fields = GroupChatMessageSerializer.Meta.fields + ["rank", "snippet"]
+
+
+class ReadMessageSerializer(serializers.Serializer):
+    # 비우면 채팅방의 마지막 메시지까지 읽음 처리
+    message_id = serializers.IntegerField(min_value=1, required=False)
+
+
+# 내 채팅방 목록 (read_state.my_rooms의 annotate 값 사용)
+class MyChatRoomSerializer(serializers.ModelSerializer):
+    room_id = serializers.IntegerField(read_only=True)
+    meet_id = serializers.IntegerField(source="room.meet_id", read_only=True)
+    meet_title = serializers.CharField(source="room.meet.title", read_only=True)
+    last_message = serializers.SerializerMethodField()
+    unread_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = GroupChatMembership
+        fields = [
+            "room_id",
+            "meet_id",
+            "meet_title",
+            "last_read_message_id",
+            "last_message",
+            "unread_count",
+        ]
+
+    def get_last_message(self, obj):
+        if obj.last_message_id is None:
+            return None
+        return {
+            "id": obj.last_message_id,
+            "user_id": obj.last_message_user_id,
+            "content": obj.last_message_content,
+            "created_at": serializers.DateTimeField().to_representation(
+                obj.last_message_created_at
+            ),
+        }
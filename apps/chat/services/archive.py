@@ -0,0 +1,241 @@
+import gzip
+import hashlib
+import json
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.chat.models import (
+    ChatArchiveSegment,
+    ChatArchiveSegmentUser,
+    GroupChatMessage,
+)
+
+DEFAULT_ARCHIVE = {
+    "AFTER_DAYS": 90,  # 이 기간이 지난 메시지를 보관 파일로 옮김
+    "SEGMENT_SIZE": 1000,  # 파일 하나에 담을 최대 메시지 수
+    "PATH_PREFIX": "chat-archive",  # 저장소 내 경로
+}
+SEGMENT_CACHE_SIZE = (
+    64  # 프로세스마다 압축을 풀어 둘 파일 수 (같은 이름이면 내용도 같음)
+)
+
+
+def get_archive_config():
+    return {**DEFAULT_ARCHIVE, **getattr(settings, "CHAT_ARCHIVE", {})}
+
+
+def get_archive_storage():
+    """보관 파일 전용 저장소 (공개 URL이 없는 비공개 저장소, settings.STORAGES["chat_archive"])"""
+    return storages["chat_archive"]
+
+
+def encode_segment(rows):
+    """메시지 목록을 한 줄에 하나씩 JSON으로 쓰고 gzip 압축"""
+    lines = (
+        json.dumps(
+            {
+                "id": row["id"],
+                "user_id": row["user_id"],
+                "content": row["content"],
+                "created_at": row["created_at"].isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        for row in rows
+    )
+    return gzip.compress("\n".join(lines).encode(), mtime=0)
+
+
+def archivable_rooms(cutoff):
+    """cutoff 이전 메시지가 있는 방마다 (room_id, 옮길 마지막 메시지 id)"""
+    return (
+        GroupChatMessage.objects.filter(created_at__lt=cutoff)
+        .values("room_id")
+        .annotate(until_id=Max("id"))
+        .values_list("room_id", "until_id")
+    )
+
+
+def archive_room(room_id, until_id, config=None):
+    """
+    방의 until_id 이하 메시지를 SEGMENT_SIZE개씩 보관 파일로 옮기고 옮긴 수를 반환
+    id 순서대로 옮기므로 방마다 보관된 메시지는 항상 실시간 테이블의 메시지보다 앞 구간
+    """
+    config = config or get_archive_config()
+    moved = 0
+    while True:
+        rows = list(
+            GroupChatMessage.objects.filter(room_id=room_id, id__lte=until_id)
+            .order_by("id")
+            .values("id", "user_id", "content", "created_at")[: config["SEGMENT_SIZE"]]
+        )
+        if not rows:
+            return moved
+
+        first, last = rows[0]["id"], rows[-1]["id"]
+        # 파일을 먼저 저장하고, 구간 기록과 메시지 삭제는 한 트랜잭션으로 처리
+        # (중간에 실패하면 파일을 지우고 메시지는 그대로 남겨 다음 실행에서 다시 옮김)
+        path = save_segment_file(room_id, first, last, rows, config)
+        try:
+            with transaction.atomic():
+                segment = ChatArchiveSegment.objects.create(
+                    room_id=room_id,
+                    first_message_id=first,
+                    last_message_id=last,
+                    message_count=len(rows),
+                    path=path,
+                )
+                ChatArchiveSegmentUser.objects.bulk_create(
+                    ChatArchiveSegmentUser(segment=segment, user_id=user_id)
+                    for user_id in {row["user_id"] for row in rows}
+                )
+                GroupChatMessage.objects.filter(
+                    room_id=room_id, id__gte=first, id__lte=last
+                ).delete()
+        except Exception:
+            get_archive_storage().delete(path)
+            raise
+        moved += len(rows)
+
+
+def save_segment_file(room_id, first, last, rows, config):
+    """
+    보관 파일 저장, 이름에 내용 해시를 붙여 다른 내용이 같은 이름을 다시 쓰지 않음
+    (탈퇴 유저 삭제로 다시 쓴 파일을 read_segment 캐시가 예전 내용으로 돌려주지 않도록)
+    """
+    content = encode_segment(rows)
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    return get_archive_storage().save(
+        f"{config['PATH_PREFIX']}/{room_id}/{first:012d}-{last:012d}-{digest}.jsonl.gz",
+        ContentFile(content),
+    )
+
+
+def archive_old_messages(config=None):
+    """AFTER_DAYS가 지난 메시지를 방별로 보관 파일로 옮기고 {room_id: 옮긴 수} 반환"""
+    config = config or get_archive_config()
+    cutoff = timezone.now() - timedelta(days=config["AFTER_DAYS"])
+    return {
+        room_id: archive_room(room_id, until_id, config)
+        for room_id, until_id in list(archivable_rooms(cutoff))
+    }
+
+
+def purge_archived_messages(user_ids, config=None):
+    """
+    user_ids(유저 id 목록 또는 values 쿼리셋) 유저의 메시지를 보관 파일에서 지우고 지운 수 반환
+    해당 유저가 있는 구간만 골라, 남은 메시지로 새 파일을 만들어 구간의 경로를 바꾸고
+    이전 파일은 커밋 후 삭제 (남은 메시지가 없으면 구간째 삭제)
+    """
+    config = config or get_archive_config()
+    users = ChatArchiveSegmentUser.objects.filter(user_id__in=user_ids)
+    targets = set(users.values_list("user_id", flat=True))
+    if not targets:
+        return 0
+
+    removed = 0
+    segments = ChatArchiveSegment.objects.filter(
+        id__in=users.values("segment_id")
+    ).order_by("id")
+    for segment in segments:
+        rows = read_segment(segment.path)
+        kept = [
+            {**row, "created_at": parse_datetime(row["created_at"])}
+            for row in rows
+            if row["user_id"] not in targets
+        ]
+        removed += len(rows) - len(kept)
+        if not kept:
+            segment.delete()  # 파일은 시그널에서 커밋 후 삭제
+            continue
+
+        path = save_segment_file(
+            segment.room_id,
+            segment.first_message_id,
+            segment.last_message_id,
+            kept,
+            config,
+        )
+        try:
+            with transaction.atomic():
+                ChatArchiveSegment.objects.filter(id=segment.id).update(
+                    path=path, message_count=len(kept), updated_at=timezone.now()
+                )
+                segment.users.filter(user_id__in=targets).delete()
+                transaction.on_commit(
+                    lambda old=segment.path: get_archive_storage().delete(old)
+                )
+        except Exception:
+            get_archive_storage().delete(path)
+            raise
+    return removed
+
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def read_segment(path):
+    with get_archive_storage().open(path, "rb") as f:
+        data = gzip.decompress(f.read())
+    return tuple(json.loads(line) for line in data.decode().splitlines())
+
+
+def get_archived_messages(
+    room_id, before=None, after=None, limit=50, newest_first=False
+):
+    """
+    보관 파일에서 id 범위의 메시지를 limit개까지 읽음 (저장되지 않은 GroupChatMessage 목록)
+    구간 인덱스로 겹치는 파일만 골라서 필요한 만큼만 압축을 품
+    """
+    segments = ChatArchiveSegment.objects.filter(room_id=room_id)
+    if after is not None:
+        segments = segments.filter(last_message_id__gt=after)
+    if before is not None:
+        segments = segments.filter(first_message_id__lt=before)
+    order = "-last_message_id" if newest_first else "last_message_id"
+    # 파일마다 메시지가 1개 이상이므로 limit개 파일이면 충분
+    paths = segments.order_by(order).values_list("path", flat=True)[:limit]
+
+    rows = []
+    for path in paths:
+        segment = read_segment(path)
+        for row in reversed(segment) if newest_first else segment:
+            if after is not None and row["id"] <= after:
+                continue
+            if before is not None and row["id"] >= before:
+                continue
+            rows.append(row)
+            if len(rows) == limit:
+                return to_messages(room_id, rows)
+    return to_messages(room_id, rows)
+
+
+def to_messages(room_id, rows):
+    """보관된 메시지에 현재 작성자 정보를 붙여 GroupChatMessage로 변환 (쿼리 한 번)"""
+    if not rows:
+        return []
+    User = get_user_model()
+    users = User.objects.only("id", "nickname").in_bulk(
+        {row["user_id"] for row in rows}
+    )
+    messages = []
+    for row in rows:
+        message = GroupChatMessage(
+            id=row["id"],
+            room_id=room_id,
+            content=row["content"],
+            created_at=parse_datetime(row["created_at"]),
+        )
+        # 보관 후 완전히 삭제된 유저는 닉네임 없이 표시
+        message.user = users.get(row["user_id"]) or User(
+            id=row["user_id"], nickname=None
+        )
+        messages.append(message)
+    return messages
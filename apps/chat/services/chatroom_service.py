@@ -1,20 +1,106 @@
+from django.db import transaction
+
 from apps.chat.models import GroupChatMembership, GroupChatRoom
-from apps.meet.models import MeetApply
+from apps.meet.models import Meet, MeetApply
+
+SYNC_CHUNK_SIZE = 500  # 멤버십 일괄 동기화 시 한 번에 처리할 모임 수
+
 
+class ChatRoomNotFoundError(Exception):
+    """모임이 없거나 삭제됨"""
+
+
+def ensure_chatroom(meet_id):
+    """모임의 채팅방 id (없으면 생성)"""
+    room_id = (
+        GroupChatRoom.objects.filter(meet_id=meet_id)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if room_id is None:
+        room_id = GroupChatRoom.objects.get_or_create(meet_id=meet_id)[0].id
+    return room_id
 
-#  채팅방이 없는 경우 새로 만들고, 해당 유저를 참여자로 추가하는 로직
-def join_or_create_chatroom(user, meet):
-    # 채팅방이 없으면 만들고, 이미 있으면 가져옴
-    room, created = GroupChatRoom.objects.get_or_create(meet=meet)
 
-    # 해당 유저가 모임에 참여한 상태인지 확인
-    is_participant = MeetApply.objects.filter(user=user, meet=meet).exists() or (
-        meet.user == user
+def add_chat_members(meet_id, user_ids):
+    """
+    모임 채팅방에 멤버를 추가하고 채팅방 id 반환 (채팅방이 없으면 생성)
+    이미 멤버인 유저는 무시 (INSERT ... ON CONFLICT DO NOTHING)
+    모임 생성(리더)과 모임 지원 시 같은 트랜잭션에서 호출
+    """
+    room_id = ensure_chatroom(meet_id)
+    GroupChatMembership.objects.bulk_create(
+        [GroupChatMembership(room_id=room_id, user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
     )
-    if not is_participant:
-        raise PermissionError("모임에 참여하지 않은 유저는 채팅에 참여할 수 없습니다.")
+    return room_id
+
+
+def join_chatroom(user, meet_id):
+    """
+    모임 채팅방에 입장하고 채팅방 id 반환
+    멤버십은 모임 생성/지원 시 함께 만들어지므로 보통은 조회 한 번으로 끝남
+    멤버십이 없을 때만 (이전 데이터 등) 모임 참여 여부를 확인하고 한 트랜잭션에서 추가
+    """
+    room_id = (
+        GroupChatMembership.objects.filter(
+            room__meet_id=meet_id, room__meet__is_deleted=False, user=user
+        )
+        .values_list("room_id", flat=True)
+        .first()
+    )
+    if room_id is not None:
+        return room_id
+
+    with transaction.atomic():
+        leader_id = (
+            Meet.objects.filter(id=meet_id).values_list("user_id", flat=True).first()
+        )
+        if leader_id is None:
+            raise ChatRoomNotFoundError()
+        if (
+            leader_id != user.id
+            and not MeetApply.objects.filter(meet_id=meet_id, user=user).exists()
+        ):
+            raise PermissionError(
+                "모임에 참여하지 않은 유저는 채팅에 참여할 수 없습니다."
+            )
+        return add_chat_members(meet_id, [user.id])
+
 
-    # 채팅방 참여 정보 생성 (중복 방지)
-    GroupChatMembership.objects.get_or_create(user=user, room=room)
+def sync_chat_memberships(meet_ids=None):
+    """
+    모임 리더와 지원자가 모두 채팅방 멤버가 되도록 채팅방/멤버십을 일괄로 채움 (없는 것만 추가)
+    meet_ids가 없으면 삭제되지 않은 전체 모임, 추가를 시도한 멤버십 수를 반환
+    """
+    meets = Meet.objects.all()
+    if meet_ids is not None:
+        meets = meets.filter(id__in=meet_ids)
+    meet_ids = list(meets.order_by("id").values_list("id", flat=True))
 
-    return room  # 프론트엔드에 room 정보 리턴
+    total = 0
+    for start in range(0, len(meet_ids), SYNC_CHUNK_SIZE):
+        chunk = meet_ids[start : start + SYNC_CHUNK_SIZE]
+        GroupChatRoom.objects.bulk_create(
+            [GroupChatRoom(meet_id=meet_id) for meet_id in chunk],
+            ignore_conflicts=True,
+        )
+        rooms = dict(
+            GroupChatRoom.objects.filter(meet_id__in=chunk).values_list("meet_id", "id")
+        )
+        members = set(Meet.objects.filter(id__in=chunk).values_list("id", "user_id"))
+        members.update(
+            MeetApply.objects.filter(meet_id__in=chunk).values_list(
+                "meet_id", "user_id"
+            )
+        )
+        GroupChatMembership.objects.bulk_create(
+            [
+                GroupChatMembership(room_id=rooms[meet_id], user_id=user_id)
+                for meet_id, user_id in members
+            ],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        total += len(members)
+    return total
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+
+from asgiref.testing import ApplicationCommunicator
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+from apps.chat.models import GroupChatMembership, GroupChatRoom
+from apps.chat.routing import websocket_urlpatterns
+from apps.chat.services.message_writer import close_message_writer
+from apps.meet.models import Meet
+
+User = get_user_model()
+
+RECEIVE_TIMEOUT = 30  # 초. 메시지 하나를 기다리는 최대 시간
+# 기준 결과와 비교할 지표 (True면 클수록 좋음)
+COMPARED_METRICS = {
+    "messages_per_sec": True,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "queries_per_message": False,
+}
+
+
+# channels.testing.WebsocketCommunicator는 daphne가 필요해서 asgiref로 같은 동작을 구성
+class WebsocketClient(ApplicationCommunicator):
+    def __init__(self, user, path, subprotocols=()):
+        scope = {
+            "type": "websocket",
+            "path": path,
+            "user": user,
+            "subprotocols": list(subprotocols),
+        }
+        super().__init__(URLRouter(websocket_urlpatterns), scope)
+
+    async def connect(self, timeout=1):
+        await self.send_input({"type": "websocket.connect"})
+        message = await self.receive_output(timeout)
+        self.subprotocol = message.get("subprotocol")
+        return message["type"] == "websocket.accept"
+
+    async def send_json(self, data):
+        await self.send_input({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self, type=None, timeout=1):
+        # type을 지정하지 않으면 접속자(presence) 알림은 건너뜀
+        while True:
+            data = json.loads((await self.receive_output(timeout))["text"])
+            if data.get("type") == type or (type is None and "type" not in data):
+                return data
+
+    async def disconnect(self):
+        await self.send_input({"type": "websocket.disconnect", "code": 1000})
+        await self.wait()
+
+
+class QueryCounter:
+    """
+    실행된 쿼리 수를 스레드와 상관없이 셈
+    (database_sync_to_async는 이벤트 루프와 다른 스레드의 연결을 쓰므로
+    CaptureQueriesContext로는 셀 수 없음)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _add(self, connection):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+            self._connections.append(connection)
+
+    def _on_connection_created(self, sender, connection, **kwargs):
+        self._add(connection)
+
+    def _add_current(self):
+        self._add(connections["default"])
+
+    async def __aenter__(self):
+        # DB 작업이 실행되는 스레드의 연결 + 이후 새로 열리는 연결
+        await database_sync_to_async(self._add_current)()
+        connection_created.connect(self._on_connection_created)
+        return self
+
+    async def __aexit__(self, *exc):
+        connection_created.disconnect(self._on_connection_created)
+        for connection in self._connections:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+
+@dataclass
+class LoadTestReport:
+    channel_layer: str
+    rooms: int
+    clients_per_room: int
+    messages_per_client: int
+    sent: int = 0
+    delivered: int = 0
+    errors: int = 0  # 저장 대기열이 가득 차 거부된 메시지 수
+    elapsed: float = 0.0  # 초. 첫 전송부터 마지막 수신까지
+    messages_per_sec: float = 0.0  # 초당 전달된 메시지 수 (받는 사람 기준)
+    latency_ms: dict = field(default_factory=dict)  # 전송 → 수신 지연 백분위수
+    db_queries: int = 0  # 전송 시작부터 지연 저장이 모두 끝날 때까지
+    queries_per_message: float = 0.0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def percentile(values, p):
+    """정렬된 목록의 p 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(p / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def create_load_test_rooms(rooms, clients_per_room):
+    """부하 테스트용 유저/모임/채팅방/멤버십을 만들고 [(room_id, [user, ...]), ...] 반환"""
+    prefix = f"lt{uuid.uuid4().hex[:8]}"
+    users = User.objects.bulk_create(
+        User(
+            email=f"{prefix}-{i}@loadtest.local",
+            nickname=f"{prefix}-{i}",
+            password="!",  # 로그인 불가
+        )
+        for i in range(rooms * clients_per_room)
+    )
+    deadline = timezone.now() + timedelta(days=1)
+    fixture = []
+    for r in range(rooms):
+        members = users[r * clients_per_room : (r + 1) * clients_per_room]
+        meet = Meet.objects.create(
+            user=members[0],
+            title=f"{prefix} 부하 테스트",
+            application_deadline=deadline,
+        )
+        room = GroupChatRoom.objects.create(meet=meet)
+        GroupChatMembership.objects.bulk_create(
+            GroupChatMembership(room=room, user=user) for user in members
+        )
+        fixture.append((room.id, members))
+    return fixture
+
+
+def delete_load_test_rooms(fixture):
+    """부하 테스트 데이터 삭제 (모임 CASCADE로 채팅방/멤버십/메시지 함께 삭제)"""
+    room_ids = [room_id for room_id, _ in fixture]
+    user_ids = [user.id for _, members in fixture for user in members]
+    Meet.objects.filter(groupchatroom__id__in=room_ids).delete()
+    User.objects.filter(id__in=user_ids).delete()
+
+
+async def run_load_test(fixture, messages_per_client, interval=0.0, channel_layer=""):
+    """
+    방마다 모든 클라이언트가 messages_per_client개씩 보내고, 모든 클라이언트가
+    자기 방의 메시지를 전부 받을 때까지 기다려 처리량/지연/쿼리 수를 측정
+    """
+    clients = [
+        (room_id, WebsocketClient(user, f"/ws/group-chat/{room_id}/"))
+        for room_id, members in fixture
+        for user in members
+    ]
+    clients_per_room = len(fixture[0][1]) if fixture else 0
+    report = LoadTestReport(
+        channel_layer=channel_layer,
+        rooms=len(fixture),
+        clients_per_room=clients_per_room,
+        messages_per_client=messages_per_client,
+    )
+    connected = await asyncio.gather(*(client.connect() for _, client in clients))
+    if not all(connected):
+        raise RuntimeError("웹소켓 연결에 실패한 클라이언트가 있습니다.")
+    # 접속 직후 접속자 알림이 모두 오가도록 잠시 대기
+    await asyncio.sleep(0.1)
+
+    expected = clients_per_room * messages_per_client
+    errors = {room_id: 0 for room_id, _ in fixture}
+    latencies = []
+
+    async def send(client):
+        for seq in range(messages_per_client):
+            await client.send_json({"message": f"{time.perf_counter_ns()}:{seq}"})
+            report.sent += 1
+            if interval:
+                await asyncio.sleep(interval)
+
+    async def receive(room_id, client):
+        received = 0
+        # 거부된 메시지는 방 전체에 전달되지 않으므로 받을 개수에서 제외
+        while received + errors[room_id] < expected:
+            try:
+                data = await client.receive_json(timeout=RECEIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            if "error" in data:
+                errors[room_id] += 1
+                continue
+            sent_at = int(data["message"].split(":", 1)[0])
+            latencies.append((time.perf_counter_ns() - sent_at) / 1e6)
+            received += 1
+        report.delivered += received
+
+    async with QueryCounter() as queries:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(send(client) for _, client in clients),
+            *(receive(room_id, client) for room_id, client in clients),
+        )
+        report.elapsed = time.perf_counter() - started
+        await asyncio.gather(
+            *(client.disconnect() for _, client in clients), return_exceptions=True
+        )
+        await close_message_writer()  # 지연 저장 중인 메시지까지 저장
+    report.db_queries = queries.count
+    report.errors = sum(errors.values())
+
+    latencies.sort()
+    report.latency_ms = {
+        f"p{p}": round(percentile(latencies, p), 3) for p in (50, 95, 99)
+    } | {"max": round(latencies[-1], 3) if latencies else 0.0}
+    if report.elapsed:
+        report.messages_per_sec = round(report.delivered / report.elapsed, 1)
+    if report.sent:
+        report.queries_per_message = round(report.db_queries / report.sent, 3)
+    report.elapsed = round(report.elapsed, 3)
+    return report
+
+
+def _metric(report, name):
+    value = report
+    for key in name.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare_reports(current, baseline, max_regression=0.2):
+    """
+    기준 결과(JSON)와 지표별로 비교해서 [(지표, 기준값, 현재값, 변화율, 악화 여부), ...] 반환
+    변화율이 max_regression(0.2 = 20%)보다 나쁜 쪽으로 크면 악화로 표시
+    """
+    rows = []
+    for name, higher_is_better in COMPARED_METRICS.items():
+        base, value = _metric(baseline, name), _metric(current, name)
+        if not base or value is None:
+            continue
+        change = (value - base) / base
+        worse = -change if higher_is_better else change
+        rows.append((name, base, value, change, worse > max_regression))
+    return rows
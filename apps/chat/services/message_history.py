@@ -0,0 +1,44 @@
+from apps.chat.models import GroupChatMessage
+from apps.chat.services.archive import get_archived_messages
+
+DEFAULT_HISTORY_LIMIT = 50
+MAX_HISTORY_LIMIT = 100
+
+
+def get_message_window(room_id, before=None, after=None, limit=DEFAULT_HISTORY_LIMIT):
+    """
+    채팅방 메시지를 id 기준으로 limit개만 조회해서 (오래된 순 목록, 더 있는지 여부) 반환
+    - after: 해당 id 이후 메시지 (재접속한 클라이언트가 마지막으로 본 메시지 이후만 받을 때)
+    - before: 해당 id 이전 메시지 (위로 스크롤하며 과거 메시지를 볼 때)
+    - 둘 다 없으면 가장 최근 메시지
+    (room_id, id) 인덱스 범위 조회 + limit이라 방의 전체 메시지 수와 상관없이 일정한 비용
+    보관 파일로 옮긴 메시지는 항상 실시간 테이블보다 앞 구간이므로 부족한 만큼만 이어서 읽음
+    """
+    queryset = GroupChatMessage.objects.filter(room_id=room_id).select_related("user")
+
+    if after is not None:
+        messages = get_archived_messages(
+            room_id, before=before, after=after, limit=limit + 1
+        )
+        if len(messages) <= limit:
+            queryset = queryset.filter(id__gt=after)
+            if before is not None:
+                queryset = queryset.filter(id__lt=before)
+            messages += list(queryset.order_by("id")[: limit + 1 - len(messages)])
+        has_more = len(messages) > limit
+        return messages[:limit], has_more
+
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    messages = list(queryset.order_by("-id")[: limit + 1])
+    if len(messages) <= limit:
+        messages += get_archived_messages(
+            room_id,
+            before=messages[-1].id if messages else before,
+            limit=limit + 1 - len(messages),
+            newest_first=True,
+        )
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    messages.reverse()
+    return messages, has_more
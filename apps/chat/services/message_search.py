@@ -0,0 +1,105 @@
+import html
+
+from django.db import connection
+
+from apps.chat.models import GroupChatMessage
+
+FTS_TABLE = "chat_message_fts"  # SQLite FTS5 (trigram) 인덱스 테이블
+MIN_INDEXED_LENGTH = 3  # 3글자 미만은 trigram 인덱스로 찾을 수 없어 LIKE로 검색
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+SNIPPET_RADIUS = 30  # 스니펫에서 검색어 앞뒤로 보여줄 글자 수
+
+
+def search_messages(room_id, query, limit=DEFAULT_SEARCH_LIMIT, offset=0):
+    """
+    채팅방 메시지에서 검색어가 포함된 메시지를 관련도 순으로 limit개 조회해서
+    (메시지 목록, 더 있는지 여부) 반환, 메시지마다 rank/snippet 속성이 붙음
+    - PostgreSQL: pg_trgm GIN 인덱스로 ILIKE 검색, word_similarity로 정렬
+    - SQLite: FTS5 trigram 인덱스로 검색, bm25로 정렬
+    trigram이라 띄어쓰기 없는 한국어도 부분 문자열로 찾을 수 있음
+    """
+    query = query.strip()
+    if len(query) < MIN_INDEXED_LENGTH or connection.vendor not in (
+        "postgresql",
+        "sqlite",
+    ):
+        ranked = _search_like(room_id, query, limit + 1, offset)
+    elif connection.vendor == "postgresql":
+        ranked = _search_postgresql(room_id, query, limit + 1, offset)
+    else:
+        ranked = _search_sqlite(room_id, query, limit + 1, offset)
+
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+    messages = GroupChatMessage.objects.select_related("user").in_bulk(
+        [message_id for message_id, _ in ranked]
+    )
+    results = []
+    for message_id, rank in ranked:
+        message = messages.get(message_id)
+        if message is None:  # 조회 사이에 삭제됨
+            continue
+        message.rank = rank
+        message.snippet = make_snippet(message.content, query)
+        results.append(message)
+    return results, has_more
+
+
+def _search_like(room_id, query, limit, offset):
+    # 채팅방 범위 안에서만 훑으므로 (room, id) 인덱스로 최신순 조회
+    ids = (
+        GroupChatMessage.objects.filter(room_id=room_id, content__icontains=query)
+        .order_by("-id")
+        .values_list("id", flat=True)[offset : offset + limit]
+    )
+    return [(message_id, None) for message_id in ids]
+
+
+def _search_postgresql(room_id, query, limit, offset):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    rows = (
+        GroupChatMessage.objects.filter(room_id=room_id, content__icontains=query)
+        .annotate(rank=TrigramWordSimilarity(query, "content"))
+        .order_by("-rank", "-id")
+        .values_list("id", "rank")[offset : offset + limit]
+    )
+    return list(rows)
+
+
+def _search_sqlite(room_id, query, limit, offset):
+    table = GroupChatMessage._meta.db_table
+    # 검색어 전체를 하나의 구문으로 (FTS 문법 문자 무시)
+    phrase = '"' + query.replace('"', '""') + '"'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT m.id, -bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} "
+            f"JOIN {table} m ON m.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND m.room_id = %s "
+            "ORDER BY rank DESC, m.id DESC LIMIT %s OFFSET %s",
+            [phrase, room_id, limit, offset],
+        )
+        return cursor.fetchall()
+
+
+def make_snippet(content, query, radius=SNIPPET_RADIUS):
+    """검색어 주변만 잘라 HTML 이스케이프 후 검색어를 <mark>로 감싼 문자열"""
+    lower, needle = content.lower(), query.lower()
+    start = lower.find(needle) if needle else -1
+    if start < 0:
+        return html.escape(content[: radius * 2])
+
+    begin, end = max(0, start - radius), min(len(content), start + len(needle) + radius)
+    parts = ["…" if begin > 0 else ""]
+    pos = begin
+    while start >= 0 and start + len(needle) <= end:
+        parts.append(html.escape(content[pos:start]))
+        parts.append(
+            f"<mark>{html.escape(content[start : start + len(needle)])}</mark>"
+        )
+        pos = start + len(needle)
+        start = lower.find(needle, pos)
+    parts.append(html.escape(content[pos:end]))
+    parts.append("…" if end < len(content) else "")
+    return "".join(parts)
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+
+from apps.chat.models import GroupChatMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WRITE_BEHIND = {
+    "ENABLED": True,
+    "BATCH_SIZE": 100,  # 한 번에 저장할 최대 메시지 수
+    "MAX_QUEUE_SIZE": 10000,  # 저장 대기 중인 메시지 최대 개수
+    "PUT_TIMEOUT": 1.0,  # 초. 큐가 가득 찼을 때 자리가 나기를 기다리는 최대 시간
+    "MAX_RETRIES": 3,  # 저장 실패 시 재시도 횟수
+}
+
+
+_STOP = object()  # 백그라운드 저장 종료 신호
+
+
+class ChatBackpressureError(Exception):
+    """저장 대기열이 가득 차서 메시지를 받을 수 없음"""
+
+
+class ChatWriteError(Exception):
+    """메시지를 저장하지 못함 (삭제된 방/유저 등)"""
+
+
+def get_write_behind_config():
+    return {**DEFAULT_WRITE_BEHIND, **getattr(settings, "CHAT_WRITE_BEHIND", {})}
+
+
+class MessageWriter:
+    """
+    채팅 메시지를 프로세스 내 큐에 쌓아두고 백그라운드에서 모아서 bulk_create로 저장
+    - 큐는 하나이고 꺼낸 순서대로 저장하므로 id 순서가 전송 순서와 같음
+    - 타이머로 기다리지 않고 큐에 쌓인 만큼(최대 BATCH_SIZE개) 바로 저장
+      저장하는 동안 들어온 메시지는 다음 배치로 모이므로, 한가할 때는 한 건씩 바로 저장되고
+      몰릴 때만 자연스럽게 묶여 저장됨 (메시지 전달이 타이머만큼 늦어지지 않음)
+    - 큐가 가득 차면 PUT_TIMEOUT까지 기다리고, 그래도 자리가 없으면 ChatBackpressureError
+    - enqueue는 저장이 끝나면 (id, created_at이 채워진) 메시지를 돌려주는 Future를 반환
+      전송은 저장 뒤에 해야 클라이언트가 받은 id로 after 조회, 읽음 처리를 할 수 있음
+    """
+
+    def __init__(self, config=None):
+        config = config or get_write_behind_config()
+        self.batch_size = config["BATCH_SIZE"]
+        self.put_timeout = config["PUT_TIMEOUT"]
+        self.max_retries = config["MAX_RETRIES"]
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=config["MAX_QUEUE_SIZE"])
+        self.task = None
+
+    async def enqueue(self, room_id, user_id, content):
+        message = GroupChatMessage(room_id=room_id, user_id=user_id, content=content)
+        saved = self.loop.create_future()
+        if self.task is None or self.task.done():
+            self.task = self.loop.create_task(self._run())
+        try:
+            self.queue.put_nowait((message, saved))
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(
+                    self.queue.put((message, saved)), self.put_timeout
+                )
+            except asyncio.TimeoutError:
+                raise ChatBackpressureError()
+        return saved
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+
+    async def _write(self, batch):
+        """
+        모아둔 메시지를 한 번에 저장하고 각 Future에 결과 전달
+        배치 저장이 끝내 실패하면 한 건씩 다시 저장해 문제 있는 메시지만 실패 처리
+        """
+        messages = [message for message, _ in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await database_sync_to_async(GroupChatMessage.objects.bulk_create)(
+                    messages, batch_size=self.batch_size
+                )
+            except IntegrityError:
+                break  # 삭제된 방/유저를 가리키는 메시지가 섞임, 재시도해도 같음
+            except Exception:
+                if attempt == self.max_retries:
+                    break
+                await asyncio.sleep(0.1 * attempt)
+            else:
+                for message, saved in batch:
+                    _resolve(saved, message)
+                return
+
+        errors = await database_sync_to_async(_save_each)(messages)
+        for (message, saved), error in zip(batch, errors):
+            if error is None:
+                _resolve(saved, message)
+                continue
+            logger.error(
+                "채팅 메시지 저장 실패 (room=%s, user=%s): %r",
+                message.room_id,
+                message.user_id,
+                error,
+            )
+            if not saved.done():
+                saved.set_exception(ChatWriteError())
+
+    async def close(self):
+        """큐에 남은 메시지를 모두 저장하고 백그라운드 저장을 멈춤 (서버 종료 시)"""
+        if self.task is not None and not self.task.done():
+            await self.queue.put(_STOP)  # 앞에 쌓인 메시지를 모두 저장한 뒤 종료
+            await self.task
+        self.task = None
+
+        batch = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not _STOP:
+                batch.append(item)
+        for start in range(0, len(batch), self.batch_size):
+            await self._write(batch[start : start + self.batch_size])
+
+
+def _resolve(saved, message):
+    if not saved.done():  # 기다리던 연결이 끊겨 취소됐을 수 있음
+        saved.set_result(message)
+
+
+def _save_each(messages):
+    """메시지를 한 건씩 저장하고 메시지별 예외(성공이면 None) 목록 반환"""
+    errors = []
+    for message in messages:
+        try:
+            message.save(force_insert=True)
+        except Exception as error:
+            errors.append(error)
+        else:
+            errors.append(None)
+    return errors
+
+
+_writer = None
+
+
+def get_message_writer():
+    """현재 이벤트 루프의 MessageWriter (루프가 바뀌면 새로 만듦)"""
+    global _writer
+    if _writer is None or _writer.loop is not asyncio.get_running_loop():
+        _writer = MessageWriter()
+    return _writer
+
+
+async def close_message_writer():
+    global _writer
+    if _writer is not None and _writer.loop is asyncio.get_running_loop():
+        await _writer.close()
+    _writer = None
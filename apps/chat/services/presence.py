@@ -0,0 +1,250 @@
+import asyncio
+import time
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+DEFAULT_PRESENCE = {
+    "HEARTBEAT_INTERVAL": 30,  # 초. 연결마다 접속 상태를 갱신하는 주기
+    "TTL": 90,  # 초. 이 시간 동안 갱신이 없으면 (프로세스 종료 등) 접속 종료로 처리
+    "COALESCE_WINDOW": 0.5,  # 초. 입장/퇴장 변경분을 모아서 한 번에 전송
+}
+
+
+def get_presence_config():
+    return {**DEFAULT_PRESENCE, **getattr(settings, "CHAT_PRESENCE", {})}
+
+
+def _users_key(room_id):
+    return f"presence:{room_id}:users"  # ZSET user_id → 만료 시각
+
+
+def _conns_key(room_id):
+    return f"presence:{room_id}:conns"  # HASH user_id → 연결 수
+
+
+# 연결 수를 줄이고 0이 되면 접속자에서 제거 (제거되면 1)
+LEAVE_SCRIPT = """
+local n = redis.call('HINCRBY', KEYS[2], ARGV[1], -1)
+if n <= 0 then
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    return redis.call('ZREM', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# 만료 시각이 지난 접속자 제거 후 목록 반환
+SWEEP_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+    redis.call('HDEL', KEYS[2], unpack(expired))
+end
+return expired
+"""
+
+
+class RedisPresenceStore:
+    """
+    여러 uvicorn 프로세스가 함께 쓰는 Redis 기반 접속자 저장소
+    방마다 ZSET(유저 → 만료 시각)과 HASH(유저 → 연결 수)를 두고, 접속자 수는 ZCARD (O(1))
+    """
+
+    def __init__(self, client, sync_client, ttl):
+        self.client = client
+        self.sync_client = sync_client  # REST API 등 동기 코드에서 사용
+        self.ttl = ttl
+        self._leave = client.register_script(LEAVE_SCRIPT)
+        self._sweep = client.register_script(SWEEP_SCRIPT)
+
+    @classmethod
+    def from_channel_layer(cls, ttl):
+        import redis
+        import redis.asyncio as aioredis
+
+        host = settings.CHANNEL_LAYERS["default"]["CONFIG"]["hosts"][0]
+        if isinstance(host, dict):
+            host = host["address"]
+        if isinstance(host, str):
+            return cls(aioredis.Redis.from_url(host), redis.Redis.from_url(host), ttl)
+        return cls(
+            aioredis.Redis(host=host[0], port=host[1]),
+            redis.Redis(host=host[0], port=host[1]),
+            ttl,
+        )
+
+    async def join(self, room_id, user_id):
+        """연결 추가, 새로 접속한 유저면 True"""
+        users, conns = _users_key(room_id), _conns_key(room_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(users, {user_id: time.time() + self.ttl})
+            pipe.hincrby(conns, user_id, 1)
+            pipe.expire(users, self.ttl * 2)
+            pipe.expire(conns, self.ttl * 2)
+            added, *_ = await pipe.execute()
+        return bool(added)
+
+    async def leave(self, room_id, user_id):
+        """연결 제거, 유저의 마지막 연결이었으면 True"""
+        keys = [_users_key(room_id), _conns_key(room_id)]
+        return bool(await self._leave(keys=keys, args=[user_id]))
+
+    async def heartbeat(self, room_id, user_id):
+        users, conns = _users_key(room_id), _conns_key(room_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(users, {user_id: time.time() + self.ttl}, xx=True, gt=True)
+            pipe.expire(users, self.ttl * 2)
+            pipe.expire(conns, self.ttl * 2)
+            await pipe.execute()
+
+    async def sweep(self, room_id):
+        """갱신이 끊긴 접속자 제거 후 제거된 user_id 목록 반환"""
+        keys = [_users_key(room_id), _conns_key(room_id)]
+        expired = await self._sweep(keys=keys, args=[time.time()])
+        return [int(user_id) for user_id in expired]
+
+    async def online_count(self, room_id):
+        return await self.client.zcard(_users_key(room_id))
+
+    def online_count_sync(self, room_id):
+        return self.sync_client.zcard(_users_key(room_id))
+
+    async def online_user_ids(self, room_id):
+        return [
+            int(user_id)
+            for user_id in await self.client.zrange(_users_key(room_id), 0, -1)
+        ]
+
+
+class LocalPresenceStore:
+    """채널 레이어가 InMemoryChannelLayer일 때(단일 프로세스) 사용하는 저장소"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.rooms = {}  # room_id → {user_id: [연결 수, 만료 시각]}
+
+    async def join(self, room_id, user_id):
+        users = self.rooms.setdefault(room_id, {})
+        entry = users.setdefault(user_id, [0, 0])
+        entry[0] += 1
+        entry[1] = time.time() + self.ttl
+        return entry[0] == 1
+
+    async def leave(self, room_id, user_id):
+        users = self.rooms.get(room_id, {})
+        entry = users.get(user_id)
+        if entry is None:
+            return False
+        entry[0] -= 1
+        if entry[0] > 0:
+            return False
+        del users[user_id]
+        return True
+
+    async def heartbeat(self, room_id, user_id):
+        entry = self.rooms.get(room_id, {}).get(user_id)
+        if entry is not None:
+            entry[1] = max(entry[1], time.time() + self.ttl)
+
+    async def sweep(self, room_id):
+        users = self.rooms.get(room_id, {})
+        now = time.time()
+        expired = [user_id for user_id, (_, expires) in users.items() if expires <= now]
+        for user_id in expired:
+            del users[user_id]
+        return expired
+
+    async def online_count(self, room_id):
+        return self.online_count_sync(room_id)
+
+    def online_count_sync(self, room_id):
+        return len(self.rooms.get(room_id, {}))
+
+    async def online_user_ids(self, room_id):
+        return list(self.rooms.get(room_id, {}))
+
+
+_store = None
+
+
+def get_presence_store():
+    global _store
+    if _store is None:
+        ttl = get_presence_config()["TTL"]
+        backend = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+        if backend.endswith("InMemoryChannelLayer"):
+            _store = LocalPresenceStore(ttl)
+        else:
+            _store = RedisPresenceStore.from_channel_layer(ttl)
+    return _store
+
+
+# 채널 레이어 설정이 바뀌면 (override_settings, chat_load_test --in-memory) 저장소를 다시 고름
+@receiver(setting_changed)
+def reset_presence_store(setting, **kwargs):
+    global _store, _notifier
+    if setting in ("CHANNEL_LAYERS", "CHAT_PRESENCE"):
+        _store = None
+        _notifier = None
+
+
+class PresenceNotifier:
+    """
+    방별 입장/퇴장을 COALESCE_WINDOW 동안 모아서 변경분만 한 번에 전송
+    같은 창 안에서 들어왔다 나간 유저는 서로 상쇄되어 전송하지 않음
+    """
+
+    def __init__(self, store, window):
+        self.store = store
+        self.window = window
+        self.loop = asyncio.get_running_loop()
+        self.pending = {}  # room_id → {"joined": set, "left": set}
+        self.tasks = {}
+
+    def add(self, room_id, joined=(), left=()):
+        changes = self.pending.setdefault(room_id, {"joined": set(), "left": set()})
+        for user_id in joined:
+            if user_id in changes["left"]:
+                changes["left"].discard(user_id)
+            else:
+                changes["joined"].add(user_id)
+        for user_id in left:
+            if user_id in changes["joined"]:
+                changes["joined"].discard(user_id)
+            else:
+                changes["left"].add(user_id)
+        if room_id not in self.tasks:
+            self.tasks[room_id] = self.loop.create_task(self._flush_later(room_id))
+
+    async def _flush_later(self, room_id):
+        await asyncio.sleep(self.window)
+        self.tasks.pop(room_id, None)
+        changes = self.pending.pop(room_id, None)
+        if not changes or not (changes["joined"] or changes["left"]):
+            return
+        from apps.chat.consumers import room_group_name
+
+        await get_channel_layer().group_send(
+            room_group_name(room_id),
+            {
+                "type": "presence_delta",
+                "joined": sorted(changes["joined"]),
+                "left": sorted(changes["left"]),
+                "online": await self.store.online_count(room_id),
+            },
+        )
+
+
+_notifier = None
+
+
+def get_presence_notifier():
+    """현재 이벤트 루프의 PresenceNotifier (루프가 바뀌면 새로 만듦)"""
+    global _notifier
+    if _notifier is None or _notifier.loop is not asyncio.get_running_loop():
+        _notifier = PresenceNotifier(
+            get_presence_store(), get_presence_config()["COALESCE_WINDOW"]
+        )
+    return _notifier
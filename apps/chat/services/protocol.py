@@ -0,0 +1,42 @@
+import json
+
+import msgpack
+
+# 클라이언트가 Sec-WebSocket-Protocol로 요청하면 msgpack 바이너리 프레임 사용 (기본은 JSON 텍스트)
+MSGPACK_SUBPROTOCOL = "onda.chat.msgpack.v1"
+
+
+def encode_chat_frames(message_id, user_id, nickname, content, created_at):
+    """
+    채팅 메시지 한 건을 JSON 텍스트와 msgpack 바이너리로 한 번씩만 인코딩
+    그룹 이벤트에 담아 보내므로 방 인원수와 상관없이 이벤트마다 한 번
+    msgpack 프레임에는 닉네임 대신 user_id만 담고 닉네임은 연결마다 한 번 user 프레임으로 보냄
+    """
+    text = json.dumps(
+        {
+            "id": message_id,
+            "user_id": user_id,
+            "nickname": nickname,
+            "message": content,
+            "created_at": created_at,
+        }
+    )
+    binary = msgpack.packb(
+        {"t": "m", "id": message_id, "u": user_id, "m": content, "c": created_at}
+    )
+    return text, binary
+
+
+def encode_user_frame(user_id, nickname):
+    """msgpack 연결의 닉네임 사전에 유저 추가"""
+    return msgpack.packb({"t": "u", "u": user_id, "n": nickname})
+
+
+def encode(data, binary):
+    return msgpack.packb(data) if binary else json.dumps(data)
+
+
+def decode(text_data=None, bytes_data=None):
+    if bytes_data is not None:
+        return msgpack.unpackb(bytes_data)
+    return json.loads(text_data)
@@ -0,0 +1,78 @@
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from apps.chat.models import (
+    ChatArchiveSegment,
+    GroupChatMembership,
+    GroupChatMessage,
+)
+
+
+def _room_last_id(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(room_id=OuterRef("room_id"))
+            .order_by()
+            .values("room_id")
+            .annotate(last_id=Max(field))
+            .values("last_id")
+        ),
+        0,
+    )
+
+
+def room_last_message_id():
+    """멤버십의 채팅방에 있는 마지막 메시지 id (보관 파일로 옮긴 메시지 포함, 없으면 0)"""
+    return Greatest(
+        _room_last_id(GroupChatMessage, "id"),
+        _room_last_id(ChatArchiveSegment, "last_message_id"),
+    )
+
+
+def mark_read(membership_id, message_id=None):
+    """
+    읽은 위치를 앞으로만 이동 (이미 더 뒤까지 읽었으면 변경 없음)
+    message_id가 없거나 채팅방의 마지막 메시지보다 뒤면 마지막 메시지까지 읽음 처리
+    (다른 방의 id나 아직 없는 id로 안 읽은 수가 0에 고정되지 않도록)
+    UPDATE 한 번으로 처리하고 변경 여부를 반환
+    """
+    target = room_last_message_id()
+    if message_id is not None:
+        target = Least(Value(message_id), target)
+    return bool(
+        GroupChatMembership.objects.filter(
+            pk=membership_id, last_read_message_id__lt=target
+        ).update(last_read_message_id=target)
+    )
+
+
+def my_rooms(user):
+    """
+    내가 참여한 채팅방 목록과 방마다 마지막 메시지, 안 읽은 메시지 수 (쿼리 한 번)
+    안 읽은 수는 (room, id) 인덱스에서 읽은 위치 이후 범위만 세므로 방 전체를 세지 않음
+    """
+    last_message = GroupChatMessage.objects.filter(
+        room_id=OuterRef("room_id")
+    ).order_by("-id")
+    unread = (
+        GroupChatMessage.objects.filter(
+            room_id=OuterRef("room_id"), id__gt=OuterRef("last_read_message_id")
+        )
+        .exclude(user_id=user.id)  # 내가 보낸 메시지는 제외
+        .order_by()
+        .values("room_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return (
+        GroupChatMembership.objects.filter(user=user)
+        .select_related("room__meet")
+        .annotate(
+            last_message_id=Subquery(last_message.values("id")[:1]),
+            last_message_content=Subquery(last_message.values("content")[:1]),
+            last_message_user_id=Subquery(last_message.values("user_id")[:1]),
+            last_message_created_at=Subquery(last_message.values("created_at")[:1]),
+            unread_count=Coalesce(Subquery(unread), 0, output_field=IntegerField()),
+        )
+        .order_by(F("last_message_id").desc(nulls_last=True), "-id")
+    )
@@ -0,0 +1,39 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.chat.consumers import member_group_name
+from apps.chat.models import ChatArchiveSegment, GroupChatMembership
+from apps.chat.services.archive import get_archive_storage
+from apps.meet.models import MeetApply
+
+
+# 멤버십이 삭제되면 해당 유저의 웹소켓 연결을 끊도록 알림 (채팅방/모임 삭제 CASCADE 포함)
+@receiver(post_delete, sender=GroupChatMembership)
+def revoke_membership(sender, instance, **kwargs):
+    group = member_group_name(instance.room_id, instance.user_id)
+
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(channel_layer.group_send)(
+                group, {"type": "membership_revoked"}
+            )
+
+    transaction.on_commit(send)
+
+
+# 보관 구간이 삭제되면 (채팅방/모임 삭제 CASCADE 포함) 저장소의 파일도 삭제
+@receiver(post_delete, sender=ChatArchiveSegment)
+def delete_archive_file(sender, instance, **kwargs):
+    transaction.on_commit(lambda: get_archive_storage().delete(instance.path))
+
+
+# 모임 지원이 취소되면 채팅방 멤버십도 삭제 (위 revoke_membership으로 연결도 끊김)
+@receiver(post_delete, sender=MeetApply)
+def remove_chat_member(sender, instance, **kwargs):
+    GroupChatMembership.objects.filter(
+        room__meet_id=instance.meet_id, user_id=instance.user_id
+    ).exclude(room__meet__user_id=instance.user_id).delete()
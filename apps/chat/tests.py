@@ -0,0 +1,737 @@
+import asyncio
+import json
+from datetime import timedelta
+from functools import cache as memoize
+from io import StringIO
+
+import msgpack
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.chat.consumers import MEMBERSHIP_REVOKED_CLOSE_CODE
+from apps.chat.middleware import get_user_from_token, verified_tokens
+from apps.chat.models import (
+    ChatArchiveSegment,
+    GroupChatMembership,
+    GroupChatMessage,
+    GroupChatRoom,
+)
+from apps.chat.routing import websocket_urlpatterns
+from apps.chat.services.load_test import (
+    WebsocketClient,
+    compare_reports,
+    create_load_test_rooms,
+    delete_load_test_rooms,
+    run_load_test,
+)
+from apps.chat.services.message_writer import (
+    DEFAULT_WRITE_BEHIND,
+    ChatBackpressureError,
+    ChatWriteError,
+    MessageWriter,
+    close_message_writer,
+)
+from apps.chat.services.presence import RedisPresenceStore
+from apps.chat.services.protocol import MSGPACK_SUBPROTOCOL
+from apps.meet.models import Meet, MeetApply
+from apps.meet.services.apply_service import apply_to_meet
+from apps.user.utils.jwt_token import get_tokens_for_user
+from utils.purge import BatchPurger
+
+User = get_user_model()
+
+
+@memoize
+def redis_available():
+    """설정된 채널 레이어가 Redis이고 접속할 수 있는지 (테스트 실행마다 한 번만 확인)"""
+    from django.conf import settings
+
+    if settings.CHANNEL_LAYERS["default"]["BACKEND"].endswith("InMemoryChannelLayer"):
+        return False
+    try:
+        return RedisPresenceStore.from_channel_layer(ttl=0).sync_client.ping()
+    except Exception:
+        return False
+
+
+@pytest.fixture(autouse=True)
+def channel_layer(settings):
+    """로컬 Redis가 없으면 InMemoryChannelLayer로 실행 (접속자 저장소도 함께 교체)"""
+    if not redis_available():
+        settings.CHANNEL_LAYERS = {
+            "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+        }
+
+
+def create_user(nickname):
+    return User.objects.create_user(
+        email=f"{nickname}@example.com", password="Testpass123!", nickname=nickname
+    )
+
+
+def use_archive_storage(settings, path):
+    """보관 파일 전용 저장소를 임시 경로로 교체"""
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "chat_archive": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": path},
+        },
+    }
+
+
+def create_room(leader):
+    meet = Meet.objects.create(
+        user=leader,
+        title="모임",
+        application_deadline=timezone.now() + timedelta(days=7),
+    )
+    return GroupChatRoom.objects.create(meet=meet)
+
+
+@pytest.mark.django_db
+def test_message_history_window(django_assert_max_num_queries):
+    user = create_user("member")
+    room = create_room(user)
+    GroupChatMembership.objects.create(room=room, user=user)
+    ids = [
+        GroupChatMessage.objects.create(room=room, user=user, content=str(i)).id
+        for i in range(5)
+    ]
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f"/api/group-chat/{room.id}/messages"
+
+    # 최근 메시지 (오래된 순으로 정렬)
+    with django_assert_max_num_queries(2):
+        response = client.get(url, {"limit": 2})
+    assert [m["id"] for m in response.data["results"]] == ids[3:]
+    assert response.data["has_more"] is True
+    assert response.data["results"][0]["nickname"] == "member"
+
+    # 과거 메시지
+    response = client.get(url, {"before": ids[3], "limit": 2})
+    assert [m["id"] for m in response.data["results"]] == ids[1:3]
+
+    # 재접속 시 마지막으로 본 메시지 이후만
+    response = client.get(url, {"after": ids[2]})
+    assert [m["id"] for m in response.data["results"]] == ids[3:]
+    assert response.data["has_more"] is False
+
+    # 멤버가 아니면 403
+    client.force_authenticate(create_user("outsider"))
+    assert client.get(url).status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumer_sends_message_and_closes_on_revoke():
+    user = create_user("member")
+    room = create_room(user)
+    membership = GroupChatMembership.objects.create(room=room, user=user)
+
+    async def scenario():
+        client = WebsocketClient(user, f"/ws/group-chat/{room.id}/")
+        assert await client.connect()
+
+        await client.send_json({"message": "안녕하세요"})
+        event = await client.receive_json()
+        assert event["message"] == "안녕하세요"
+        assert event["nickname"] == "member"
+        # 저장이 끝난 뒤 전송하므로 실제 id가 담김
+        message = await database_sync_to_async(GroupChatMessage.objects.get)()
+        assert event["id"] == message.id
+
+        # 멤버십이 삭제되면 연결이 끊김
+        await database_sync_to_async(membership.delete)()
+        output = await client.receive_output()
+        while output["type"] == "websocket.send":  # 접속자 알림은 건너뜀
+            output = await client.receive_output()
+        assert output == {
+            "type": "websocket.close",
+            "code": MEMBERSHIP_REVOKED_CLOSE_CODE,
+        }
+        await client.disconnect()
+
+        # 다시 연결해도 거부
+        client = WebsocketClient(user, f"/ws/group-chat/{room.id}/")
+        assert not await client.connect()
+
+        await close_message_writer()  # 서버 종료 시처럼 대기 중인 메시지 저장
+
+    async_to_sync(scenario)()
+    message = GroupChatMessage.objects.get()
+    assert (message.room_id, message.user_id) == (room.id, user.id)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_message_writer_batches_in_order_with_backpressure():
+    user = create_user("member")
+    room = create_room(user)
+    config = {**DEFAULT_WRITE_BEHIND, "BATCH_SIZE": 3, "MAX_QUEUE_SIZE": 5}
+
+    async def scenario():
+        writer = MessageWriter(config)
+        saved = [await writer.enqueue(room.id, user.id, str(i)) for i in range(7)]
+        await writer.close()
+        # 저장이 끝난 메시지에는 id와 created_at이 채워져 있음
+        messages = [future.result() for future in saved]
+        assert [m.id for m in messages] == sorted(m.id for m in messages)
+        assert all(m.created_at is not None for m in messages)
+
+        # 타이머 없이 바로 저장하고, 저장하는 동안 쌓인 메시지만 한 배치로 묶음
+        writer = MessageWriter(config)
+        batches = []
+        write = writer._write
+
+        async def record(batch):
+            batches.append(len(batch))
+            await write(batch)
+
+        writer._write = record
+        await (await writer.enqueue(room.id, user.id, "lone"))
+        saved = [await writer.enqueue(room.id, user.id, "burst") for _ in range(3)]
+        await asyncio.gather(*saved)
+        await writer.close()
+        assert batches == [1, 3]
+
+        # 저장이 밀려 큐가 가득 차면 기다렸다가 시간 초과 시 거부
+        writer = MessageWriter({**config, "PUT_TIMEOUT": 0.01})
+        writer.task = writer.loop.create_future()  # 백그라운드 저장이 멈춘 상황
+        for i in range(5):
+            await writer.enqueue(room.id, user.id, "queued")
+        with pytest.raises(ChatBackpressureError):
+            await writer.enqueue(room.id, user.id, "rejected")
+
+    async_to_sync(scenario)()
+    contents = list(
+        GroupChatMessage.objects.filter(room=room)
+        .order_by("id")
+        .values_list("content", flat=True)
+    )
+    assert contents == [str(i) for i in range(7)] + ["lone"] + ["burst"] * 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_message_writer_isolates_failed_message():
+    user = create_user("member")
+    room = create_room(user)
+    gone = create_user("gone")
+    gone_id = gone.id
+    gone.delete(soft=False)
+
+    async def scenario():
+        writer = MessageWriter(DEFAULT_WRITE_BEHIND)
+        saved = [
+            await writer.enqueue(room.id, user.id, "before"),
+            await writer.enqueue(room.id, gone_id, "gone"),  # 삭제된 유저
+            await writer.enqueue(room.id, user.id, "after"),
+        ]
+        await writer.close()
+        return saved
+
+    before, failed, after = async_to_sync(scenario)()
+    # 같은 배치의 나머지 메시지는 저장되고 문제 있는 메시지만 실패
+    with pytest.raises(ChatWriteError):
+        failed.result()
+    assert before.result().id < after.result().id
+    assert list(
+        GroupChatMessage.objects.order_by("id").values_list("content", flat=True)
+    ) == ["before", "after"]
+
+
+@pytest.mark.django_db
+def test_websocket_token_principal_without_queries(django_assert_num_queries):
+    user = create_user("member")
+    _, access = get_tokens_for_user(user)
+    verified_tokens.clear()
+
+    with django_assert_num_queries(0):
+        principal = get_user_from_token(access)
+        assert principal.id == user.id
+        assert principal.nickname == "member"
+        assert principal.is_authenticated
+        # 검증된 토큰은 캐시에서 바로 반환
+        assert get_user_from_token(access) is principal
+        assert get_user_from_token("invalid-token") is None
+
+    # 클레임에 없는 필드가 필요할 때만 DB 조회
+    assert async_to_sync(principal.aget_user)().email == user.email
+
+
+@pytest.mark.django_db(transaction=True)
+def test_presence_deltas_and_online_count(settings):
+    settings.CHAT_PRESENCE = {"COALESCE_WINDOW": 0.01}
+    first, second = create_user("first"), create_user("second")
+    room = create_room(first)
+    for user in (first, second):
+        GroupChatMembership.objects.create(room=room, user=user)
+    path = f"/ws/group-chat/{room.id}/"
+
+    async def scenario():
+        client = WebsocketClient(first, path)
+        assert await client.connect()
+        snapshot = await client.receive_json("presence")
+        assert snapshot["online"] == 1
+        assert (await client.receive_json("presence"))["joined"] == [first.id]
+
+        # 같은 유저의 두 번째 연결은 입장으로 치지 않음
+        other = WebsocketClient(second, path)
+        second_tab = WebsocketClient(second, path)
+        assert await other.connect()
+        assert await second_tab.connect()
+        delta = await client.receive_json("presence")
+        assert (delta["joined"], delta["left"], delta["online"]) == ([second.id], [], 2)
+
+        await second_tab.disconnect()
+        await other.disconnect()
+        delta = await client.receive_json("presence")
+        assert (delta["joined"], delta["left"], delta["online"]) == ([], [second.id], 1)
+        await client.disconnect()
+
+    async_to_sync(scenario)()
+
+    api = APIClient()
+    api.force_authenticate(first)
+    response = api.get(f"/api/group-chat/{room.id}/online")
+    assert response.data["online"] == 0
+
+
+@pytest.mark.django_db
+def test_my_rooms_unread_counts(django_assert_num_queries):
+    me, other = create_user("me"), create_user("other")
+    rooms = [create_room(other) for _ in range(3)]
+    for room in rooms:
+        GroupChatMembership.objects.create(room=room, user=me)
+    messages = [
+        GroupChatMessage.objects.create(room=rooms[0], user=other, content=str(i))
+        for i in range(3)
+    ]
+    mine = GroupChatMessage.objects.create(room=rooms[0], user=me, content="내 메시지")
+    GroupChatMessage.objects.create(room=rooms[1], user=other, content="안녕")
+
+    client = APIClient()
+    client.force_authenticate(me)
+
+    # 읽은 위치는 앞으로만 이동
+    url = f"/api/group-chat/{rooms[0].id}/read"
+    assert client.post(url, {"message_id": messages[0].id}).status_code == 204
+    client.post(url, {"message_id": 1})
+
+    with django_assert_num_queries(1):  # 방 개수와 상관없이 쿼리 한 번
+        response = client.get("/api/group-chat/rooms")
+    data = {room["room_id"]: room for room in response.data}
+    assert data[rooms[0].id]["unread_count"] == 2  # 내가 보낸 메시지 제외
+    assert data[rooms[0].id]["last_message"]["content"] == "내 메시지"
+    assert data[rooms[1].id]["unread_count"] == 1
+    assert data[rooms[2].id]["last_message"] is None
+    assert response.data[-1]["room_id"] == rooms[2].id  # 메시지 없는 방은 마지막
+
+    # message_id 없이 요청하면 마지막 메시지까지 읽음
+    client.post(f"/api/group-chat/{rooms[1].id}/read")
+    response = client.get("/api/group-chat/rooms")
+    assert {room["unread_count"] for room in response.data} == {0, 2}
+
+    # 방의 마지막 메시지보다 뒤인 id(다른 방 메시지 등)는 마지막 메시지까지로 제한
+    later = GroupChatMessage.objects.create(room=rooms[2], user=other, content="뒤")
+    client.post(f"/api/group-chat/{rooms[0].id}/read", {"message_id": later.id})
+    membership = GroupChatMembership.objects.get(room=rooms[0], user=me)
+    assert membership.last_read_message_id == mine.id
+    GroupChatMessage.objects.create(room=rooms[0], user=other, content="새 메시지")
+    response = client.get("/api/group-chat/rooms")
+    data = {room["room_id"]: room for room in response.data}
+    assert data[rooms[0].id]["unread_count"] == 1
+
+    # 멤버가 아니면 403, 없는 방이면 404
+    client.force_authenticate(create_user("outsider"))
+    assert client.post(url).status_code == 403
+    assert client.post("/api/group-chat/0/read").status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_websocket_read_is_coalesced():
+    user = create_user("member")
+    room = create_room(user)
+    membership = GroupChatMembership.objects.create(room=room, user=user)
+    ids = [
+        GroupChatMessage.objects.create(room=room, user=user, content=str(i)).id
+        for i in range(10)
+    ]
+
+    async def scenario():
+        client = WebsocketClient(user, f"/ws/group-chat/{room.id}/")
+        assert await client.connect()
+        for message_id in (ids[5], ids[9], ids[7]):
+            await client.send_json({"type": "read", "message_id": message_id})
+        await client.disconnect()  # 종료 시 모아둔 읽음 위치 저장
+
+    async_to_sync(scenario)()
+    membership.refresh_from_db()
+    assert membership.last_read_message_id == ids[9]
+
+
+@pytest.mark.django_db
+def test_delete_old_messages_purges_in_resumable_batches():
+    leader, gone, recent = (
+        create_user("leader"),
+        create_user("gone"),
+        create_user("recent"),
+    )
+    room = create_room(leader)
+    for user in (leader, gone, recent):
+        GroupChatMessage.objects.bulk_create(
+            GroupChatMessage(room=room, user=user, content=str(i)) for i in range(5)
+        )
+    User.objects.filter(id=gone.id).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=8)
+    )
+    User.objects.filter(id=recent.id).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=1)
+    )
+    targets = GroupChatMessage.objects.filter(user=gone)
+    purger = BatchPurger("test.chat", targets, batch_size=2)
+
+    out = StringIO()
+    call_command("delete_old_messages", "--dry-run", stdout=out)
+    assert "삭제 예정 메시지 수: 5" in out.getvalue()
+    assert targets.count() == 5
+
+    # 첫 배치 뒤 중단된 것처럼 체크포인트만 남기고 나머지는 이어서 삭제
+    first = purger.next_upper_bound(0)
+    targets.filter(id__lte=first).delete()
+    cache.set(purger.checkpoint_key, first)
+    stats = purger.run()
+    assert (stats.resumed_from, stats.deleted, stats.batches) == (first, 3, 2)
+    assert purger.get_checkpoint() == 0  # 끝까지 돌면 체크포인트 삭제
+
+    GroupChatMessage.objects.bulk_create(
+        GroupChatMessage(room=room, user=gone, content="추가") for _ in range(3)
+    )
+    out = StringIO()
+    call_command("delete_old_messages", "--batch-size", "2", stdout=out)
+    assert "메시지 3건, 배치 2회" in out.getvalue()
+    assert not targets.exists()
+    assert GroupChatMessage.objects.count() == 10  # 기간이 안 지난 탈퇴 유저는 유지
+
+
+@pytest.mark.django_db
+def test_archived_messages_are_paged_transparently(
+    settings, tmp_path, django_capture_on_commit_callbacks
+):
+    use_archive_storage(settings, tmp_path)
+    settings.MEDIA_ROOT = tmp_path / "public"
+    settings.CHAT_ARCHIVE = {"AFTER_DAYS": 30, "SEGMENT_SIZE": 2}
+    user = create_user("member")
+    room = create_room(user)
+    GroupChatMembership.objects.create(room=room, user=user)
+    ids = [
+        GroupChatMessage.objects.create(room=room, user=user, content=str(i)).id
+        for i in range(7)
+    ]
+    GroupChatMessage.objects.filter(id__in=ids[:5]).update(
+        created_at=timezone.now() - timedelta(days=31)
+    )
+
+    call_command("archive_chat_messages", stdout=StringIO())
+    segments = ChatArchiveSegment.objects.filter(room=room).order_by("first_message_id")
+    assert [s.message_count for s in segments] == [2, 2, 1]
+    # 공개 저장소(MEDIA)가 아닌 보관 파일 전용 저장소에만 저장
+    assert not (tmp_path / "public").exists()
+    assert all((tmp_path / s.path).exists() for s in segments)
+    assert list(GroupChatMessage.objects.values_list("id", flat=True)) == ids[5:]
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f"/api/group-chat/{room.id}/messages"
+
+    # 실시간 테이블과 보관 파일에 걸친 최근 메시지
+    response = client.get(url, {"limit": 4})
+    assert [m["id"] for m in response.data["results"]] == ids[3:]
+    assert response.data["results"][0]["nickname"] == "member"
+    assert response.data["has_more"] is True
+
+    response = client.get(url, {"before": ids[3], "limit": 4})
+    assert [m["content"] for m in response.data["results"]] == ["0", "1", "2"]
+    assert response.data["has_more"] is False
+
+    response = client.get(url, {"after": ids[1], "limit": 4})
+    assert [m["id"] for m in response.data["results"]] == ids[2:6]
+    assert response.data["has_more"] is True
+
+    # 탈퇴 유저 메시지는 보관 파일에서도 삭제 (남은 메시지로 새 파일, 모두 지워지면 구간 삭제)
+    gone = create_user("gone")
+    GroupChatMembership.objects.create(room=room, user=gone)
+    mixed, alone = [
+        GroupChatMessage.objects.create(room=room, user=gone, content=f"탈퇴 {i}")
+        for i in range(2)
+    ]
+    GroupChatMessage.objects.filter(id__in=[mixed.id, alone.id]).update(
+        created_at=timezone.now() - timedelta(days=31)
+    )
+    GroupChatMessage.objects.filter(id__in=ids[5:]).update(
+        created_at=timezone.now() - timedelta(days=31)
+    )
+    settings.CHAT_ARCHIVE = {"AFTER_DAYS": 30, "SEGMENT_SIZE": 3}
+    call_command("archive_chat_messages", stdout=StringIO())
+    User.objects.filter(id=gone.id).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=8)
+    )
+    before = {s.id: s.path for s in ChatArchiveSegment.objects.all()}
+    out = StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("delete_old_messages", stdout=out)
+    assert "[보관 파일] 메시지 2건 삭제" in out.getvalue()
+    segments = ChatArchiveSegment.objects.filter(room=room).order_by("first_message_id")
+    assert [s.message_count for s in segments] == [2, 2, 1, 2]
+    assert segments[3].path != before[segments[3].id]
+    assert not (tmp_path / before[segments[3].id]).exists()
+    assert set(before) - {s.id for s in segments}  # 탈퇴 유저만 있던 구간 삭제
+    response = client.get(url, {"after": ids[-1]})
+    assert response.data["results"] == []
+    response = client.get(url, {"limit": 50})
+    assert [m["id"] for m in response.data["results"]] == ids
+
+    # 채팅방이 삭제되면 보관 파일도 삭제
+    paths = [tmp_path / s.path for s in segments]
+    with django_capture_on_commit_callbacks(execute=True):
+        room.delete()
+    assert not any(path.exists() for path in paths)
+
+
+def test_rewritten_segment_is_not_served_from_cache(settings, tmp_path):
+    from apps.chat.services.archive import (
+        get_archive_config,
+        get_archive_storage,
+        read_segment,
+        save_segment_file,
+    )
+
+    use_archive_storage(settings, tmp_path)
+    config = get_archive_config()
+    row = {"id": 1, "user_id": 1, "content": "탈퇴", "created_at": timezone.now()}
+    old = save_segment_file(1, 1, 2, [row, {**row, "id": 2, "user_id": 2}], config)
+    assert len(read_segment(old)) == 2
+
+    # 이전 파일을 지우고 같은 구간을 다시 써도 이름이 달라 캐시된 내용을 쓰지 않음
+    get_archive_storage().delete(old)
+    new = save_segment_file(1, 1, 2, [{**row, "id": 2, "user_id": 2}], config)
+    assert new != old
+    assert [r["user_id"] for r in read_segment(new)] == [2]
+
+
+@pytest.mark.django_db
+def test_archive_removes_file_when_db_write_fails(settings, tmp_path, monkeypatch):
+    from apps.chat.models import ChatArchiveSegmentUser
+    from apps.chat.services.archive import archive_room
+
+    use_archive_storage(settings, tmp_path)
+    user = create_user("member")
+    room = create_room(user)
+    message = GroupChatMessage.objects.create(room=room, user=user, content="old")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(ChatArchiveSegmentUser.objects, "bulk_create", fail)
+    with pytest.raises(RuntimeError):
+        archive_room(room.id, message.id)
+    # 파일을 지우고 메시지는 그대로 남겨 다음 실행에서 다시 옮김
+    assert not list(tmp_path.rglob("*.jsonl.gz"))
+    assert GroupChatMessage.objects.filter(id=message.id).exists()
+    assert not ChatArchiveSegment.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chat_load_test_report():
+    fixture = create_load_test_rooms(rooms=2, clients_per_room=3)
+    try:
+        report = async_to_sync(run_load_test)(fixture, messages_per_client=2)
+    finally:
+        delete_load_test_rooms(fixture)
+
+    assert (report.sent, report.delivered, report.errors) == (12, 36, 0)
+    assert 0 < report.latency_ms["p50"] <= report.latency_ms["p99"]
+    # 메시지는 지연 저장으로 모아서 INSERT하므로 메시지당 쿼리는 1회 미만
+    assert 0 < report.queries_per_message < 1
+    assert not GroupChatRoom.objects.filter(id__in=[r for r, _ in fixture]).exists()
+
+    baseline = {**report.to_dict(), "messages_per_sec": report.messages_per_sec * 2}
+    [(name, *_, regressed)] = [
+        row for row in compare_reports(report.to_dict(), baseline) if row[-1]
+    ]
+    assert name == "messages_per_sec"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_chat_load_test_command_in_memory(settings):
+    # 접속할 수 없는 Redis가 설정되어 있어도 --in-memory면 채널 레이어와 접속자 저장소 모두 교체
+    settings.CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [("127.0.0.1", 1)]},
+        }
+    }
+    out = StringIO()
+    call_command(
+        "chat_load_test",
+        "--rooms=1",
+        "--clients=2",
+        "--messages=1",
+        "--in-memory",
+        stdout=out,
+    )
+    report = json.loads(out.getvalue())
+    assert report["channel_layer"] == "InMemoryChannelLayer"
+    assert (report["sent"], report["errors"]) == (2, 0)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_msgpack_subprotocol_frames(settings):
+    settings.CHAT_WRITE_BEHIND = {"ENABLED": False}
+    user, other = create_user("member"), create_user("other")
+    room = create_room(user)
+    GroupChatMembership.objects.create(room=room, user=user)
+    GroupChatMembership.objects.create(room=room, user=other)
+    path = f"/ws/group-chat/{room.id}/"
+
+    async def receive_binary(client):
+        # 접속자(presence) 알림은 건너뜀
+        while True:
+            frame = msgpack.unpackb((await client.receive_output())["bytes"])
+            if frame.get("type") != "presence":
+                return frame
+
+    async def scenario():
+        binary = WebsocketClient(user, path, subprotocols=[MSGPACK_SUBPROTOCOL])
+        text = WebsocketClient(other, path)
+        assert await binary.connect() and await text.connect()
+        assert (binary.subprotocol, text.subprotocol) == (MSGPACK_SUBPROTOCOL, None)
+
+        for content in ("안녕", "하세요"):
+            await binary.send_input(
+                {
+                    "type": "websocket.receive",
+                    "bytes": msgpack.packb({"message": content}),
+                }
+            )
+            await text.receive_json()  # JSON 클라이언트는 기존 형식 그대로
+        await text.send_json({"message": "반가워요"})
+
+        # 닉네임은 유저마다 한 번만, 메시지 프레임에는 user_id만
+        frames = [await receive_binary(binary) for _ in range(5)]
+        assert [f["t"] for f in frames] == ["u", "m", "m", "u", "m"]
+        assert frames[0] == {"t": "u", "u": user.id, "n": "member"}
+        assert (frames[2]["u"], frames[2]["m"]) == (user.id, "하세요")
+        assert frames[3]["n"] == "other" and "nickname" not in frames[4]
+
+        data = await text.receive_json()
+        assert (data["nickname"], data["message"]) == ("other", "반가워요")
+        await binary.disconnect()
+        await text.disconnect()
+
+    async_to_sync(scenario)()
+    assert GroupChatMessage.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_join_chatroom_follows_meet_applies(django_assert_num_queries):
+    leader, member, outsider = (
+        create_user("leader"),
+        create_user("member"),
+        create_user("outsider"),
+    )
+    meet = Meet.objects.create(
+        user=leader,
+        title="모임",
+        application_deadline=timezone.now() + timedelta(days=7),
+    )
+
+    # 지원하면 채팅방이 만들어지고 바로 멤버가 됨
+    apply_to_meet(member, meet.id)
+    room = GroupChatRoom.objects.get(meet=meet)
+    assert GroupChatMembership.objects.filter(room=room, user=member).exists()
+    GroupChatMessage.objects.bulk_create(
+        GroupChatMessage(room=room, user=member, content=str(i)) for i in range(3)
+    )
+
+    client = APIClient()
+    client.force_authenticate(member)
+    url = f"/api/group-chat/join/{meet.id}"
+    with django_assert_num_queries(1):  # 이미 멤버면 조회 한 번
+        response = client.post(url)
+    assert response.data["room_id"] == room.id and "messages" not in response.data
+
+    # 최근 메시지를 같은 응답으로
+    response = client.post(f"{url}?messages=2")
+    assert [m["content"] for m in response.data["messages"]["results"]] == ["1", "2"]
+    assert response.data["messages"]["has_more"] is True
+
+    # 멤버십이 없던 리더는 확인 후 추가, 참여하지 않은 유저는 403
+    client.force_authenticate(leader)
+    assert client.post(url).data["room_id"] == room.id
+    client.force_authenticate(outsider)
+    assert client.post(url).status_code == 403
+    assert client.post("/api/group-chat/join/0").status_code == 404
+
+    # 지원이 취소되면 멤버십도 삭제
+    MeetApply.objects.filter(meet=meet, user=member).delete()
+    assert list(room.members.values_list("user_id", flat=True)) == [leader.id]
+
+
+@pytest.mark.django_db
+def test_message_search_ranked_with_snippets():
+    user = create_user("member")
+    room, other_room = create_room(user), create_room(user)
+    GroupChatMembership.objects.create(room=room, user=user)
+    contents = [
+        "내일 모임 장소는 강남역입니다",
+        "강남역 11번 출구 앞에서 만나요",
+        "저녁은 <피자> 먹어요",
+        "오늘 날씨 좋네요",
+    ]
+    messages = [
+        GroupChatMessage.objects.create(room=room, user=user, content=c)
+        for c in contents
+    ]
+    GroupChatMessage.objects.create(room=other_room, user=user, content="강남역")
+
+    client = APIClient()
+    client.force_authenticate(user)
+    url = f"/api/group-chat/{room.id}/search"
+
+    # 띄어쓰기 없는 한국어도 부분 문자열로 검색, 다른 방 메시지는 제외
+    response = client.get(url, {"q": "강남역"})
+    assert {m["id"] for m in response.data["results"]} == {
+        messages[0].id,
+        messages[1].id,
+    }
+    assert "<mark>강남역</mark>" in response.data["results"][0]["snippet"]
+
+    # 페이지 나누기
+    response = client.get(url, {"q": "강남역", "page_size": 1})
+    assert len(response.data["results"]) == 1 and response.data["has_more"] is True
+
+    # 스니펫은 이스케이프, 3글자 미만은 LIKE로 검색
+    response = client.get(url, {"q": "피자"})
+    assert (
+        response.data["results"][0]["snippet"]
+        == "저녁은 &lt;<mark>피자</mark>&gt; 먹어요"
+    )
+
+    # 삭제/수정도 색인에 반영
+    messages[0].delete()
+    GroupChatMessage.objects.filter(id=messages[3].id).update(content="강남역 날씨")
+    response = client.get(url, {"q": "강남역"})
+    assert {m["id"] for m in response.data["results"]} == {
+        messages[1].id,
+        messages[3].id,
+    }
+    assert client.get(url).status_code == 400
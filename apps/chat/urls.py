@@ -1,6 +1,12 @@
 from django.urls import path
 
-from apps.chat.views import GroupChatMessageListView
+from apps.chat.views import (
+    GroupChatMessageListView,
+    GroupChatMessageSearchView,
+    GroupChatOnlineCountView,
+    GroupChatReadView,
+    MyGroupChatRoomListView,
+)
 
 from .views import JoinGroupChatView
 
@@ -11,4 +17,20 @@ urlpatterns = [
         name="group-chat-join",
     ),
     path("group-chat/<int:room_id>/messages", GroupChatMessageListView.as_view()),
+    path(
+        "group-chat/<int:room_id>/search",
+        GroupChatMessageSearchView.as_view(),
+        name="group-chat-search",
+    ),
+    path("group-chat/rooms", MyGroupChatRoomListView.as_view(), name="my-chat-rooms"),
+    path(
+        "group-chat/<int:room_id>/read",
+        GroupChatReadView.as_view(),
+        name="group-chat-read",
+    ),
+    path(
+        "group-chat/<int:room_id>/online",
+        GroupChatOnlineCountView.as_view(),
+        name="group-chat-online",
+    ),
 ]
@@ -1,59 +1,232 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.chat.models import GroupChatMembership, GroupChatMessage, GroupChatRoom
-from apps.meet.models import Meet, MeetApply
+from apps.chat.permissions import IsChatRoomMember
+from apps.chat.services.chatroom_service import ChatRoomNotFoundError, join_chatroom
+from apps.chat.services.message_history import (
+    DEFAULT_HISTORY_LIMIT,
+    MAX_HISTORY_LIMIT,
+    get_message_window,
+)
+from apps.chat.services.message_search import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    search_messages,
+)
+from apps.chat.services.presence import get_presence_store
+from apps.chat.services.read_state import mark_read, my_rooms
 
-from .serializers import GroupChatMessageSerializer
+from .serializers import (
+    GroupChatMessageSearchSerializer,
+    GroupChatMessageSerializer,
+    MyChatRoomSerializer,
+    ReadMessageSerializer,
+)
 
 
 class JoinGroupChatView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_summary="채팅방 입장",
+        operation_description="모임 채팅방에 입장합니다. messages=N 을 주면 최근 메시지 N개를 함께 반환합니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                "messages",
+                openapi.IN_QUERY,
+                description=f"함께 받을 최근 메시지 수 (최대 {MAX_HISTORY_LIMIT})",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        tags=["채팅"],
+    )
     def post(self, request, meet_id):
-        # 1. 해당 모임 가져오기 (존재하지 않으면 404)
-        meet = get_object_or_404(Meet, id=meet_id)
-
-        # 2. 현재 유저가 모임 참여자인지 확인
-        is_participant = MeetApply.objects.filter(meet=meet, user=request.user).exists()
-        if not is_participant and meet.user != request.user:
+        # 1. 입장 (이미 멤버면 조회 한 번, 아니면 참여 여부 확인 후 한 트랜잭션에서 추가)
+        try:
+            room_id = join_chatroom(request.user, meet_id)
+        except ChatRoomNotFoundError:
+            raise Http404
+        except PermissionError:
             return Response(
                 {"detail": "모임에 참여하지 않은 유저입니다."},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        data = {"room_id": room_id, "message": "채팅방에 입장했습니다."}
+
+        # 2. 요청하면 최근 메시지도 같은 응답에 포함
+        limit = GroupChatMessageListView.get_id_param(request, "messages")
+        if limit is not None:
+            messages, has_more = get_message_window(
+                room_id, limit=min(limit, MAX_HISTORY_LIMIT)
+            )
+            data["messages"] = {
+                "has_more": has_more,
+                "results": GroupChatMessageSerializer(messages, many=True).data,
+            }
+
+        return Response(data, status=status.HTTP_200_OK)
 
-        # 3. 채팅방이 없으면 생성
-        room, created = GroupChatRoom.objects.get_or_create(meet=meet)
 
-        # 4. 채팅방에 참여자로 추가 (중복 방지)
-        GroupChatMembership.objects.get_or_create(room=room, user=request.user)
+class GroupChatMessageListView(APIView):
+    permission_classes = [IsAuthenticated, IsChatRoomMember]
+
+    @swagger_auto_schema(
+        operation_summary="채팅 메시지 조회",
+        operation_description="before/after(메시지 id) 기준으로 최대 limit개의 메시지를 오래된 순으로 조회합니다. "
+        "재접속 시 after=마지막으로 받은 메시지 id 로 이후 메시지만 받을 수 있습니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                "before",
+                openapi.IN_QUERY,
+                description="이 id보다 이전 메시지",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "after",
+                openapi.IN_QUERY,
+                description="이 id보다 이후 메시지",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description=f"조회 개수 (기본 {DEFAULT_HISTORY_LIMIT}, 최대 {MAX_HISTORY_LIMIT})",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        tags=["채팅"],
+    )
+    def get(self, request, room_id):
+        # 1. 조회 범위 파라미터 검사
+        before = self.get_id_param(request, "before")
+        after = self.get_id_param(request, "after")
+        limit = self.get_id_param(request, "limit") or DEFAULT_HISTORY_LIMIT
+        limit = min(limit, MAX_HISTORY_LIMIT)
+
+        # 2. 메시지 조회 (id 범위 + limit, 작성자 함께 조회)
+        messages, has_more = get_message_window(
+            room_id, before=before, after=after, limit=limit
+        )
+        serializer = GroupChatMessageSerializer(messages, many=True)
 
         return Response(
-            {"room_id": room.id, "message": "채팅방에 입장했습니다."},
+            {"has_more": has_more, "results": serializer.data},
             status=status.HTTP_200_OK,
         )
 
+    @staticmethod
+    def get_id_param(request, name):
+        value = request.query_params.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: "정수를 입력해주세요."})
+        if value < 1:
+            raise ValidationError({name: "1 이상의 값을 입력해주세요."})
+        return value
 
-class GroupChatMessageListView(APIView):
-    permission_classes = [IsAuthenticated]
 
+class GroupChatMessageSearchView(APIView):
+    permission_classes = [IsAuthenticated, IsChatRoomMember]
+
+    @swagger_auto_schema(
+        operation_summary="채팅 메시지 검색",
+        operation_description="채팅방 메시지에서 검색어가 포함된 메시지를 관련도 순으로 조회합니다. "
+        "snippet에는 검색어가 <mark>로 감싸진 메시지 일부가 담깁니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="검색어",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+            openapi.Parameter(
+                "page",
+                openapi.IN_QUERY,
+                description="페이지",
+                type=openapi.TYPE_INTEGER,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description=f"페이지 크기 (기본 {DEFAULT_SEARCH_LIMIT}, 최대 {MAX_SEARCH_LIMIT})",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        tags=["채팅"],
+    )
     def get(self, request, room_id):
-        # 1. 채팅방 유효성 검사
-        room = get_object_or_404(GroupChatRoom, id=room_id)
+        # 1. 검색어와 페이지 파라미터 검사
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "검색어를 입력해주세요."})
+        page = GroupChatMessageListView.get_id_param(request, "page") or 1
+        page_size = min(
+            GroupChatMessageListView.get_id_param(request, "page_size")
+            or DEFAULT_SEARCH_LIMIT,
+            MAX_SEARCH_LIMIT,
+        )
 
-        # 2. 채팅방 멤버인지 확인
-        if not GroupChatMembership.objects.filter(
-            room=room, user=request.user
-        ).exists():
-            return Response(
-                {"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
-            )
+        # 2. 검색 (관련도 순, 한 건 더 읽어서 다음 페이지 여부 확인)
+        messages, has_more = search_messages(
+            room_id, query, limit=page_size, offset=(page - 1) * page_size
+        )
+        serializer = GroupChatMessageSearchSerializer(messages, many=True)
 
-        # 3. 메시지 목록 조회
-        messages = GroupChatMessage.objects.filter(room=room).order_by("created_at")
-        serializer = GroupChatMessageSerializer(messages, many=True)
+        return Response(
+            {"has_more": has_more, "results": serializer.data},
+            status=status.HTTP_200_OK,
+        )
+
+
+class GroupChatOnlineCountView(APIView):
+    permission_classes = [IsAuthenticated, IsChatRoomMember]
+
+    @swagger_auto_schema(
+        operation_summary="채팅방 접속자 수 조회",
+        operation_description="현재 웹소켓으로 접속 중인 유저 수를 반환합니다.",
+        tags=["채팅"],
+    )
+    def get(self, request, room_id):
+        online = get_presence_store().online_count_sync(room_id)
+        return Response({"room_id": room_id, "online": online})
+
+
+class GroupChatReadView(APIView):
+    permission_classes = [IsAuthenticated, IsChatRoomMember]
+
+    @swagger_auto_schema(
+        operation_summary="채팅 읽음 처리",
+        operation_description="message_id까지 읽음 처리합니다. 비우면 마지막 메시지까지 읽음 처리합니다. 읽은 위치는 앞으로만 이동합니다.",
+        request_body=ReadMessageSerializer,
+        tags=["채팅"],
+    )
+    def post(self, request, room_id):
+        serializer = ReadMessageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        mark_read(self.membership_id, serializer.validated_data.get("message_id"))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MyGroupChatRoomListView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    @swagger_auto_schema(
+        operation_summary="내 채팅방 목록 조회",
+        operation_description="참여 중인 채팅방마다 마지막 메시지와 안 읽은 메시지 수를 반환합니다.",
+        responses={200: MyChatRoomSerializer(many=True)},
+        tags=["채팅"],
+    )
+    def get(self, request):
+        serializer = MyChatRoomSerializer(my_rooms(request.user), many=True)
+        return Response(serializer.data)
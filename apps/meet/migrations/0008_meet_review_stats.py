@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meet", "0007_alter_meet_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meet",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, verbose_name="평점합계"),
+        ),
+        migrations.AddField(
+            model_name="meet",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="리뷰수"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meet", "0008_meet_review_stats"),
+        ("options", "0003_areaclosure"),
+        ("upload", "0007_alter_file_file_alter_file_thumbnail"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meet",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="meet_meet_created_40c28f_idx"
+            ),
+        ),
+    ]
@@ -18,7 +18,13 @@ class MeetContact(models.TextChoices):
     ONOFFLINE = "on/off-line", "온/오프라인"
 
 
-class ActiveMeetManager(models.Manager):
+class MeetQuerySet(models.QuerySet):
+    def in_area(self, area_id):
+        # 선택한 지역과 모든 하위 지역의 모임 (계층 테이블 서브쿼리 한 번으로 조회)
+        return self.filter(area_id__in=AreaClosure.objects.descendant_ids(area_id))
+
+
+class ActiveMeetManager(models.Manager.from_queryset(MeetQuerySet)):
     def get_queryset(self):
         return super().get_queryset().exclude(is_deleted=True)
 
@@ -70,17 +76,27 @@ class Meet(TimestampModel):
     link = models.URLField(
         max_length=500, null=True, blank=True, verbose_name="오픈채팅방링크"
     )
+    # 리뷰 작성/수정/삭제 시 함께 갱신되는 집계값 (목록에서 모임마다 집계 쿼리를 하지 않도록)
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name="평점합계")
+    review_count = models.PositiveIntegerField(default=0, verbose_name="리뷰수")
 
     objects = ActiveMeetManager()  # is_deleted=True 제거됨
-    all_objects = models.Manager()  # 원래 모든 queryset 접근용
+    all_objects = MeetQuerySet.as_manager()  # 원래 모든 queryset 접근용
 
     def __str__(self):
         return f"[{self.pk}] {self.title}"
 
+    @property
+    def rating_avg(self):
+        if not self.review_count:
+            return 0
+        return self.rating_sum / self.review_count
+
     class Meta:
         verbose_name = "모임"
         verbose_name_plural = "모임 목록"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"])]  # 커서 페이지네이션
 
 
 class MeetApply(models.Model):
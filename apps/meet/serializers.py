@@ -1,10 +1,9 @@
 from datetime import timedelta
 
-from django.db.models import Avg
 from django.utils import timezone
 from rest_framework import serializers
 
-from apps.options.serializers.area import AreaSerializer
+from apps.options.serializers.area import AreaFullPathField
 from apps.options.serializers.category import CategorySerializer
 from apps.options.serializers.digital_level import DigitalLevelSerializer
 from apps.options.serializers.interest import InterestSerializer
@@ -62,14 +61,14 @@ class MeetCreateSerializer(serializers.ModelSerializer):
 
 class MeetListSerializer(serializers.ModelSerializer):
     status = serializers.ReadOnlyField()
-    area = serializers.CharField(source="area.full_path", read_only=True)
+    area = AreaFullPathField()
     file = FileSerializer(read_only=True)
     leader_nickname = serializers.CharField(source="user.nickname", read_only=True)
     leader_image = serializers.SerializerMethodField()
 
     def get_leader_image(self, obj):
         if obj.user.file:
-            return FileSerializer(obj.user.file).data
+            return FileSerializer(obj.user.file, context=self.context).data
         return None
 
     class Meta:
@@ -93,18 +92,12 @@ class MeetListSerializer(serializers.ModelSerializer):
 
 class MeetUserListSerializer(serializers.ModelSerializer):
     status = serializers.ReadOnlyField()
-    area = serializers.CharField(source="area.full_path", read_only=True)
+    area = AreaFullPathField()
     file = FileSerializer(read_only=True)
-    # 리뷰의 평점 평균
-    meet_rating = serializers.SerializerMethodField()
+    # 리뷰의 평점 평균 (모임에 저장된 집계값, 추가 쿼리 없음)
+    meet_rating = serializers.ReadOnlyField(source="rating_avg")
     # 리뷰 개수
-    review_count = serializers.SerializerMethodField()
-
-    def get_meet_rating(self, obj):
-        return obj.reviews.aggregate(avg=Avg("rating"))["avg"] or 0
-
-    def get_review_count(self, obj):
-        return obj.reviews.count()
+    review_count = serializers.ReadOnlyField()
 
     class Meta:
         model = Meet
@@ -196,10 +189,10 @@ class MeetDetailSerializer(serializers.ModelSerializer):
     leader = LeaderSerializer(source="user", read_only=True)
     # meet를 fk로 하는 meetapply의 유저 명단
     member = serializers.SerializerMethodField()
-    # 리뷰의 평점 평균
-    meet_rating = serializers.SerializerMethodField()
+    # 리뷰의 평점 평균 (모임에 저장된 집계값, 추가 쿼리 없음)
+    meet_rating = serializers.ReadOnlyField(source="rating_avg")
     # 리뷰 개수
-    review_count = serializers.SerializerMethodField()
+    review_count = serializers.ReadOnlyField()
     # 일정 계산(date을 시작일로 매주 총 session_count번의 일정의 날짜를 계산)
     schedule = serializers.SerializerMethodField()
     # 진행방법 태그명으로 반환
@@ -210,17 +203,15 @@ class MeetDetailSerializer(serializers.ModelSerializer):
             {
                 "id": app.user.id,
                 "nickname": app.user.nickname,
-                "file": FileSerializer(app.user.file).data if app.user.file else None,
+                "file": (
+                    FileSerializer(app.user.file, context=self.context).data
+                    if app.user.file
+                    else None
+                ),
             }
             for app in obj.applications.all()
         ]
 
-    def get_meet_rating(self, obj):
-        return obj.reviews.aggregate(avg=Avg("rating"))["avg"] or 0
-
-    def get_review_count(self, obj):
-        return obj.reviews.count()
-
     def get_schedule(self, obj):
         if not obj.date or not obj.session_count:
             return []
@@ -0,0 +1,70 @@
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from apps.chat.services.chatroom_service import add_chat_members
+from apps.meet.models import Meet, MeetApply
+
+
+class MeetApplyError(Exception):
+    detail = "모임 지원에 실패했습니다."
+
+    def __init__(self, detail=None):
+        super().__init__(detail or self.detail)
+        self.detail = detail or self.detail
+
+
+class MeetNotFoundError(MeetApplyError):
+    detail = "존재하지 않는 모임입니다."
+
+
+class AlreadyAppliedError(MeetApplyError):
+    detail = "이미 지원한 모임입니다."
+
+
+class MeetClosedError(MeetApplyError):
+    detail = "모집이 종료된 모임입니다."
+
+
+def _reserve_seat_sql():
+    table = connection.ops.quote_name(Meet._meta.db_table)
+    return (
+        f"UPDATE {table} SET current_people = current_people + 1, updated_at = %s "
+        "WHERE id = %s AND is_deleted = %s AND application_deadline >= %s "
+        "AND (max_people IS NULL OR current_people < max_people) "
+        "RETURNING current_people"
+    )
+
+
+def reserve_seat(meet_id):
+    """
+    모집 중이고 자리가 남아 있을 때만 현재 인원을 1 늘리고 늘어난 값을 반환 (없으면 None)
+    조건 확인과 증가가 UPDATE 한 번에 처리되므로 동시에 지원해도 최대 인원을 넘지 않음
+    raw SQL은 auto_now가 적용되지 않으므로 updated_at도 직접 갱신
+    """
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(_reserve_seat_sql(), [now, meet_id, False, now])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def apply_to_meet(user, meet_id):
+    """모임 지원 후 늘어난 현재 인원을 반환 (실패 시 MeetApplyError)"""
+    try:
+        with transaction.atomic():
+            current_people = reserve_seat(meet_id)
+            if current_people is not None:
+                # 중복 지원은 unique_together 제약으로 막음 (실패하면 자리 예약도 함께 롤백)
+                MeetApply.objects.create(user=user, meet_id=meet_id)
+                # 지원과 함께 채팅방 멤버로 추가
+                add_chat_members(meet_id, [user.id])
+                return current_people
+    except IntegrityError:
+        raise AlreadyAppliedError()
+
+    # 자리를 예약하지 못한 경우에만 이유를 확인
+    if not Meet.objects.filter(pk=meet_id).exists():
+        raise MeetNotFoundError()
+    if MeetApply.objects.filter(user=user, meet_id=meet_id).exists():
+        raise AlreadyAppliedError()
+    raise MeetClosedError()
@@ -1,3 +1,181 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Barrier
 
-# Create your tests here.
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.meet.models import Meet, MeetApply
+from apps.meet.services.apply_service import (
+    AlreadyAppliedError,
+    MeetApplyError,
+    MeetClosedError,
+    apply_to_meet,
+)
+from apps.reviews.models import Review, rebuild_review_stats
+
+User = get_user_model()
+
+
+def create_user(nickname):
+    return User.objects.create_user(
+        email=f"{nickname}@example.com", password="Testpass123!", nickname=nickname
+    )
+
+
+def create_meet(leader, title="모임", **kwargs):
+    return Meet.objects.create(
+        user=leader,
+        title=title,
+        application_deadline=timezone.now() + timedelta(days=7),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+def test_meet_review_stats_follow_reviews():
+    leader = create_user("leader")
+    meet = create_meet(leader)
+    first = Review.objects.create(user=create_user("a"), meet=meet, rating=5)
+    Review.objects.create(user=create_user("b"), meet=meet, rating=3)
+
+    meet.refresh_from_db()
+    assert (meet.rating_sum, meet.review_count, meet.rating_avg) == (8, 2, 4)
+
+    first.rating = 1
+    first.save()
+    meet.refresh_from_db()
+    assert (meet.rating_sum, meet.review_count) == (4, 2)
+
+    first.delete()
+    meet.refresh_from_db()
+    assert (meet.rating_sum, meet.review_count) == (3, 1)
+
+    # 집계값이 어긋나도 다시 계산하면 리뷰 테이블과 일치
+    Meet.objects.filter(pk=meet.pk).update(rating_sum=0, review_count=0)
+    rebuild_review_stats()
+    meet.refresh_from_db()
+    assert (meet.rating_sum, meet.review_count) == (3, 1)
+
+
+@pytest.mark.django_db
+def test_leader_meet_list_query_count(django_assert_max_num_queries):
+    leader = create_user("leader")
+    reviewer = create_user("reviewer")
+    for i in range(10):
+        meet = create_meet(leader, title=f"모임{i}")
+        Review.objects.create(user=reviewer, meet=meet, rating=4)
+
+    client = APIClient()
+    client.force_authenticate(leader)
+    url = reverse("meet:leader-meet-list", args=[leader.id])
+
+    # 모임 수와 상관없이 쿼리 수가 일정해야 함 (모임마다 리뷰 집계 쿼리 없음)
+    with django_assert_max_num_queries(3):
+        response = client.get(url)
+    assert response.status_code == 200
+    results = response.data["results"]
+    assert len(results) == 10
+    assert results[0]["meet_rating"] == 4
+    assert results[0]["review_count"] == 1
+
+
+@pytest.mark.django_db
+def test_apply_to_meet():
+    meet = create_meet(create_user("leader"), max_people=1)
+    first, second = create_user("a"), create_user("b")
+    created = meet.updated_at
+
+    assert apply_to_meet(first, meet.id) == 1
+    with pytest.raises(AlreadyAppliedError):
+        apply_to_meet(first, meet.id)
+    with pytest.raises(MeetClosedError):
+        apply_to_meet(second, meet.id)
+
+    meet.refresh_from_db()
+    assert meet.current_people == 1
+    assert meet.updated_at > created  # raw UPDATE도 수정일자 갱신
+    assert MeetApply.objects.filter(meet=meet).count() == 1
+
+
+# SQLite는 쓰기가 파일 단위로 잠겨 동시 트랜잭션을 재현할 수 없음
+@pytest.mark.skipif(
+    connection.vendor == "sqlite", reason="동시성 테스트는 PostgreSQL에서만 실행"
+)
+@pytest.mark.django_db(transaction=True)
+def test_apply_to_meet_concurrently_never_overbooks():
+    applicants = 200
+    max_people = 50
+    meet = create_meet(create_user("leader"), max_people=max_people)
+    users = User.objects.bulk_create(
+        User(email=f"user{i}@example.com", nickname=f"user{i}")
+        for i in range(applicants)
+    )
+    barrier = Barrier(applicants)
+
+    def apply(user):
+        barrier.wait()  # 모든 지원자가 동시에 출발
+        try:
+            return apply_to_meet(user, meet.id)
+        except MeetApplyError:
+            return None
+        finally:
+            connection.close()
+
+    # 지원자마다 별도 DB 연결 (DB의 max_connections가 지원자 수보다 커야 함)
+    with ThreadPoolExecutor(max_workers=applicants) as executor:
+        results = list(executor.map(apply, users))
+
+    accepted = [count for count in results if count is not None]
+    meet.refresh_from_db()
+    assert len(accepted) == max_people
+    assert sorted(accepted) == list(range(1, max_people + 1))
+    assert meet.current_people == max_people
+    assert MeetApply.objects.filter(meet=meet).count() == max_people
+
+
+@pytest.mark.django_db
+def test_meet_list_cursor_pagination():
+    leader = create_user("leader")
+    meets = [create_meet(leader, title=f"모임{i}") for i in range(15)]
+    # created_at이 같아도 id로 순서가 정해져야 함
+    Meet.objects.update(created_at=timezone.now())
+    expected = [meet.id for meet in reversed(meets)]
+
+    client = APIClient()
+    response = client.get("/api/meets")
+    assert response.status_code == 200
+    assert response.data["count"] == 15
+    first_page = [meet["id"] for meet in response.data["results"]]
+    assert first_page == expected[:10]
+
+    response = client.get(response.data["next"] + "&count=false")
+    assert "count" not in response.data
+    assert [meet["id"] for meet in response.data["results"]] == expected[10:]
+    assert response.data["next"] is None
+
+    response = client.get(response.data["previous"])
+    assert [meet["id"] for meet in response.data["results"]] == first_page
+    assert response.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_meet_list_cursor_pagination_schema():
+    generator = OpenAPISchemaGenerator(
+        openapi.Info(title="Onda API", default_version="v1")
+    )
+    request = Request(APIRequestFactory().get("/api/swagger.json"))
+    swagger = generator.get_schema(request=request, public=True)
+    operation = swagger["paths"]["/meets"]["get"]
+    params = {param["name"] for param in operation["parameters"]}
+    assert {"cursor", "page_size", "count"} <= params
+    schema = operation["responses"]["200"]["schema"]
+    assert set(schema["properties"]) == {"count", "next", "previous", "results"}
+    assert schema["required"] == ["results"]
@@ -1,6 +1,7 @@
 # meet/views.py
+from django.db import transaction
 from django.db.models import BooleanField, Case, F, Q, Value, When
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -13,10 +14,17 @@ from rest_framework.permissions import (
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.options.models import Area
+from apps.chat.services.chatroom_service import add_chat_members
+from apps.meet.services.apply_service import (
+    MeetApplyError,
+    MeetNotFoundError,
+    apply_to_meet,
+)
+from apps.upload.serializers import prefetch_variants
+from utils.pagination import CreatedAtCursorPagination
 from utils.permissions import IsOwnerOrAdminOrReadOnly, LeaderOnly
 
-from .models import Meet, MeetApply
+from .models import Meet
 from .serializers import (
     MeetCreateSerializer,
     MeetDetailSerializer,
@@ -28,6 +36,8 @@ from .serializers import (
 
 # /api/meets [GET, POST]
 class MeetListCreateView(generics.ListCreateAPIView):
+    pagination_class = CreatedAtCursorPagination
+
     def get_serializer_class(self):
         if self.request.method == "POST":
             return MeetCreateSerializer
@@ -38,21 +48,6 @@ class MeetListCreateView(generics.ListCreateAPIView):
             return [IsAuthenticated(), LeaderOnly()]
         return [IsAuthenticatedOrReadOnly()]
 
-    def get_all_descendant_area_ids(self, area, visited=None):
-        if visited is None:
-            visited = set()
-
-        if area.id in visited:
-            return []
-
-        visited.add(area.id)
-        result = [area.id]
-
-        for child in area.children.all():
-            result += self.get_all_descendant_area_ids(child, visited)
-
-        return result
-
     @swagger_auto_schema(
         tags=["모임"],
         operation_summary="모임 목록 조회",
@@ -87,16 +82,21 @@ class MeetListCreateView(generics.ListCreateAPIView):
                 type=openapi.TYPE_BOOLEAN,
                 description="모집 상태",
             ),
+            openapi.Parameter(
+                "img",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=["thumb", "small", "large"],
+                description="이미지 크기 (해당 크기 변환본 URL로 반환)",
+            ),
         ],
-        responses={200: MeetListSerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
-        queryset = Meet.objects.select_related("area", "file", "user").order_by(
-            "-created_at"
-        )
+        queryset = Meet.objects.select_related("file", "user").order_by("-created_at")
+        queryset = prefetch_variants(queryset, self.request, "file", "user__file")
         title = self.request.query_params.get("title")
         area_id = self.request.query_params.get("area")
         category = self.request.query_params.get("category")
@@ -107,12 +107,8 @@ class MeetListCreateView(generics.ListCreateAPIView):
             queryset = queryset.filter(title__icontains=title)
 
         if area_id:
-            try:
-                area = Area.objects.prefetch_related("children").get(id=area_id)
-                area_ids = self.get_all_descendant_area_ids(area)
-                queryset = queryset.filter(area_id__in=area_ids)
-            except Area.DoesNotExist:
-                queryset = queryset.none()
+            # 존재하지 않는 지역이면 계층 테이블에 행이 없으므로 빈 결과
+            queryset = queryset.in_area(area_id)
 
         if category:
             queryset = queryset.filter(category_id=category)
@@ -171,7 +167,10 @@ class MeetListCreateView(generics.ListCreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        meet = serializer.save(user=request.user)
+        with transaction.atomic():
+            meet = serializer.save(user=request.user)
+            # 채팅방을 함께 만들고 리더를 멤버로 추가
+            add_chat_members(meet.id, [request.user.id])
         return Response(
             {"message": "모임 생성이 완료 되었습니다", "id": meet.id},
             status=status.HTTP_201_CREATED,
@@ -292,33 +291,26 @@ class MeetApplyView(APIView):
             201: openapi.Response(
                 description="모임 지원 완료",
                 examples={
-                    "application/json": {"detail": "모임 지원이 완료되었습니다."}
+                    "application/json": {
+                        "detail": "모임 지원이 완료되었습니다.",
+                        "current_people": 3,
+                    }
                 },
             ),
             400: openapi.Response(description="지원 실패 (중복 지원 또는 모집 마감)"),
         },
     )
     def post(self, request, meet_id):
-        meet = get_object_or_404(Meet, pk=meet_id)
-
-        if MeetApply.objects.filter(user=request.user, meet=meet).exists():
-            return Response(
-                {"detail": "이미 지원한 모임입니다."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        if meet.status != "모집중":
-            return Response(
-                {"detail": "모집이 종료된 모임입니다."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        MeetApply.objects.create(user=request.user, meet=meet)
-        meet.current_people = F("current_people") + 1
-        meet.save()
-        meet.refresh_from_db()
+        try:
+            current_people = apply_to_meet(request.user, meet_id)
+        except MeetNotFoundError:
+            raise Http404
+        except MeetApplyError as e:
+            return Response({"detail": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+
         return Response(
-            {"detail": "모임 지원이 완료되었습니다."}, status=status.HTTP_201_CREATED
+            {"detail": "모임 지원이 완료되었습니다.", "current_people": current_people},
+            status=status.HTTP_201_CREATED,
         )
 
 
@@ -337,8 +329,8 @@ class MeetLeaderListView(generics.ListAPIView):
 
     def get_queryset(self):
         leader_id = self.kwargs.get("leader_id")
-        queryset = Meet.objects.select_related("area", "file").filter(user_id=leader_id)
-        return queryset
+        queryset = Meet.objects.select_related("file").filter(user_id=leader_id)
+        return prefetch_variants(queryset, self.request, "file")
 
 
 # /api/meets/users [GET]
@@ -358,7 +350,7 @@ class MeetUserListView(generics.ListAPIView):
         user_id = self.request.user.id
         queryset = (
             Meet.objects.filter(applications__user_id=user_id)
-            .select_related("area", "file")
+            .select_related("file")
             .distinct()
         )
-        return queryset
+        return prefetch_variants(queryset, self.request, "file")
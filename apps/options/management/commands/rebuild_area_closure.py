@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.options.models import AreaClosure
+
+
+class Command(BaseCommand):
+    help = "지역 계층(클로저) 테이블을 지역 테이블 기준으로 다시 생성합니다."
+
+    def handle(self, *args, **options):
+        count = AreaClosure.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"지역 계층 {count}건 생성 완료"))
+
+
+# 명령어
+# python3 manage.py rebuild_area_closure
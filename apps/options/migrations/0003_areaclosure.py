@@ -0,0 +1,81 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# 기존 지역 데이터로 계층 테이블 채우기
+def build_area_closure(apps, schema_editor):
+    Area = apps.get_model("options", "Area")
+    AreaClosure = apps.get_model("options", "AreaClosure")
+
+    parents = dict(Area.objects.values_list("id", "parent_id"))
+    rows = []
+    for area_id in parents:
+        node, distance, visited = area_id, 0, set()
+        while node is not None and node not in visited:
+            visited.add(node)
+            rows.append(
+                AreaClosure(ancestor_id=node, descendant_id=area_id, distance=distance)
+            )
+            node = parents.get(node)
+            distance += 1
+    AreaClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("options", "0002_alter_area_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AreaClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "distance",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="조상과의 거리"
+                    ),
+                ),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="options.area",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="options.area",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "지역 계층",
+                "verbose_name_plural": "지역 계층 목록",
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "distance"],
+                        name="options_are_descend_ffe41d_idx",
+                    )
+                ],
+                "unique_together": {("ancestor", "descendant")},
+            },
+        ),
+        migrations.RunPython(build_area_closure, migrations.RunPython.noop),
+    ]
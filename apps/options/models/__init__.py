@@ -1,5 +1,6 @@
 from .age_group import AgeGroup
 from .area import Area
+from .area_closure import AreaClosure
 from .category import Category
 from .digital_level import DigitalLevel
 from .interest import Interest
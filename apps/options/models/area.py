@@ -19,6 +19,12 @@ class Area(models.Model):
 
     @property
     def full_path(self):
+        from apps.options.services.area_tree import get_area_tree
+
+        # 메모리의 지역 트리에 있으면 부모를 따라 올라가는 쿼리 없이 반환
+        if (path := get_area_tree().full_path(self.id)) is not None:
+            return path
+
         names = [self.area_name]
         parent = self.parent
         while parent:
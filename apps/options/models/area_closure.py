@@ -0,0 +1,102 @@
+from django.db import models, transaction
+
+
+class AreaClosureQuerySet(models.QuerySet):
+    def descendant_ids(self, area_id):
+        """area_id 자신과 모든 하위 지역의 id (서브쿼리로 사용)"""
+        return self.filter(ancestor_id=area_id).values("descendant_id")
+
+    def attach(self, area, created=False):
+        """저장된 지역의 조상 연결을 현재 parent 기준으로 맞춤 (하위 지역 포함)"""
+        with transaction.atomic():
+            if created:
+                subtree = {area.id: 0}
+                rows = [AreaClosure(ancestor_id=area.id, descendant_id=area.id)]
+            else:
+                current_parent = (
+                    self.filter(descendant_id=area.id, distance=1)
+                    .values_list("ancestor_id", flat=True)
+                    .first()
+                )
+                has_self = self.filter(ancestor_id=area.id, distance=0).exists()
+                if has_self and current_parent == area.parent_id:
+                    return  # 부모가 바뀌지 않았으면 갱신할 필요 없음
+
+                subtree = dict(
+                    self.filter(ancestor_id=area.id).values_list(
+                        "descendant_id", "distance"
+                    )
+                )
+                rows = []
+                if area.id not in subtree:
+                    subtree[area.id] = 0
+                    rows.append(AreaClosure(ancestor_id=area.id, descendant_id=area.id))
+
+                # 하위 트리가 기존 조상들과 맺고 있던 연결 제거
+                self.filter(descendant_id__in=subtree).exclude(
+                    ancestor_id__in=subtree
+                ).delete()
+
+            if area.parent_id:
+                ancestors = self.filter(descendant_id=area.parent_id).exclude(
+                    ancestor_id__in=subtree  # 자기 하위로 옮기는 순환 방지
+                )
+                rows += [
+                    AreaClosure(
+                        ancestor_id=ancestor_id,
+                        descendant_id=descendant_id,
+                        distance=ancestor_distance + descendant_distance + 1,
+                    )
+                    for ancestor_id, ancestor_distance in ancestors.values_list(
+                        "ancestor_id", "distance"
+                    )
+                    for descendant_id, descendant_distance in subtree.items()
+                ]
+
+            self.bulk_create(rows, batch_size=1000)
+
+    def rebuild(self):
+        """지역 테이블 전체로부터 클로저 테이블을 다시 생성"""
+        from .area import Area
+
+        parents = dict(Area.objects.values_list("id", "parent_id"))
+        rows = []
+        for area_id in parents:
+            node, distance, visited = area_id, 0, set()
+            while node is not None and node not in visited:
+                visited.add(node)
+                rows.append(
+                    AreaClosure(
+                        ancestor_id=node, descendant_id=area_id, distance=distance
+                    )
+                )
+                node = parents.get(node)
+                distance += 1
+
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+# 지역 트리의 조상-자손 관계를 모두 펼쳐 둔 테이블 (자기 자신 포함, distance=0)
+# 하위 지역 조회가 트리 깊이와 상관없이 인덱스 조회 한 번으로 끝남
+class AreaClosure(models.Model):
+    ancestor = models.ForeignKey(
+        "options.Area", on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        "options.Area", on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    distance = models.PositiveSmallIntegerField(default=0, help_text="조상과의 거리")
+
+    objects = AreaClosureQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "지역 계층"
+        verbose_name_plural = "지역 계층 목록"
+        unique_together = ("ancestor", "descendant")
+        indexes = [models.Index(fields=["descendant", "distance"])]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.distance})"
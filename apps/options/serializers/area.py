@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from apps.options.models.area import Area
+from apps.options.services.area_tree import get_area_tree
 
 
 # 깊이 없이 간단한 구조 (depth 기반 필터링용)
@@ -22,7 +23,8 @@ class AreaSerializer(serializers.ModelSerializer):
         current_depth = self.context.get("depth", 1)
         if current_depth > 2:
             return []
-        children = obj.children.all().order_by("id")
+        # Meta.ordering이 id라 prefetch 결과를 그대로 사용
+        children = obj.children.all()
         return AreaSerializer(
             children, many=True, context={"depth": current_depth + 1}
         ).data
@@ -48,3 +50,13 @@ class AreaWithFullPathSerializer(serializers.ModelSerializer):
     class Meta:
         model = Area
         fields = ["id", "area_name", "depth", "parent", "full_path"]
+
+
+# area_id로 메모리의 지역 트리에서 전체 경로를 찾는 필드 (목록 직렬화 시 추가 쿼리 없음)
+class AreaFullPathField(serializers.ReadOnlyField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "area_id")
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return get_area_tree().full_path(value)
@@ -0,0 +1,159 @@
+import time
+from array import array
+from threading import Lock
+
+from django.core.cache import cache
+
+from apps.options.models import Area
+from utils.json_cache import get_or_build_json_blob
+
+AREA_TREE_VERSION_KEY = "options:area_tree:version"
+VERSION_CHECK_INTERVAL = 5  # 초. 다른 워커의 변경을 확인하는 주기
+NESTED_MAX_LEVEL = 2  # 중첩 응답은 시 → 구 → 동 3단계까지
+BLOB_TIMEOUT = 60 * 60 * 24
+
+
+class AreaTree:
+    """
+    지역 테이블 전체를 한 번에 읽어 만든 불변 트리
+    id로 인덱스를 찾은 뒤 배열에서 부모/이름/깊이/전체 경로를 바로 꺼냄 (추가 쿼리 없음)
+    """
+
+    def __init__(self, rows, version=None):
+        rows = sorted(rows)  # (id, area_name, depth, parent_id)
+        self.version = version
+        self._index = {area_id: i for i, (area_id, *_) in enumerate(rows)}
+
+        self.ids = array("q", (row[0] for row in rows))
+        self.names = tuple(row[1] for row in rows)
+        self.labels = tuple(row[2] for row in rows)  # 시, 구, 동
+        self.depth_labels = frozenset(self.labels)
+        self.parents = array(
+            "l", (self._index.get(row[3], -1) for row in rows)
+        )  # 부모 인덱스, 최상위는 -1
+
+        children = [[] for _ in rows]
+        for i, parent in enumerate(self.parents):
+            if parent >= 0:
+                children[parent].append(i)
+        self.children = tuple(tuple(c) for c in children)
+        self.roots = tuple(i for i, parent in enumerate(self.parents) if parent < 0)
+
+        # 최상위부터 내려가며 깊이와 전체 경로를 미리 계산
+        depths = array("b", [0]) * len(rows)
+        paths = [""] * len(rows)
+        stack = [(i, 0, self.names[i]) for i in reversed(self.roots)]
+        while stack:
+            i, depth, path = stack.pop()
+            depths[i], paths[i] = depth, path
+            for child in reversed(self.children[i]):
+                stack.append((child, depth + 1, f"{path} {self.names[child]}"))
+        self.depths = depths
+        self.paths = tuple(paths)
+        self._nested = {}  # 버전마다 한 번만 만드는 중첩 목록
+
+    @classmethod
+    def load(cls, version=None):
+        rows = Area.objects.values_list("id", "area_name", "depth", "parent_id")
+        return cls(rows, version=version)
+
+    def __contains__(self, area_id):
+        return area_id in self._index
+
+    def __len__(self):
+        return len(self.ids)
+
+    def full_path(self, area_id, default=None):
+        i = self._index.get(area_id)
+        return default if i is None else self.paths[i]
+
+    def depth(self, area_id, default=None):
+        i = self._index.get(area_id)
+        return default if i is None else self.depths[i]
+
+    def children_of(self, parent_id):
+        """바로 아래 하위 지역 목록 (AreaSimpleSerializer와 같은 형태)"""
+        i = self._index.get(parent_id)
+        if i is None:
+            return []
+        return [
+            {"id": self.ids[c], "area_name": self.names[c], "depth": self.labels[c]}
+            for c in self.children[i]
+        ]
+
+    def nested(self, depth=None):
+        """최상위 지역부터 children을 중첩한 목록 (AreaSerializer와 같은 형태)"""
+        if depth not in self._nested:
+            self._nested[depth] = [
+                self._nested_node(i, 0)
+                for i in self.roots
+                if depth is None or self.labels[i] == depth
+            ]
+        return self._nested[depth]
+
+    def _nested_node(self, i, level):
+        return {
+            "id": self.ids[i],
+            "area_name": self.names[i],
+            "depth": self.labels[i],
+            "children": (
+                [self._nested_node(c, level + 1) for c in self.children[i]]
+                if level < NESTED_MAX_LEVEL
+                else []
+            ),
+        }
+
+    def blob(self, variant, build):
+        """이 버전의 응답 JSON을 한 번만 인코딩해서 캐시에 저장 (ETag/Last-Modified 포함)"""
+        return get_or_build_json_blob(
+            f"options:area_tree:{self.version}:{variant}",
+            build,
+            last_modified=self.version // 10**9 if self.version else None,
+            timeout=BLOB_TIMEOUT,
+        )
+
+    def ancestor_ids(self, area_id):
+        """최상위부터 부모까지의 id 목록 (자기 자신 제외)"""
+        i = self._index.get(area_id)
+        result = []
+        if i is None:
+            return result
+        parent = self.parents[i]
+        while parent >= 0:
+            result.append(self.ids[parent])
+            parent = self.parents[parent]
+        result.reverse()
+        return result
+
+
+_tree = None
+_checked_at = 0.0
+_lock = Lock()
+
+
+def get_area_tree():
+    """프로세스당 한 번 로드한 지역 트리를 반환 (버전 키가 바뀌면 다시 로드)"""
+    global _tree, _checked_at
+
+    tree = _tree
+    now = time.monotonic()
+    if tree is not None and now - _checked_at < VERSION_CHECK_INTERVAL:
+        return tree
+
+    cache.add(AREA_TREE_VERSION_KEY, time.time_ns(), None)
+    version = cache.get(AREA_TREE_VERSION_KEY)
+
+    with _lock:
+        if _tree is None or _tree.version != version:
+            _tree = AreaTree.load(version=version)
+        _checked_at = now
+        return _tree
+
+
+def invalidate_area_tree():
+    """지역이 바뀌었음을 모든 워커에 알림 (현재 프로세스는 즉시 다시 로드)"""
+    global _tree
+
+    cache.set(AREA_TREE_VERSION_KEY, time.time_ns(), None)
+    with _lock:
+        _tree = None
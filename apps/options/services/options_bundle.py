@@ -0,0 +1,84 @@
+import time
+
+from django.core.cache import cache
+
+from apps.options.models import AgeGroup, Category, DigitalLevel, Interest
+from apps.options.serializers.age_group import AgeGroupSerializer
+from apps.options.serializers.category import CategorySerializer
+from apps.options.serializers.digital_level import DigitalLevelSerializer
+from apps.options.serializers.interest import InterestSerializer
+from apps.options.services.area_tree import AreaTree
+from utils.json_cache import JSONBlob, encode_json_blob
+
+OPTIONS_GENERATION_KEY = "options:generation"
+OPTIONS_CACHE_TIMEOUT = 60 * 60 * 24  # 번들/버전 캐시 유지 시간 (초)
+
+
+def _bundle_key(version):
+    return f"options:bundle:{version}"
+
+
+def _version_key(generation):
+    return f"options:version:{generation}"
+
+
+def _get_generation():
+    """
+    옵션이 바뀔 때마다 올라가는 세대 번호
+    키가 없으면(첫 실행, 캐시 축출) 현재 시각으로 시작해 이전 세대와 겹치지 않게 함
+    """
+    cache.add(OPTIONS_GENERATION_KEY, time.time_ns(), None)
+    generation = cache.get(OPTIONS_GENERATION_KEY)
+    return time.time_ns() if generation is None else generation
+
+
+def build_options_bundle():
+    """옵션 테이블 5개를 읽어 전체 옵션 응답 데이터를 만듦"""
+    return {
+        "categories": CategorySerializer(Category.objects.all(), many=True).data,
+        # 다른 워커의 트리 갱신 주기를 기다리지 않도록 번들은 항상 DB에서 새로 읽음
+        "areas": AreaTree.load().nested(),
+        "interests": InterestSerializer(Interest.objects.all(), many=True).data,
+        "digital_levels": DigitalLevelSerializer(
+            DigitalLevel.objects.all(), many=True
+        ).data,
+        "age_groups": AgeGroupSerializer(AgeGroup.objects.all(), many=True).data,
+    }
+
+
+def get_options_bundle():
+    """
+    인코딩된 옵션 번들과 버전(내용 해시)을 모든 워커가 공유하는 캐시에서 가져옴
+    버전은 읽기 시작한 세대 번호 아래에만 저장하므로, 다시 만드는 도중 옵션이 바뀌면
+    (세대가 올라가면) 오래된 내용으로 만든 버전은 아무도 읽지 않고 만료됨
+    """
+    generation = _get_generation()
+    version = cache.get(_version_key(generation))
+    if version is not None and (cached := cache.get(_bundle_key(version))):
+        return JSONBlob(*cached)
+
+    blob = encode_json_blob(build_options_bundle())
+    version = options_version_of(blob)
+    cache.set(_bundle_key(version), tuple(blob), OPTIONS_CACHE_TIMEOUT)
+    cache.set(_version_key(generation), version, OPTIONS_CACHE_TIMEOUT)
+    return blob
+
+
+def get_options_version():
+    """현재 옵션 버전 (캐시에 있으면 DB 조회 없음)"""
+    version = cache.get(_version_key(_get_generation()))
+    if version is None:
+        version = options_version_of(get_options_bundle())
+    return version
+
+
+def options_version_of(blob):
+    return blob.etag.strip('"')
+
+
+def invalidate_options_bundle():
+    """옵션이 바뀌었음을 모든 워커에 알림 (세대를 올려 다음 요청에서 다시 만들어 해시 계산)"""
+    try:
+        cache.incr(OPTIONS_GENERATION_KEY)
+    except ValueError:
+        cache.add(OPTIONS_GENERATION_KEY, time.time_ns(), None)
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.options.models import (
+    AgeGroup,
+    Area,
+    AreaClosure,
+    Category,
+    DigitalLevel,
+    Interest,
+)
+from apps.options.services.area_tree import invalidate_area_tree
+from apps.options.services.options_bundle import invalidate_options_bundle
+
+
+# 지역이 추가/수정되면 계층 테이블 갱신 (loaddata로 픽스처를 넣을 때도 호출됨)
+# 삭제는 AreaClosure의 CASCADE로 함께 정리됨
+@receiver(post_save, sender=Area)
+def sync_area_closure(sender, instance, created, **kwargs):
+    AreaClosure.objects.attach(instance, created=created)
+
+
+# 지역이 바뀌면 메모리에 올려둔 지역 트리 버전 갱신
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+def refresh_area_tree(sender, instance, **kwargs):
+    invalidate_area_tree()
+    # 커밋 전에 다른 워커가 이전 데이터로 새 버전의 트리를 만들었을 수 있어 커밋 후 한 번 더
+    transaction.on_commit(invalidate_area_tree)
+
+
+# 옵션 테이블이 바뀌면 공유 캐시의 옵션 번들 버전 삭제
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+@receiver(post_save, sender=DigitalLevel)
+@receiver(post_delete, sender=DigitalLevel)
+@receiver(post_save, sender=AgeGroup)
+@receiver(post_delete, sender=AgeGroup)
+def refresh_options_bundle(sender, instance, **kwargs):
+    invalidate_options_bundle()
+    # 커밋 전에 다른 요청이 이전 데이터로 번들을 다시 만들었을 수 있어 커밋 후 한 번 더
+    transaction.on_commit(invalidate_options_bundle)
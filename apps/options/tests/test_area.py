@@ -1,8 +1,15 @@
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from apps.options.models.area import Area
+from apps.options.models.area_closure import AreaClosure
+from apps.options.services.area_tree import (
+    AREA_TREE_VERSION_KEY,
+    AreaTree,
+    get_area_tree,
+)
 
 
 @pytest.mark.django_db
@@ -19,14 +26,122 @@ def test_area_list_by_depth():
     # depth=시 요청
     response = client.get(reverse("option-areas"), {"depth": "시"})
     assert response.status_code == 200
-    assert response.data[0]["area_name"] == "서울"
+    assert response.json()[0]["area_name"] == "서울"
 
     # parent_id=서울.id 요청 → 강남구
     response = client.get(reverse("option-areas"), {"parent_id": seoul.id})
     assert response.status_code == 200
-    assert response.data[0]["area_name"] == "강남구"
+    assert response.json()[0]["area_name"] == "강남구"
 
     # parent_id=강남구.id 요청 → 역삼동
     response = client.get(reverse("option-areas"), {"parent_id": gangnam.id})
     assert response.status_code == 200
-    assert response.data[0]["area_name"] == "역삼동"
+    assert response.json()[0]["area_name"] == "역삼동"
+
+    # 트리에 없는 값은 캐시 키로 쓰지 않음
+    response = client.get(reverse("option-areas"), {"depth": "없는값"})
+    assert response.status_code == 400
+    response = client.get(reverse("option-areas"), {"parent_id": "abc"})
+    assert response.status_code == 400
+    response = client.get(reverse("option-areas"), {"parent_id": 10**9})
+    assert response.status_code == 200 and response.json() == []
+    assert set(get_area_tree()._nested) == {"시"}
+
+
+@pytest.mark.django_db
+def test_area_closure_follows_tree_changes():
+    seoul = Area.objects.create(area_name="서울", depth="시")
+    gangnam = Area.objects.create(area_name="강남구", depth="구", parent=seoul)
+    yeoksam = Area.objects.create(area_name="역삼동", depth="동", parent=gangnam)
+
+    def descendants(area):
+        return set(
+            AreaClosure.objects.descendant_ids(area.id).values_list(
+                "descendant_id", flat=True
+            )
+        )
+
+    assert descendants(seoul) == {seoul.id, gangnam.id, yeoksam.id}
+    assert descendants(gangnam) == {gangnam.id, yeoksam.id}
+
+    # 구를 다른 시로 옮기면 하위 동까지 함께 이동
+    busan = Area.objects.create(area_name="부산", depth="시")
+    gangnam.parent = busan
+    gangnam.save()
+
+    assert descendants(seoul) == {seoul.id}
+    assert descendants(busan) == {busan.id, gangnam.id, yeoksam.id}
+    assert AreaClosure.objects.get(ancestor=busan, descendant=yeoksam).distance == 2
+
+    # 전체 재생성 결과도 같아야 함
+    before = set(AreaClosure.objects.values_list("ancestor", "descendant", "distance"))
+    AreaClosure.objects.rebuild()
+    after = set(AreaClosure.objects.values_list("ancestor", "descendant", "distance"))
+    assert before == after
+
+
+@pytest.mark.django_db
+def test_area_tree_full_path_without_queries(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    seoul = Area.objects.create(area_name="서울", depth="시")
+    gangnam = Area.objects.create(area_name="강남구", depth="구", parent=seoul)
+    yeoksam = Area.objects.create(area_name="역삼동", depth="동", parent=gangnam)
+
+    tree = get_area_tree()
+    with django_assert_num_queries(0):
+        assert get_area_tree() is tree
+        assert tree.full_path(yeoksam.id) == "서울 강남구 역삼동"
+        assert tree.ancestor_ids(yeoksam.id) == [seoul.id, gangnam.id]
+        assert tree.depth(yeoksam.id) == 2
+        assert yeoksam.full_path == "서울 강남구 역삼동"
+
+    # 지역이 바뀌면 버전이 갱신되어 다시 로드됨
+    gangnam.area_name = "서초구"
+    gangnam.save()
+    assert get_area_tree().full_path(yeoksam.id) == "서울 서초구 역삼동"
+
+    # 커밋 전에 만들어진 트리는 커밋 후 버전이 한 번 더 바뀌어 버려짐
+    with django_capture_on_commit_callbacks(execute=True):
+        gangnam.area_name = "송파구"
+        gangnam.save()
+        before_commit = cache.get(AREA_TREE_VERSION_KEY)
+    assert cache.get(AREA_TREE_VERSION_KEY) != before_commit
+    assert get_area_tree().full_path(yeoksam.id) == "서울 송파구 역삼동"
+
+
+@pytest.mark.django_db
+def test_area_list_not_modified(django_assert_num_queries, monkeypatch):
+    seoul = Area.objects.create(area_name="서울", depth="시")
+    gangnam = Area.objects.create(area_name="강남구", depth="구", parent=seoul)
+    Area.objects.create(area_name="역삼동", depth="동", parent=gangnam)
+
+    client = APIClient()
+    response = client.get(reverse("option-areas"))
+    assert response.status_code == 200
+    assert response["ETag"]
+    children = response.json()[0]["children"]
+    assert children[0]["children"][0]["area_name"] == "역삼동"
+
+    # 같은 버전이면 트리를 다시 만들거나 인코딩하지 않고 304
+    with django_assert_num_queries(0):
+        response = client.get(
+            reverse("option-areas"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+    assert response.status_code == 304
+
+    # 캐시에 있으면 ETag가 달라도 응답 데이터를 다시 만들지 않음
+    def fail(*args, **kwargs):
+        raise AssertionError("캐시 적중인데 트리를 다시 순회함")
+
+    monkeypatch.setattr(AreaTree, "nested", fail)
+    response = client.get(reverse("option-areas"))
+    assert response.status_code == 200 and response["ETag"]
+    monkeypatch.undo()
+
+    # 지역이 바뀌면 ETag도 바뀜
+    etag = response["ETag"]
+    Area.objects.create(area_name="부산", depth="시")
+    response = client.get(reverse("option-areas"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
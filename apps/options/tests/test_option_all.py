@@ -0,0 +1,64 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.options.models.area import Area
+from apps.options.models.category import Category
+
+
+@pytest.mark.django_db
+def test_option_all_versioned_bundle(django_assert_num_queries):
+    Category.objects.create(category_name="정보")
+    seoul = Area.objects.create(area_name="서울", depth="시")
+    Area.objects.create(area_name="강남구", depth="구", parent=seoul)
+
+    client = APIClient()
+    response = client.get(reverse("option-all"))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["categories"][0]["category_name"] == "정보"
+    assert data["areas"][0]["children"][0]["area_name"] == "강남구"
+
+    version = client.get(reverse("option-version")).json()["version"]
+    assert response["ETag"] == f'"{version}"'
+    assert response["Cache-Control"] == "no-cache"
+
+    # 버전이 같으면 DB 조회 없이 304, ?v=가 맞으면 영구 캐시 허용
+    with django_assert_num_queries(0):
+        response = client.get(
+            reverse("option-all"), {"v": version}, HTTP_IF_NONE_MATCH=f'"{version}"'
+        )
+    assert response.status_code == 304
+    assert "immutable" in response["Cache-Control"]
+
+    # 옵션이 바뀌면 버전도 바뀜
+    Category.objects.create(category_name="소통")
+    new_version = client.get(reverse("option-version")).json()["version"]
+    assert new_version != version
+    response = client.get(reverse("option-all"), HTTP_IF_NONE_MATCH=f'"{version}"')
+    assert response.status_code == 200
+    assert len(response.json()["categories"]) == 2
+
+
+@pytest.mark.django_db
+def test_option_bundle_rebuild_racing_with_change(monkeypatch):
+    from apps.options.services import options_bundle
+
+    Category.objects.create(category_name="정보")
+    build = options_bundle.build_options_bundle
+
+    def racing_build():
+        # 다시 만드는 도중 다른 요청의 변경이 커밋되어 세대가 올라간 상황
+        data = build()
+        Category.objects.create(category_name="소통")
+        options_bundle.invalidate_options_bundle()
+        return data
+
+    monkeypatch.setattr(options_bundle, "build_options_bundle", racing_build)
+    stale = options_bundle.options_version_of(options_bundle.get_options_bundle())
+    monkeypatch.setattr(options_bundle, "build_options_bundle", build)
+
+    # 오래된 내용으로 만든 버전이 새 세대의 버전으로 남지 않음
+    assert options_bundle.get_options_version() != stale
+    response = APIClient().get(reverse("option-all"))
+    assert len(response.json()["categories"]) == 2
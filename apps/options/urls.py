@@ -5,10 +5,11 @@ from apps.options.views.area import AreaListView
 from apps.options.views.category import CategoryListView
 from apps.options.views.digital_level import DigitalLevelListView
 from apps.options.views.interest import InterestListView
-from apps.options.views.option_all import OptionAllView
+from apps.options.views.option_all import OptionAllView, OptionVersionView
 
 urlpatterns = [
     path("options", OptionAllView.as_view(), name="option-all"),
+    path("options/version", OptionVersionView.as_view(), name="option-version"),
     path("options/areas", AreaListView.as_view(), name="option-areas"),
     path("options/interests", InterestListView.as_view(), name="option-interests"),
     path("options/age-groups", AgeGroupListView.as_view(), name="option-age-groups"),
@@ -1,15 +1,14 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.options.models.area import Area
-from apps.options.serializers.area import AreaSerializer, AreaSimpleSerializer
+from apps.options.serializers.area import AreaSimpleSerializer
+from apps.options.services.area_tree import get_area_tree
+from utils.json_cache import json_blob_response
 
 
-@method_decorator(cache_page(60 * 60 * 24, key_prefix="area_list"), name="dispatch")
 class AreaListView(APIView):
 
     @swagger_auto_schema(
@@ -35,21 +34,34 @@ class AreaListView(APIView):
     def get(self, request):
         depth = request.query_params.get("depth")
         parent_id = request.query_params.get("parent_id")
+        tree = get_area_tree()  # 지역 테이블 전체를 한 번의 SELECT로 읽어 둔 트리
 
-        queryset = (
-            Area.objects.all().select_related("parent").prefetch_related("children")
-        )
-
+        # 요청 값이 그대로 메모/캐시 키가 되므로 트리에 있는 값만 허용
         if parent_id:
-            queryset = queryset.filter(parent_id=parent_id).order_by("id")
-            serializer = AreaSimpleSerializer(queryset, many=True)
+            try:
+                parent_id = int(parent_id)
+            except ValueError:
+                return Response(
+                    {"detail": "parent_id는 정수여야 합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if parent_id not in tree:
+                return Response([])
+            variant, build = f"parent:{parent_id}", lambda: tree.children_of(parent_id)
 
         elif depth:
-            queryset = queryset.filter(depth=depth, parent=None).order_by("id")
-            serializer = AreaSerializer(queryset, many=True, context={"depth": 1})
+            if depth not in tree.depth_labels:
+                labels = ", ".join(sorted(tree.depth_labels))
+                return Response(
+                    {"detail": f"depth는 {labels} 중 하나여야 합니다."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            variant, build = f"depth:{depth}", lambda: tree.nested(depth)
 
         else:
-            queryset = queryset.filter(parent=None).order_by("id")
-            serializer = AreaSerializer(queryset, many=True, context={"depth": 1})
+            variant, build = "all", tree.nested
 
-        return Response(serializer.data)
+        # 트리 버전별로 한 번만 인코딩한 바이트를 재사용, ETag가 같으면 304
+        # 응답 데이터는 캐시에 없을 때만 만듦 (캐시 적중 시 트리 순회/직렬화 없음)
+        blob = tree.blob(variant, build)
+        return json_blob_response(request, blob)
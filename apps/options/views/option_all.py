@@ -1,19 +1,20 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.options.models import AgeGroup, Area, Category, DigitalLevel, Interest
-from apps.options.serializers.age_group import AgeGroupSerializer
-from apps.options.serializers.area import AreaSerializer
-from apps.options.serializers.category import CategorySerializer
-from apps.options.serializers.digital_level import DigitalLevelSerializer
-from apps.options.serializers.interest import InterestSerializer
+from apps.options.services.options_bundle import (
+    get_options_bundle,
+    get_options_version,
+    options_version_of,
+)
+from utils.json_cache import json_blob_response
+
+# ?v=가 현재 버전과 같으면 내용이 바뀔 일이 없으므로 클라이언트가 계속 캐시해도 됨
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
 
 
-@method_decorator(cache_page(60 * 60 * 24, key_prefix="option_all"), name="dispatch")
 class OptionAllView(APIView):
     @swagger_auto_schema(
         operation_summary="전체 옵션 목록 조회",
@@ -79,23 +80,47 @@ class OptionAllView(APIView):
                 ),
             )
         },
+        manual_parameters=[
+            openapi.Parameter(
+                "v",
+                openapi.IN_QUERY,
+                description="옵션 버전 (/api/options/version 결과). 현재 버전과 같으면 영구 캐시 가능",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        tags=["옵션 API"],
+    )
+    def get(self, request):
+        blob = get_options_bundle()
+        version = options_version_of(blob)
+        if request.query_params.get("v") == version:
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+
+        # 공유 캐시에 인코딩된 바이트를 그대로 응답, If-None-Match가 같으면 304
+        return json_blob_response(
+            request, blob, headers={"Cache-Control": cache_control}
+        )
+
+
+class OptionVersionView(APIView):
+    @swagger_auto_schema(
+        operation_summary="옵션 버전 조회",
+        operation_description="전체 옵션 데이터의 내용 해시를 반환합니다. 값이 바뀌었을 때만 /api/options?v=버전 으로 다시 받으면 됩니다.",
+        responses={
+            200: openapi.Response(
+                description="현재 옵션 버전",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={"version": openapi.Schema(type=openapi.TYPE_STRING)},
+                ),
+            )
+        },
         tags=["옵션 API"],
     )
     def get(self, request):
         return Response(
-            {
-                "categories": CategorySerializer(
-                    Category.objects.all(), many=True
-                ).data,
-                "areas": AreaSerializer(
-                    Area.objects.filter(parent=None), many=True
-                ).data,
-                "interests": InterestSerializer(Interest.objects.all(), many=True).data,
-                "digital_levels": DigitalLevelSerializer(
-                    DigitalLevel.objects.all(), many=True
-                ).data,
-                "age_groups": AgeGroupSerializer(
-                    AgeGroup.objects.all(), many=True
-                ).data,
-            }
+            {"version": get_options_version()},
+            headers={"Cache-Control": REVALIDATE_CACHE_CONTROL},
         )
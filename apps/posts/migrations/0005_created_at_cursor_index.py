@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("options", "0003_areaclosure"),
+        ("posts", "0004_alter_postimage_file_alter_post_file_delete_file"),
+        ("upload", "0007_alter_file_file_alter_file_thumbnail"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="posts_post_created_a7e5d4_idx"
+            ),
+        ),
+    ]
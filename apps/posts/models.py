@@ -21,6 +21,9 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["-created_at", "-id"])]  # 커서 페이지네이션
+
     def __str__(self):
         return self.title
 
@@ -4,6 +4,7 @@ from apps.options.models.area import Area
 from apps.options.models.category import Category
 from apps.options.models.interest import Interest
 from apps.upload.models import File
+from apps.upload.serializers import ImageHintMixin
 
 from .models import Comment, Like, Post, PostImage
 
@@ -34,7 +35,7 @@ class InterestNameSerializer(serializers.ModelSerializer):
 
 
 # 2. 파일 상세용 Serializer (필요한 필드만 포함, 썸네일은 url로 반환)
-class PostFileSerializer(serializers.ModelSerializer):
+class PostFileSerializer(ImageHintMixin, serializers.ModelSerializer):
     file = serializers.FileField()
     thumbnail = serializers.ImageField()
     user_id = serializers.PrimaryKeyRelatedField(source="user", read_only=True)
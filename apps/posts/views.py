@@ -4,7 +4,8 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from utils.pagination import CustomPageNumberPagination
+from apps.upload.serializers import prefetch_variants
+from utils.pagination import CreatedAtCursorPagination, CustomPageNumberPagination
 
 from .models import Comment, Like, Post
 from .serializers import CommentSerializer, PostSerializer
@@ -16,7 +17,10 @@ class PostListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [filters.SearchFilter]
     search_fields = ["title", "content"]
-    pagination_class = CustomPageNumberPagination
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        return prefetch_variants(super().get_queryset(), self.request, "file")
 
     @swagger_auto_schema(tags=["게시글"])
     def get(self, request, *args, **kwargs):
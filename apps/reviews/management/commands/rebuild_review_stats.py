@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.models import rebuild_review_stats
+
+
+class Command(BaseCommand):
+    help = "리뷰 테이블 기준으로 모임의 평점 합계/리뷰 수를 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        count = rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS(f"모임 {count}건 리뷰 집계 갱신 완료"))
+
+
+# 명령어
+# python3 manage.py rebuild_review_stats
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:39
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_meet_review_stats(apps, schema_editor):
+    Meet = apps.get_model("meet", "Meet")
+    Review = apps.get_model("reviews", "Review")
+
+    reviews = Review.objects.filter(meet_id=OuterRef("pk")).order_by().values("meet_id")
+    Meet.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meet", "0008_meet_review_stats"),
+        ("reviews", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_meet_review_stats, migrations.RunPython.noop),
+    ]
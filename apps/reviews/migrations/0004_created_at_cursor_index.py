@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meet", "0009_created_at_cursor_index"),
+        ("reviews", "0003_backfill_meet_review_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["meet", "-created_at", "-id"],
+                name="reviews_rev_meet_id_1d63f1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="reviews_rev_user_id_2035ea_idx",
+            ),
+        ),
+    ]
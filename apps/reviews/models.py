@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 
 from apps.meet.models import Meet
 
@@ -26,7 +28,56 @@ class Review(models.Model):
             models.Index(fields=["user", "meet"]),
             models.Index(fields=["-created_at"]),
             models.Index(fields=["-rating"]),
+            # 커서 페이지네이션 (모임별/내 리뷰 목록)
+            models.Index(fields=["meet", "-created_at", "-id"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
         ]
 
     def __str__(self):
         return f"{self.user} - {self.meet} ({self.rating}점)"
+
+    def save(self, *args, **kwargs):
+        # 리뷰 저장과 모임의 평점 집계 갱신을 한 트랜잭션으로 처리
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    Review.objects.filter(pk=self.pk)
+                    .values_list("meet_id", "rating")
+                    .first()
+                )
+            super().save(*args, **kwargs)
+
+            if previous is None:
+                apply_review_stats(self.meet_id, self.rating, 1)
+            elif previous[0] == self.meet_id:
+                if previous[1] != self.rating:
+                    apply_review_stats(self.meet_id, self.rating - previous[1], 0)
+            else:
+                apply_review_stats(previous[0], -previous[1], -1)
+                apply_review_stats(self.meet_id, self.rating, 1)
+
+
+def apply_review_stats(meet_id, rating_delta, count_delta):
+    """모임의 평점 합계/리뷰 수를 DB에서 바로 더함 (동시에 작성돼도 값이 유실되지 않음)"""
+    Meet.all_objects.filter(pk=meet_id).update(
+        rating_sum=F("rating_sum") + rating_delta,
+        review_count=F("review_count") + count_delta,
+    )
+
+
+def rebuild_review_stats():
+    """리뷰 테이블 기준으로 모든 모임의 평점 합계/리뷰 수를 다시 계산 (UPDATE 한 번)"""
+    reviews = Review.objects.filter(meet_id=OuterRef("pk")).order_by().values("meet_id")
+    return Meet.all_objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum("rating")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("id")).values("total")),
+            0,
+            output_field=IntegerField(),
+        ),
+    )
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.reviews.models import Review, apply_review_stats
+
+
+# 리뷰가 삭제되면 모임의 평점 집계에서 제외 (유저 탈퇴 등 CASCADE 삭제 포함, 삭제와 같은 트랜잭션)
+@receiver(post_delete, sender=Review)
+def remove_review_stats(sender, instance, **kwargs):
+    apply_review_stats(instance.meet_id, -instance.rating, -1)
@@ -1,6 +1,6 @@
 from datetime import timedelta
 
-from django.db.models import Avg, Count
+from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_yasg import openapi
@@ -10,7 +10,7 @@ from rest_framework.exceptions import MethodNotAllowed, ValidationError
 from rest_framework.response import Response
 
 from apps.meet.models import Meet, MeetApply
-from utils.pagination import CustomPageNumberPagination
+from utils.pagination import CreatedAtCursorPagination
 from utils.permissions import LeaderOnly
 
 from .models import Review
@@ -18,7 +18,7 @@ from .permissions import IsOwnerOrAdminOrReadOnlyWithin7Days
 from .serializers import ReviewCreateSerializer, ReviewDisplaySerializer
 
 
-class ReviewPagination(CustomPageNumberPagination):
+class ReviewPagination(CreatedAtCursorPagination):
     page_size = 6
 
 
@@ -52,15 +52,13 @@ class ReviewSummaryView(generics.GenericAPIView):
             .select_related("user")
             .order_by("-rating", "-created_at")[:4]
         )
-        summary = Review.objects.filter(meet=meet).aggregate(
-            avg=Avg("rating"), count=Count("id")
-        )
 
         serializer = self.get_serializer(top_reviews, many=True)
         return Response(
             {
-                "average_rating": round(summary["avg"] or 0, 2),
-                "review_count": summary["count"],
+                # 모임에 저장된 집계값 사용 (리뷰 작성/수정/삭제 시 갱신됨)
+                "average_rating": round(meet.rating_avg, 2),
+                "review_count": meet.review_count,
                 "top_reviews": serializer.data,
             }
         )
@@ -218,7 +216,6 @@ class MyReviewListView(generics.ListAPIView):
     @swagger_auto_schema(
         operation_summary="내가 작성한 리뷰 목록 조회",
         tags=["리뷰 API"],
-        responses={200: ReviewDisplaySerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -240,7 +237,6 @@ class LeaderReviewListView(generics.ListAPIView):
     @swagger_auto_schema(
         operation_summary="내가 리더인 모임에 달린 리뷰 목록 조회",
         tags=["리뷰 API"],
-        responses={200: ReviewDisplaySerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from PIL import Image as PilImage
+
+THUMBNAIL_SIZE = (500, 500)
+SPOOL_MAX_SIZE = 1024 * 1024  # 이보다 큰 인코딩 결과는 메모리 대신 임시 파일에 씀
+COPY_CHUNK_SIZE = 64 * 1024
+# 백그라운드 변환용 임시 파일 이름 앞부분 (프로세스가 죽어 남은 파일을 찾아 지울 때 사용)
+TEMP_FILE_PREFIX = "onda-image-"
+
+
+def spooled_file():
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+
+def decode_image(source, size=None):
+    """
+    이미지를 한 번만 디코딩해서 RGB로 반환
+    목표 크기가 원본보다 훨씬 작으면 JPEG은 draft()로 축소된 크기로 디코딩하고,
+    나머지는 reduce()로 먼저 정수배 축소한 뒤 리샘플링 (thumbnail의 reducing_gap)
+    """
+    image = PilImage.open(source)
+    if size:
+        image.draft("RGB", (size, size))
+        # 원본이 RGBA(투명 포함)나 P(팔레트 기반)이면 WebP 저장 시 오류 발생 가능성 있음
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((size, size), reducing_gap=2.0)
+        return image
+    return image.convert("RGB")
+
+
+@dataclass
+class Rendition:
+    """크기별 변환본 하나 (out은 인코딩된 파일 객체, 프로세스 풀에서는 파일 경로)"""
+
+    name: str
+    format: str
+    max_size: int
+    out: object = None
+    width: int = 0
+    height: int = 0
+
+
+def downscale(image, sizes):
+    """
+    큰 크기부터 차례로 직전 결과를 다시 줄여 (크기, 이미지)를 반환
+    원본은 한 번만 디코딩하고, 작은 크기일수록 더 작은 이미지에서 리샘플링
+    """
+    current = image
+    for size in sorted(set(sizes), reverse=True):
+        if max(current.size) > size:
+            current = current.copy()
+            current.thumbnail((size, size), reducing_gap=2.0)
+        yield size, current
+
+
+def transcode_image_to(
+    source,
+    image_out,
+    thumb_out,
+    format="WEBP",
+    quality=85,
+    size=None,
+    variants=(),
+    variant_formats=None,
+    variant_out=spooled_file,
+):
+    """
+    이미지 파일 객체를 읽어 변환 이미지와 썸네일을 각각 image_out, thumb_out에 바로 인코딩
+    variants((이름, 최대 크기), ...)가 있으면 variant_formats 형식마다 같은 디코딩 결과에서
+    variant_out()에 인코딩해서 Rendition 목록으로 반환, 중간 bytes 복사본을 만들지 않음
+    """
+    variants = list(variants)
+    decode_size = size and max([size, *(max_size for _, max_size in variants)])
+    image = decode_image(source, decode_size)
+
+    # 크기 -> [(출력 파일, 형식, Rendition)]
+    targets = {}
+    targets.setdefault(size or max(image.size), []).append((image_out, format, None))
+    # 썸네일 고정 사이즈 (변환 이미지보다 크면 변환 이미지 그대로)
+    targets.setdefault(THUMBNAIL_SIZE[0], []).append((thumb_out, format, None))
+    renditions = []
+    for name, max_size in variants:
+        for variant_format in variant_formats or [format]:
+            rendition = Rendition(name, variant_format.upper(), max_size, variant_out())
+            targets.setdefault(max_size, []).append(
+                (rendition.out, rendition.format, rendition)
+            )
+            renditions.append(rendition)
+
+    for max_size, resized in downscale(image, targets):
+        for out, out_format, rendition in targets[max_size]:
+            resized.save(out, format=out_format.upper(), quality=quality)
+            out.seek(0)
+            if rendition:
+                rendition.width, rendition.height = resized.size
+    return renditions
+
+
+def _named_temp_file(suffix=""):
+    return tempfile.NamedTemporaryFile(
+        prefix=TEMP_FILE_PREFIX, suffix=suffix, delete=False
+    )
+
+
+def transcode_image_file(
+    source_path, format="WEBP", quality=85, size=None, variants=(), variant_formats=None
+):
+    """
+    디스크의 이미지 파일을 변환해서 (변환 이미지 경로, 썸네일 경로, Rendition 목록) 반환
+    Django에 의존하지 않아 다른 프로세스(ProcessPoolExecutor)에서도 실행 가능하고,
+    프로세스 사이에는 이미지 데이터 대신 파일 경로만 주고받음
+    """
+    suffix = f".{format.lower()}"
+    outputs = []
+
+    def variant_out():
+        outputs.append(_named_temp_file())
+        return outputs[-1]
+
+    with (
+        open(source_path, "rb") as source,
+        _named_temp_file(suffix) as image_out,
+        _named_temp_file(suffix) as thumb_out,
+    ):
+        outputs += [image_out, thumb_out]
+        try:
+            renditions = transcode_image_to(
+                source,
+                image_out,
+                thumb_out,
+                format,
+                quality,
+                size,
+                variants,
+                variant_formats,
+                variant_out,
+            )
+        except Exception:
+            for out in outputs:
+                out.close()
+                os.unlink(out.name)
+            raise
+        finally:
+            for out in outputs[2:]:
+                out.close()
+
+    for rendition in renditions:
+        rendition.out = rendition.out.name
+    return image_out.name, thumb_out.name, renditions
+
+
+def sha256_of(source):
+    """파일 객체를 청크 단위로 읽어 SHA-256 (읽은 뒤 처음 위치로 되돌림)"""
+    digest = hashlib.sha256()
+    source.seek(0)
+    while chunk := source.read(COPY_CHUNK_SIZE):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def copy_to_temp_file(source):
+    """
+    업로드 파일을 청크 단위로 임시 파일에 복사하면서 SHA-256을 함께 계산
+    (임시 파일 경로, SHA-256) 반환, 임시 파일은 호출한 쪽에서 삭제
+    """
+    digest = hashlib.sha256()
+    source.seek(0)
+    with _named_temp_file() as temp:
+        while chunk := source.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            temp.write(chunk)
+    return temp.name, digest.hexdigest()
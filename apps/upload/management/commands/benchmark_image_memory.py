@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from PIL import Image as PilImage
+
+from apps.upload.images import THUMBNAIL_SIZE
+
+
+def _reset_peak_rss():
+    """최대 RSS 기록 초기화 (Linux만 가능, 안 되면 False)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _legacy_pipeline(source, storage, size):
+    """변경 전 File.prepare와 같은 방식 (전체 디코딩 후 BytesIO → bytes → ContentFile)"""
+    from django.core.files.base import ContentFile
+
+    image = PilImage.open(source).convert("RGB")
+    if size:
+        image.thumbnail((size, size))
+    temp_image = BytesIO()
+    image.save(temp_image, format="WEBP", quality=85)
+    temp_image.seek(0)
+    storage.save("legacy.webp", ContentFile(temp_image.read()))
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail(THUMBNAIL_SIZE)
+    temp_thumb = BytesIO()
+    thumbnail.save(temp_thumb, format="WEBP", quality=85)
+    temp_thumb.seek(0)
+    storage.save("legacy_thumb.webp", ContentFile(temp_thumb.read()))
+
+
+def _streaming_pipeline(source, storage, size):
+    """현재 File.prepare 방식 (한 번 디코딩, 인코딩 결과를 임시 파일에 바로 쓰고 업로드)"""
+    from django.core.files.base import File as DjangoFile
+
+    from apps.upload.images import spooled_file, transcode_image_to
+
+    with spooled_file() as image, spooled_file() as thumbnail:
+        transcode_image_to(source, image, thumbnail, "WEBP", 85, size)
+        storage.save("streaming.webp", DjangoFile(image))
+        storage.save("streaming_thumb.webp", DjangoFile(thumbnail))
+
+
+PIPELINES = {"before": _legacy_pipeline, "after": _streaming_pipeline}
+
+
+def _measure(name, source_path, size, queue):
+    # 새 프로세스에서 실행해 파이프라인 하나의 최대 메모리만 측정
+    import django
+
+    django.setup()
+    from django.core.files.storage import FileSystemStorage
+
+    with tempfile.TemporaryDirectory() as location:
+        storage = FileSystemStorage(location=location)
+        # 업로드 파일과 같이 원본 바이트는 메모리에 있는 상태에서 시작
+        upload = BytesIO()
+        with open(source_path, "rb") as source:
+            shutil.copyfileobj(source, upload)
+        upload.seek(0)
+        # 초기화할 수 없으면 준비 과정의 최대 메모리가 섞여 증가량이 작게 나올 수 있음
+        _reset_peak_rss()
+        baseline = _peak_rss_mb()
+        PIPELINES[name](upload, storage, size)
+        queue.put(_peak_rss_mb() - baseline)
+
+
+class Command(BaseCommand):
+    help = "업로드 이미지 변환 전후의 최대 메모리(RSS) 사용량을 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--megabytes", type=float, default=10, help="테스트 이미지 크기(MB)"
+        )
+        parser.add_argument(
+            "--format", default="JPEG", choices=["JPEG", "PNG"], help="원본 형식"
+        )
+        parser.add_argument(
+            "--size", type=int, default=500, help="변환 목표 크기 (업로드 기본값 500)"
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.NamedTemporaryFile(suffix=f".{options['format'].lower()}") as f:
+            self.create_source(f, options["megabytes"], options["format"])
+            self.stdout.write(
+                f"원본: {options['format']} {os.path.getsize(f.name) / 1024 / 1024:.1f}MB, "
+                f"목표 크기 {options['size']}px"
+            )
+            context = multiprocessing.get_context("spawn")
+            for name in PIPELINES:
+                queue = context.Queue()
+                process = context.Process(
+                    target=_measure, args=(name, f.name, options["size"], queue)
+                )
+                process.start()
+                peak = queue.get()
+                process.join()
+                self.stdout.write(f"[{name}] 최대 RSS 증가량: {peak:.1f}MB")
+
+    @staticmethod
+    def create_source(f, megabytes, format):
+        # 압축이 잘 안 되는 무작위 픽셀로 목표 크기에 가깝게 생성
+        side = int((megabytes * 1024 * 1024 / (3 if format == "PNG" else 0.9)) ** 0.5)
+        image = PilImage.frombytes("RGB", (side, side), os.urandom(side * side * 3))
+        image.save(f, format=format, quality=90)
+        f.flush()
+
+
+# 명령어
+# python3 manage.py benchmark_image_memory --megabytes 10 --format JPEG
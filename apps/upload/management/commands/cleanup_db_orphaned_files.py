@@ -1,17 +1,17 @@
 # cleanup_db_orphaned_files.py
 
-import os
-
-import boto3
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db import transaction
 
-from apps.upload.models import File
+from apps.upload.reconcile import (
+    DEFAULT_BATCH_SIZE,
+    StorageReconciler,
+    get_s3_client,
+)
 
 
 class Command(BaseCommand):
-    help = "S3에 존재하지 않는 파일을 DB에서 정리 (list_objects_v2 사용)"
+    help = "S3에 존재하지 않는 파일을 DB에서 정리 (S3 목록과 DB를 키 순서로 merge-join)"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -20,96 +20,67 @@ class Command(BaseCommand):
             help="검사할 S3 Prefix (예: post, profile, meet, certificate, other)",
             choices=["profile", "post", "meet", "certificate", "other"],
         )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="삭제하지 않고 대상만 출력"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="한 번에 삭제할 개수 (최대 1000)",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="저장된 체크포인트를 지우고 처음부터 검사",
+        )
 
     def handle(self, *args, **options):
-        #
         prefix_option = options.get("prefix")
         if prefix_option:
-            prefix = f"media/{prefix_option}/"
             self.stdout.write(f"[{prefix_option}] 경로만 검사합니다.")
         else:
-            prefix = "media/"  # 전체 검사
             self.stdout.write("S3 전체 경로를 검사합니다.")
 
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
+        reconciler = StorageReconciler(
+            "db",
+            get_s3_client(),
+            settings.AWS_STORAGE_BUCKET_NAME,
+            prefix=f"{prefix_option}/" if prefix_option else "",
+            batch_size=options["batch_size"],
         )
-        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-
-        s3_keys = list()
-        continuation_token = None
-
-        while True:
-            if continuation_token:
-                response = s3_client.list_objects_v2(
-                    Bucket=bucket_name,
-                    Prefix=prefix,
-                    ContinuationToken=continuation_token,
-                )
+        if options["reset"]:
+            reconciler.reset()
+        if checkpoint := reconciler.get_checkpoint():
+            self.stdout.write(f"체크포인트 이후부터 이어서 검사: {checkpoint}")
+
+        def on_batch(stats, file_ids):
+            if options["dry_run"]:
+                self.stdout.write(f"삭제 예정 File id: {file_ids}")
             else:
-                response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-
-            contents = response.get("Contents", [])
-            for obj in contents:
-                s3_keys.append(obj["Key"])
-
-            if response.get("IsTruncated"):
-                continuation_token = response.get("NextContinuationToken")
-            else:
-                break
-
-        self.stdout.write(f"S3에서 {len(s3_keys)}개 파일 로딩 완료")
-
-        # 존재 하지 않는 파일 데이터베이스에서 검색
-        orphaned_files = File.objects.exclude(file__in=s3_keys)
-
-        if prefix_option:
-            orphaned_files = orphaned_files.filter(file__startswith=prefix_option)
+                self.stdout.write(
+                    f"삭제 완료: {stats.deleted}개 (Batch {stats.batches}, "
+                    f"~{stats.last_key})"
+                )
 
-        # deleted_count : 삭제된 전체 레코드 개수 (정수)
-        # deleted_detail : 각 모델별 삭제 개수 딕셔너리
-        deleted_count, deleted_detail = orphaned_files.delete()
+        stats = reconciler.delete_db_orphans(
+            dry_run=options["dry_run"], on_batch=on_batch
+        )
 
-        self.stdout.write(self.style.SUCCESS(f"총 {deleted_count}개 DB 삭제 완료"))
+        self.stdout.write(
+            f"S3 {stats.scanned_s3}개, DB {stats.scanned_db}개 비교 ({stats.elapsed:.1f}초)"
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"[dry-run] 총 {stats.orphans}개 DB 삭제 예정")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"총 {stats.deleted}개 DB 삭제 완료"))
 
 
 # 명령어
 # python3 manage.py cleanup_db_orphaned_files
 # python3 manage.py cleanup_db_orphaned_files --prefix profile
+# python3 manage.py cleanup_db_orphaned_files --dry-run
 
 # 명령어 등록
 # 아래 경로에 파일이 존재하면 파일명을 기준으로 자동 등록
 # <app>/management/commands/*.py
-
-
-# import os
-# from django.conf import settings
-# from django.core.management.base import BaseCommand
-# from apps.upload.models import File
-#
-# class Command(BaseCommand):
-#     help = "파일이 물리적으로 없는 경우 DB 레코드도 삭제"
-#
-#     def handle(self, *args, **kwargs):
-#         # 파일 경로가 실제로 존재하는지 확인
-#         orphaned_files = File.objects.filter(is_deleted=True)
-#
-#         total_checked = 0
-#         total_deleted = 0
-#
-#         for file in orphaned_files:
-#             total_checked += 1
-#
-#             if file.file:
-#                 file_path = os.path.join(settings.MEDIA_ROOT, file.file.name)
-#
-#                 if not os.path.exists(file_path):  # 실제 파일 존재 여부 확인
-#                     # 파일이 실제로 없으면 DB에서 삭제
-#                     self.stdout.write(f"파일 없음. DB 삭제: {file.file.name}")
-#                     file.delete(soft=False)
-#                     total_deleted += 1
-#
-#         self.stdout.write(self.style.SUCCESS(f"총 {total_checked}개 중 {total_deleted}개 DB 삭제 완료"))
@@ -6,86 +6,135 @@ from datetime import timedelta
 import boto3
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils.timezone import now
+from django.utils.timezone import localtime, now
 
 from apps.upload.models import File
+from apps.upload.references import unreferenced_files
+from utils.purge import DEFAULT_BATCH_SIZE, BatchPurger
 
 
 class Command(BaseCommand):
     help = "Soft-deleted 파일 중 일정 기간 지난 것을 실제 삭제 (DB + 저장소)"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--unreferenced-days",
+            type=int,
+            help="업로드 후 이 기간(일)이 지나도록 어디에도 연결되지 않은 파일도 소프트 딜리트",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="한 번에 삭제할 파일 수",
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="체크포인트를 지우고 처음부터 실행"
+        )
+
     def handle(self, *args, **kwargs):
+        # 미사용 파일 찾기 (ref_count = 0 인덱스 조회), 7일 뒤 아래에서 실제 삭제
+        if kwargs.get("unreferenced_days") is not None:
+            marked = (
+                unreferenced_files(timedelta(days=kwargs["unreferenced_days"]))
+                .filter(is_deleted=False)
+                .update(is_deleted=True, deleted_at=now())
+            )
+            self.stdout.write(f"미사용 파일 {marked}개 소프트 딜리트")
+
         # 삭제 기준: soft delete 후 7일 지난 파일들
-        threshold = now() - timedelta(days=7)
+        # 날짜 단위로 잘라서 같은 날 다시 실행하면 중단된 위치부터 이어서 삭제
+        threshold = localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=7)
         # threshold = now()
 
         # 7일 전보다 삭제일이 작은 것들 (7일이 지난 파일들) (7일이 지나지 않으면 삭제일이 더 큼)
         files_to_delete = File.objects.filter(is_deleted=True, deleted_at__lt=threshold)
 
-        total = files_to_delete.count()
-        if total == 0:
-            self.stdout.write("삭제할 파일이 없습니다.")
-            return
+        purger = BatchPurger(
+            "upload.deleted_files", files_to_delete, batch_size=kwargs["batch_size"]
+        )
+        if kwargs["reset"]:
+            purger.reset()
 
         if settings.DJANGO_ENV == "prod":
             self.stdout.write("배포 환경에서 삭제 실행")
-            # S3 클라이언트 초기화
-            s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_S3_REGION_NAME,
-            )
-
-            # S3 버킷 이름
-            bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-
-            # 삭제할 파일 키 목록
-            delete_objects = []
-
-            # 파일과 썸네일의 S3 키 수집
-            for file in files_to_delete:
-                if file.file:
-                    file_key = f"{file.file.storage.location}/{file.file.name}"
-                    delete_objects.append({"Key": file_key})
-
-                if file.thumbnail:
-                    thumbnail_key = (
-                        f"{file.thumbnail.storage.location}/{file.thumbnail.name}"
-                    )
-                    delete_objects.append({"Key": thumbnail_key})
-
-            # S3에서 일괄 삭제 (최대 1000개까지 한 번에 삭제 가능)
-            if delete_objects:
-                # 1000개씩 나누어서 처리
-                for i in range(0, len(delete_objects), 1000):
-                    try:
-                        s3_client.delete_objects(
-                            Bucket=bucket_name,
-                            Delete={"Objects": delete_objects[i : i + 1000]},
-                        )
-                    except Exception as e:
-                        self.stderr.write(f"S3 삭제 중 오류 발생")
-
-            # 데이터베이스에서 한 번에 삭제
-            files_to_delete.delete()
+            delete_storage_files = self.delete_s3_files
         else:
             self.stdout.write("로컬 환경에서 삭제 실행")
-            for file in files_to_delete:
-                file_path = file.file.name
-                try:
-                    self.stdout.write(f"삭제 중: {file_path}")
-                    file.file.delete(save=False)  # 실제 파일 삭제
-                except Exception as e:
-                    self.stderr.write(f"삭제 실패: {file_path} -> {e}")
-
-            files_to_delete.delete()
+            delete_storage_files = self.delete_local_files
+
+        # 배치마다 저장소 파일을 지운 뒤 DB에서 삭제
+        stats = purger.run(
+            on_batch=lambda stats: self.stdout.write(
+                f"[배치 {stats.batches}] 누적 {stats.deleted}개, 마지막 id {stats.last_id}"
+            ),
+            before_delete=delete_storage_files,
+        )
+        if stats.batches == 0:
+            self.stdout.write("삭제할 파일이 없습니다.")
+            return
 
-        self.stdout.write(self.style.SUCCESS(f"총 {total}개 파일 정리 완료"))
+        self.stdout.write(self.style.SUCCESS(f"총 {stats.deleted}개 파일 정리 완료"))
+
+    def delete_s3_files(self, files):
+        # S3 클라이언트 초기화
+        s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_S3_REGION_NAME,
+        )
+
+        # S3 버킷 이름
+        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
+
+        # 삭제할 파일 키 목록
+        delete_objects = []
+
+        # 파일과 썸네일의 S3 키 수집
+        # blob을 쓰는 파일은 다른 File과 공유하므로 제외 (참조가 0이 되면 시그널에서 삭제)
+        for file in files:
+            if file.blob_id:
+                continue
+            if file.file:
+                file_key = f"{file.file.storage.location}/{file.file.name}"
+                delete_objects.append({"Key": file_key})
+
+            if file.thumbnail:
+                thumbnail_key = (
+                    f"{file.thumbnail.storage.location}/{file.thumbnail.name}"
+                )
+                delete_objects.append({"Key": thumbnail_key})
+
+        # S3에서 일괄 삭제 (최대 1000개까지 한 번에 삭제 가능)
+        # 1000개씩 나누어서 처리
+        for i in range(0, len(delete_objects), 1000):
+            try:
+                s3_client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={"Objects": delete_objects[i : i + 1000]},
+                )
+            except Exception as e:
+                self.stderr.write(f"S3 삭제 중 오류 발생")
+
+    def delete_local_files(self, files):
+        for file in files:
+            file_path = file.file.name
+            if file.blob_id:  # 공유 파일은 blob 참조가 0이 될 때 삭제
+                continue
+            try:
+                self.stdout.write(f"삭제 중: {file_path}")
+                file.file.delete(save=False)  # 실제 파일 삭제
+            except Exception as e:
+                self.stderr.write(f"삭제 실패: {file_path} -> {e}")
 
 
 # 명령어
 # python3 manage.py cleanup_orphaned_files
+# python3 manage.py cleanup_is_deleted_files --unreferenced-days 1
+# python3 manage.py cleanup_is_deleted_files --batch-size 500
 
 # 명령어 등록
 # 아래 경로에 파일이 존재하면 파일명을 기준으로 자동 등록
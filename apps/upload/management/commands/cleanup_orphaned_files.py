@@ -1,89 +1,106 @@
-import os
+from datetime import timedelta
 
-import boto3
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from apps.upload.models import File
+from apps.upload.reconcile import (
+    DEFAULT_BATCH_SIZE,
+    StorageReconciler,
+    get_s3_client,
+)
 
 
 class Command(BaseCommand):
-    help = "DB에 존재하지 않는 S3 파일을 일괄 삭제"
-
-    def handle(self, *args, **options):
-
-        # S3 클라이언트 초기화
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
+    help = (
+        "DB에 존재하지 않는 S3 파일을 일괄 삭제 (S3 목록과 DB를 키 순서로 merge-join)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            type=str,
+            help="검사할 S3 Prefix (예: post, profile, meet, certificate, other)",
+            choices=["profile", "post", "meet", "certificate", "other"],
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="삭제하지 않고 대상만 출력"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="한 번에 삭제할 개수 (최대 1000)",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="저장된 체크포인트를 지우고 처음부터 검사",
+        )
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help="이 시간(분) 안에 올라온 파일은 DB 저장 전일 수 있으므로 제외",
         )
 
-        # S3 버킷 이름
-        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-        prefix = "media/"
-
+    def handle(self, *args, **options):
         self.stdout.write("DB에 존재하지 않는 S3 파일 정리 시작")
 
-        # DB에 존재하는 파일 목록 (S3 Key)
-        valid_keys = set(
-            f"{file.file.storage.location}/{file.file.name}"
-            for file in File.objects.all()
-            if file.file
+        prefix_option = options.get("prefix")
+        reconciler = StorageReconciler(
+            "s3",
+            get_s3_client(),
+            settings.AWS_STORAGE_BUCKET_NAME,
+            prefix=f"{prefix_option}/" if prefix_option else "",
+            batch_size=options["batch_size"],
         )
-
-        # S3에 존재하는 모든 파일 목록
-        s3_keys = set()
-        continuation_token = None
-
-        while True:
-            if continuation_token:
-                response = s3_client.list_objects_v2(
-                    Bucket=bucket_name,
-                    Prefix=prefix,
-                    ContinuationToken=continuation_token,
-                )
+        if options["reset"]:
+            reconciler.reset()
+        if checkpoint := reconciler.get_checkpoint():
+            self.stdout.write(f"체크포인트 이후부터 이어서 검사: {checkpoint}")
+
+        def on_batch(stats, keys):
+            if options["dry_run"]:
+                for key in keys:
+                    self.stdout.write(f"삭제 예정: {key}")
             else:
-                response = s3_client.list_objects_v2(
-                    Bucket=bucket_name,
-                    Prefix=prefix,
+                self.stdout.write(
+                    f"삭제 완료: {stats.deleted}개 (Batch {stats.batches}, "
+                    f"~{stats.last_key})"
                 )
 
-            contents = response.get("Contents", [])  # S3 파일 목록
-            for obj in contents:
-                s3_keys.add(obj["Key"])
-
-            if response.get(
-                "IsTruncated"
-            ):  # 현재 요청으로 다 못 가져왔는지 여부 (1000개 이상일 시)
-                continuation_token = response.get(
-                    "NextContinuationToken"
-                )  # 다음 페이지를 가져오기 위한 토큰 (S3가 응답으로 주는 페이징 키)
-            else:
-                break
-
-        self.stdout.write(f"S3 총 파일 수: {len(s3_keys)}")
-        self.stdout.write(f"DB에 존재하는 파일 수: {len(valid_keys)}")
-
-        # DB에 없는 S3 파일
-        orphaned_keys = list(s3_keys - valid_keys)
+        stats = reconciler.delete_s3_orphans(
+            dry_run=options["dry_run"],
+            grace=timedelta(minutes=options["grace_minutes"]),
+            on_batch=on_batch,
+        )
 
-        self.stdout.write(f"삭제할 파일 수: {len(orphaned_keys)}")
+        if stats.failed:
+            for target in stats.failed:
+                self.stdout.write(self.style.ERROR(f"삭제 실패: {target}"))
+            self.stdout.write(
+                self.style.WARNING(
+                    f"S3 파일 {len(stats.failed)}개 삭제 실패, "
+                    "다음 실행 때 실패한 배치부터 다시 검사합니다."
+                )
+            )
 
-        if orphaned_keys:
-            for i in range(0, len(orphaned_keys), 1000):
-                batch = orphaned_keys[i : i + 1000]
-                delete_objects = [{"Key": key} for key in batch]
+        self.stdout.write(f"S3 총 파일 수: {stats.scanned_s3}")
+        self.stdout.write(f"DB에 존재하는 파일 수: {stats.scanned_db}")
 
-                response = s3_client.delete_objects(
-                    Bucket=bucket_name,
-                    Delete={"Objects": delete_objects},
+        if not stats.orphans:
+            self.stdout.write("삭제할 파일이 없습니다.")
+        elif options["dry_run"]:
+            self.stdout.write(f"[dry-run] 삭제할 파일 수: {stats.orphans}")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"DB에 없는 S3 파일 {stats.deleted}개 일괄 삭제 완료 "
+                    f"({stats.elapsed:.1f}초)"
                 )
+            )
 
-                deleted = response.get("Deleted", [])
-                self.stdout.write(f"삭제 완료: {len(deleted)}개 (Batch {i//1000 + 1})")
 
-            self.stdout.write(self.style.SUCCESS("DB에 없는 S3 파일 일괄 삭제 완료"))
-        else:
-            self.stdout.write("삭제할 파일이 없습니다.")
+# 명령어
+# python3 manage.py cleanup_orphaned_files
+# python3 manage.py cleanup_orphaned_files --prefix post --dry-run
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.upload.tasks import sweep_stale_image_jobs
+
+
+class Command(BaseCommand):
+    help = "서버 재시작 등으로 사라진 이미지 변환 작업을 실패 처리하고 남은 임시 파일을 삭제"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            help="이 시간(분)이 지나도 처리 중인 파일을 대상으로 함 (기본: 설정값)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="바꾸지 않고 대상 수만 출력",
+        )
+
+    def handle(self, *args, **options):
+        stale_after = None
+        if options["minutes"] is not None:
+            stale_after = timedelta(minutes=options["minutes"])
+        failed, removed = sweep_stale_image_jobs(stale_after, options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(
+                f"[dry-run] 실패 처리할 파일: {failed}개, 삭제할 임시 파일: {removed}개"
+            )
+            return
+        self.stdout.write(
+            self.style.SUCCESS(f"파일 {failed}개 실패 처리, 임시 파일 {removed}개 삭제")
+        )
+
+
+# 명령어
+# python3 manage.py cleanup_stale_image_jobs
+# python3 manage.py cleanup_stale_image_jobs --minutes 60 --dry-run
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.upload.references import rebuild_ref_counts
+
+
+class Command(BaseCommand):
+    help = "File.ref_count를 실제 참조 수와 비교해서 어긋난 파일만 일괄로 다시 계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="고치지 않고 어긋난 파일 수만 출력",
+        )
+
+    def handle(self, *args, **options):
+        drifted = rebuild_ref_counts(dry_run=options["dry_run"])
+        if not drifted:
+            self.stdout.write("참조 수가 어긋난 파일이 없습니다.")
+        elif options["dry_run"]:
+            self.stdout.write(f"참조 수가 어긋난 파일: {drifted}개")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"총 {drifted}개 파일의 참조 수를 다시 계산했습니다."
+                )
+            )
+
+
+# 명령어
+# python3 manage.py rebuild_file_ref_counts
+# python3 manage.py rebuild_file_ref_counts --dry-run
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upload", "0007_alter_file_file_alter_file_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("processing", "처리 중"),
+                    ("ready", "완료"),
+                    ("failed", "실패"),
+                ],
+                default="ready",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import apps.upload.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upload", "0008_file_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                ("format", models.CharField(max_length=10)),
+                (
+                    "image",
+                    models.FileField(upload_to=apps.upload.models.variant_upload_to),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("size", models.BigIntegerField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="variants",
+                        to="upload.file",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "파일 변환본",
+                "verbose_name_plural": "파일 변환본 목록",
+                "db_table": "file_variant",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("file", "name", "format"), name="unique_file_variant"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upload", "0009_filevariant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64)),
+                ("options", models.CharField(max_length=50)),
+                ("file", models.FileField(max_length=255, upload_to="")),
+                (
+                    "thumbnail",
+                    models.FileField(blank=True, max_length=255, upload_to=""),
+                ),
+                ("file_size", models.BigIntegerField(blank=True, null=True)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "파일 blob",
+                "verbose_name_plural": "파일 blob 목록",
+                "db_table": "file_blob",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("sha256", "options"), name="unique_file_blob"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="file",
+            name="blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="files",
+                to="upload.fileblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+REFERENCES = [
+    ("user", "User"),
+    ("posts", "Post"),
+    ("posts", "PostImage"),
+    ("meet", "Meet"),
+    ("leaders", "LeaderCertificate"),
+]
+
+
+def backfill_ref_counts(apps, schema_editor):
+    """기존 파일의 참조 수를 한 번의 UPDATE로 채움"""
+    File = apps.get_model("upload", "File")
+    total = Value(0, output_field=IntegerField())
+    for app_label, model_name in REFERENCES:
+        model = apps.get_model(app_label, model_name)
+        count = (
+            model._base_manager.filter(file=OuterRef("pk"))
+            .order_by()
+            .values("file")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        total = total + Coalesce(Subquery(count), 0)
+    File.objects.update(ref_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("upload", "0010_fileblob"),
+        ("user", "0005_user_introduction"),
+        ("posts", "0005_created_at_cursor_index"),
+        ("meet", "0009_created_at_cursor_index"),
+        ("leaders", "0008_alter_leaderapplication_certificate_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="ref_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="file",
+            index=models.Index(
+                condition=models.Q(("ref_count", 0)),
+                fields=["uploaded_at"],
+                name="file_unreferenced_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_ref_counts, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
+import hashlib
+import logging
 import mimetypes
 import os
 from datetime import datetime
-from io import BytesIO
 from pathlib import Path
 from urllib.parse import urlparse
 from uuid import uuid4
@@ -9,10 +10,32 @@ from uuid import uuid4
 import requests
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.core.files.base import ContentFile
+from django.core.files.base import File as DjangoFile
 from django.db import models
+from django.db.models import F, Q
 from django.utils import timezone
-from PIL import Image as PilImage
+from PIL import features
+
+from apps.upload.images import (
+    COPY_CHUNK_SIZE,
+    sha256_of,
+    spooled_file,
+    transcode_image_to,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_VARIANTS = {
+    # 이름 -> 최대 크기(px), 이름은 ?img= 힌트로 사용
+    "SIZES": {"icon": 64, "thumb": 160, "small": 500, "large": 1280},
+    # 카테고리별로 만들 변환본 (없는 카테고리는 전체)
+    "CATEGORIES": {
+        "profile": ["icon", "thumb", "small"],
+        "certificate": [],
+    },
+    # "AVIF"를 추가하면 Pillow가 지원할 때만 함께 생성
+    "FORMATS": ["WEBP"],
+}
 
 
 def upload_to(instance, filename):  # 인스턴스는 file모델. filename은 저장된 파일의 이름
@@ -21,6 +44,12 @@ def upload_to(instance, filename):  # 인스턴스는 file모델. filename은 
     return f"{category}/origianl/{date_path}/{filename}"
 
 
+def variant_upload_to(instance, filename):  # 인스턴스는 FileVariant 모델
+    category = instance.file.category if instance.file.category else "other"
+    date_path = datetime.now().strftime("%Y/%m/%d")
+    return f"{category}/variant/{date_path}/{filename}"
+
+
 def thumbnail_upload_to(
     instance, filename
 ):  # 인스턴스는 file모델. filename은 저장된 파일의 이름
@@ -37,13 +66,152 @@ class FileCategory(models.TextChoices):
     OTHER = "other", "기타"
 
 
+class FileStatus(models.TextChoices):
+    PROCESSING = "processing", "처리 중"
+    READY = "ready", "완료"
+    FAILED = "failed", "실패"
+
+
+def get_image_variants_config():
+    return {**DEFAULT_IMAGE_VARIANTS, **getattr(settings, "IMAGE_VARIANTS", {})}
+
+
+def get_image_variants(category):
+    """
+    카테고리에 맞는 ((이름, 최대 크기), ...)와 생성할 형식 목록 반환
+    Pillow가 인코딩하지 못하는 형식(AVIF 등)은 제외
+    """
+    config = get_image_variants_config()
+    sizes = config["SIZES"]
+    names = config["CATEGORIES"].get(category or "other", list(sizes))
+    formats = [
+        format.upper()
+        for format in config["FORMATS"]
+        if format.upper() != "AVIF" or features.check("avif")
+    ]
+    return [(name, sizes[name]) for name in names if name in sizes], formats
+
+
+def get_blob_options(file_type, category, format="WEBP", quality=85, size=None):
+    """
+    같은 원본이라도 변환 옵션이 다르면 결과가 다르므로 blob은 (SHA-256, 옵션)으로 구분
+    이미지가 아니면 변환하지 않으므로 raw
+    """
+    if file_type != "image":
+        return "raw"
+    return f"{format.upper()}:{quality}:{size or 0}:{category or 'other'}"
+
+
 FILE_TYPE_CHOICES = [
     ("image", "Image"),
     ("video", "Video"),
     ("file", "File"),
 ]
 
-THUMBNAIL_SIZE = (500, 500)
+
+class FileBlob(models.Model):
+    """
+    내용(원본 SHA-256)이 같은 업로드가 함께 쓰는 저장소 파일
+    같은 내용을 다시 올리면 변환과 저장소 업로드 없이 File이 이 경로를 그대로 가리킴
+    ref_count는 이 blob을 가리키는 File 수이고, 0이 되면 blob과 저장소 파일을 삭제
+    """
+
+    sha256 = models.CharField(max_length=64)
+    options = models.CharField(max_length=50)  # get_blob_options
+    file = models.FileField(max_length=255)
+    thumbnail = models.FileField(max_length=255, blank=True)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.options}) x{self.ref_count}"
+
+    class Meta:
+        db_table = "file_blob"
+        verbose_name = "파일 blob"
+        verbose_name_plural = "파일 blob 목록"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sha256", "options"], name="unique_file_blob"
+            )
+        ]
+
+    @classmethod
+    def acquire(cls, sha256, options):
+        """
+        같은 내용의 blob이 있으면 참조 수를 먼저 올리고 반환 (없거나 삭제 중이면 None)
+        참조가 남아 있을 때만 올리는 조건부 UPDATE 한 번이라, 마지막 참조가 동시에
+        해제되어도 삭제될 blob을 가리키지 않음 (None이면 새로 변환해서 새 blob으로 등록)
+        """
+        blobs = cls.objects.filter(sha256=sha256, options=options)
+        if not blobs.filter(ref_count__gt=0).update(ref_count=F("ref_count") + 1):
+            return None
+        return blobs.first()
+
+    @classmethod
+    def register(cls, file, sha256, options):
+        """
+        새로 저장한 파일을 blob으로 등록
+        같은 내용이 동시에 먼저 등록됐으면 공유하지 않고 파일을 그대로 둠 (None 반환)
+        """
+        blob, created = cls.objects.get_or_create(
+            sha256=sha256,
+            options=options,
+            defaults={
+                "file": file.file.name,
+                "thumbnail": file.thumbnail.name or "",
+                "file_size": file.file_size,
+                "ref_count": 1,
+            },
+        )
+        if not created:
+            return None
+        File.objects.filter(id=file.id).update(blob=blob)
+        file.blob = blob
+        return blob
+
+    def copy_variants(self, file):
+        """acquire로 참조를 얻은 File이 저장된 뒤 변환본 레코드를 복사"""
+        source = (
+            File.objects.filter(blob=self)
+            .exclude(id=file.id)
+            .prefetch_related("variants")
+            .first()
+        )
+        if source is None:
+            return
+        # 저장소 파일은 같은 경로를 가리키므로 업로드 없음
+        FileVariant.objects.bulk_create(
+            FileVariant(
+                file=file,
+                name=variant.name,
+                format=variant.format,
+                image=variant.image.name,
+                width=variant.width,
+                height=variant.height,
+                size=variant.size,
+            )
+            for variant in source.variants.all()
+        )
+
+    @classmethod
+    def release(cls, blob_id):
+        """
+        File 하나의 참조를 해제. 마지막 참조였으면 blob 삭제 (저장소 파일은 시그널에서 삭제)
+        조회 후 쓰지 않고 조건부 UPDATE로만 바꾸며, 마지막 참조는 0으로 바꾼 뒤 삭제해서
+        그 사이 acquire가 참조를 가져가지 못하게 함
+        """
+        blobs = cls.objects.filter(id=blob_id)
+        while True:
+            if blobs.filter(ref_count__gt=1).update(ref_count=F("ref_count") - 1):
+                return
+            if blobs.filter(ref_count=1).update(ref_count=0):
+                blobs.filter(ref_count=0).delete()
+                return
+            if not blobs.filter(ref_count__gt=0).exists():
+                return  # 이미 해제됨
+            # 두 조건 사이에 다른 요청이 참조 수를 바꿈, 다시 시도
 
 
 class File(models.Model):
@@ -59,6 +227,23 @@ class File(models.Model):
     file_size = models.BigIntegerField(blank=True, null=True)
     thumbnail = models.ImageField(upload_to=thumbnail_upload_to, blank=True, null=True)
 
+    # 같은 내용의 업로드와 함께 쓰는 저장소 파일 (없으면 이 File만 쓰는 파일)
+    blob = models.ForeignKey(
+        FileBlob,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="files",
+    )
+
+    # 이 파일을 가리키는 레코드 수 (apps.upload.references.FILE_REFERENCES, 시그널로 갱신)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    # 이미지 변환이 백그라운드에서 진행 중이면 processing
+    status = models.CharField(
+        max_length=10, choices=FileStatus.choices, default=FileStatus.READY
+    )
+
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     is_deleted = models.BooleanField(default=False)
@@ -72,6 +257,14 @@ class File(models.Model):
         verbose_name = "파일"
         verbose_name_plural = "파일 목록"
         ordering = ["-uploaded_at"]
+        indexes = [
+            # 미사용 파일 조회 (WHERE ref_count = 0 AND uploaded_at < ...)
+            models.Index(
+                fields=["uploaded_at"],
+                condition=Q(ref_count=0),
+                name="file_unreferenced_idx",
+            ),
+        ]
 
     # # 이미지 가져오는 메서드
     # def get_image_url(self):
@@ -100,73 +293,143 @@ class File(models.Model):
     #     return settings.DEFAULT_THUMBNAIL_URL  # 예외 대비 fallback
 
     def download_from_url(self, url):
-
+        """
+        URL의 이미지를 받아 self.file로 설정하고 받은 내용의 SHA-256 반환 (실패하면 None)
+        반환한 해시는 prepare(sha256=...)로 넘겨 다시 읽지 않도록 함
+        """
         filename = f"profile_{uuid4().hex}.jpeg"
 
         try:
             response = requests.get(url, stream=True, timeout=5)
             response.raise_for_status()  # 실패 응답을 받을시 예외 발생
 
-            image_file = BytesIO(response.content)
-            image_file.seek(0)
-
-            temp_file = ContentFile(image_file.read(), name=filename)
-            self.file = temp_file
-
-            return True
-
-        except Exception as e:
-            print(f"[File.download_from_url] Failed: {e}")
-            return False
-
-    def prepare(self, *, format="WEBP", quality=85, size=None):
-        """파일 저장 전에 썸네일 생성, 파일 형식 변환 등 전처리"""
+            # 응답 본문을 메모리에 통째로 올리지 않고 청크 단위로 임시 파일에 씀
+            # 같은 프로필 이미지를 다시 받는 경우가 많으므로 받으면서 SHA-256도 계산
+            temp_file = spooled_file()
+            digest = hashlib.sha256()
+            for chunk in response.iter_content(COPY_CHUNK_SIZE):
+                digest.update(chunk)
+                temp_file.write(chunk)
+            temp_file.seek(0)
+            self.file = DjangoFile(temp_file, name=filename)
+            return digest.hexdigest()
+
+        except Exception:
+            logger.exception("URL 파일 다운로드 실패: %s", url)
+            return None
+
+    def prepare(self, *, format="WEBP", quality=85, size=None, sha256=None):
+        """
+        파일 저장 전에 썸네일 생성, 파일 형식 변환 등 전처리
+        sha256은 이미 계산한 원본 해시 (없으면 파일을 읽어 계산)
+        """
 
         # self.file_name = os.path.basename(self.file.name)
         self.file_name = self.file.name
         self.file_size = self.file.size
         self.file_type = get_file_type(self.file_name)
 
-        # 이미지라면 변환/썸네일
+        # 같은 내용을 같은 옵션으로 올린 적이 있으면 변환과 저장소 업로드 없이 공유
+        sha256 = sha256 or sha256_of(self.file)
+        options = get_blob_options(self.file_type, self.category, format, quality, size)
+        if blob := FileBlob.acquire(sha256, options):
+            self.use_blob(blob)
+            return
+        # 저장 후 blob으로 등록 (save_pending)
+        self.pending_blob = (sha256, options)
+
+        # 이미지라면 변환/썸네일 (인코딩 결과를 임시 파일에 바로 쓰고 그대로 저장소에 업로드)
         if self.file_type == "image":
-            image = PilImage.open(self.file)
-            # 원본이 RGBA(투명 포함)나 P(팔레트 기반)이면 WebP 저장 시 오류 발생 가능성 있음
-            image = image.convert("RGB")
-
-            # 사이즈 옵션이 있으면 리사이징
-            if size:
-                image.thumbnail((size, size))
-
-            # 메모리 버퍼에 저장 (이미지 임시 저장)
-            temp_image = BytesIO()
-            converted_format = format.upper()
-            image.save(temp_image, format=converted_format, quality=quality)
-            temp_image.seek(0)
-
-            # 파일명 변경
-            base_name = Path(self.file.name).stem
-            new_file_name = f"{base_name}.{format.lower()}"
-
-            # 파일 필드 교체
-            self.file.save(new_file_name, ContentFile(temp_image.read()), save=False)
-            self.file_name = new_file_name
-            self.file_size = self.file.size
-            temp_image.close()
-
-            # 썸네일 고정 사이즈 생성
-            thumbnail = image.copy()
-            thumbnail.thumbnail(THUMBNAIL_SIZE)
-
-            # 변환된 이미지 저장
-            temp_thumb = BytesIO()
-            thumbnail_filename = f"{base_name}_thumb.{format.lower()}"
-            thumbnail.save(temp_thumb, format=converted_format, quality=quality)
-            temp_thumb.seek(0)
-
-            self.thumbnail.save(
-                thumbnail_filename, ContentFile(temp_thumb.read()), save=False
+            self.file.seek(0)
+            variants, variant_formats = get_image_variants(self.category)
+            with spooled_file() as image, spooled_file() as thumbnail:
+                renditions = transcode_image_to(
+                    self.file,
+                    image,
+                    thumbnail,
+                    format,
+                    quality,
+                    size,
+                    variants,
+                    variant_formats,
+                )
+                self.save_transcoded(image, thumbnail, format=format)
+            # 변환본은 File이 저장된 뒤 저장 (save_pending)
+            self.pending_renditions = renditions
+
+    def use_blob(self, blob):
+        """acquire한 blob의 저장소 파일을 그대로 가리킴 (변환본은 저장 후 save_pending에서)"""
+        self.blob = blob
+        self.file = blob.file.name
+        self.thumbnail = blob.thumbnail.name or None
+        self.file_size = blob.file_size
+        self.file_name = f"{Path(self.file_name).stem}{Path(blob.file.name).suffix}"
+        self.pending_blob = blob
+
+    def save_transcoded(self, image, thumbnail, *, format="WEBP"):
+        """변환된 이미지/썸네일 파일 객체로 파일 필드 교체 (저장소에 업로드)"""
+        # 백그라운드 변환은 원본을 저장하지 않으므로 file_name 기준
+        base_name = Path(self.file_name or self.file.name).stem
+        new_file_name = f"{base_name}.{format.lower()}"
+
+        # 파일 필드 교체
+        image = DjangoFile(image)
+        self.file_size = image.size  # 저장소에 다시 묻지 않음
+        self.file.save(new_file_name, image, save=False)
+        self.file_name = new_file_name
+
+        thumbnail_filename = f"{base_name}_thumb.{format.lower()}"
+        self.thumbnail.save(thumbnail_filename, DjangoFile(thumbnail), save=False)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.save_pending()
+
+    def save_pending(self):
+        """
+        prepare에서 File 저장 뒤로 미룬 작업 (변환본 저장, blob 등록 또는 변환본 복사)
+        bulk_create로 저장했으면 직접 호출
+        """
+        renditions = self.__dict__.pop("pending_renditions", None)
+        if renditions:
+            self.save_variants(renditions)
+        blob = self.__dict__.pop("pending_blob", None)
+        if isinstance(blob, FileBlob):
+            blob.copy_variants(self)
+        elif blob:
+            FileBlob.register(self, *blob)
+
+    def release_pending(self):
+        """저장하지 못한 File이 acquire해 둔 blob 참조를 돌려줌 (저장 실패 시)"""
+        blob = self.__dict__.pop("pending_blob", None)
+        if isinstance(blob, FileBlob):
+            FileBlob.release(blob.id)
+
+    def save_variants(self, renditions):
+        """
+        변환본(Rendition)을 저장소에 올리고 FileVariant로 저장 (File이 먼저 저장돼 있어야 함)
+        rendition.out은 파일 객체 또는 파일 경로
+        """
+        base_name = Path(self.file_name or self.file.name).stem
+        variants = []
+        for rendition in renditions:
+            variant = FileVariant(
+                file=self,
+                name=rendition.name,
+                format=rendition.format,
+                width=rendition.width,
+                height=rendition.height,
             )
-            temp_thumb.close()
+            filename = f"{base_name}_{rendition.name}.{rendition.format.lower()}"
+            if isinstance(rendition.out, str):
+                with open(rendition.out, "rb") as out:
+                    variant.image.save(filename, DjangoFile(out), save=False)
+            else:
+                variant.image.save(filename, DjangoFile(rendition.out), save=False)
+                rendition.out.close()
+            variant.size = variant.image.size
+            variants.append(variant)
+        return FileVariant.objects.bulk_create(variants)
 
     # 소프트 딜리트 후 주기적으로 한번에 삭제
     # 다른 모델이 소프트 딜리트 시엔 파일 모델 영향없음
@@ -175,18 +438,47 @@ class File(models.Model):
         if soft:
             self.is_deleted = True
             self.deleted_at = timezone.now()
-            self.save()
+            # ref_count는 시그널이 DB에서 바로 갱신하므로 덮어쓰지 않음
+            self.save(update_fields=["is_deleted", "deleted_at"])
         else:
             # 실제 파일이 존재하면 삭제
             # os.path.isfile(self.thumbnail.path) 조건 붙이면 s3에서 에러남
-            if self.file:
+            # blob을 쓰는 파일은 다른 File과 공유하므로 blob 참조가 0이 될 때 삭제 (시그널)
+            if self.file and not self.blob_id:
                 self.file.delete(save=False)
-            if self.thumbnail:
+            if self.thumbnail and not self.blob_id:
                 self.thumbnail.delete(save=False)
+            # 변환본 파일은 FileVariant 삭제 시그널에서 삭제
             # DB 레코드 삭제
             super().delete(using=using, keep_parents=keep_parents)
 
 
+class FileVariant(models.Model):
+    """이미지 파일의 크기/형식별 변환본 (목록 화면 등에서 작은 이미지를 내려주기 위함)"""
+
+    file = models.ForeignKey(File, on_delete=models.CASCADE, related_name="variants")
+    name = models.CharField(max_length=20)  # icon, thumb, small, large
+    format = models.CharField(max_length=10)  # WEBP, AVIF
+    image = models.FileField(upload_to=variant_upload_to)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.file_id}:{self.name}.{self.format.lower()}"
+
+    class Meta:
+        db_table = "file_variant"
+        verbose_name = "파일 변환본"
+        verbose_name_plural = "파일 변환본 목록"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["file", "name", "format"], name="unique_file_variant"
+            )
+        ]
+
+
 def get_file_type(file_name: str) -> str:
     mime_type, _ = mimetypes.guess_type(file_name)
 
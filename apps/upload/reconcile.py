@@ -0,0 +1,256 @@
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from operator import itemgetter
+
+import boto3
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from apps.upload.models import File, FileStatus
+
+DEFAULT_BATCH_SIZE = 1000  # S3 delete_objects 한 번에 지울 수 있는 최대 키 수
+DB_CHUNK_SIZE = 2000  # DB 쪽 iterator가 한 번에 가져오는 행 수
+CHECKPOINT_TIMEOUT = 60 * 60 * 24 * 7  # 중단된 작업을 이어갈 수 있는 기간
+DEFAULT_GRACE = timedelta(hours=1)  # 업로드 직후(DB 저장 전) 파일을 지우지 않도록
+
+logger = logging.getLogger(__name__)
+
+# 저장소 경로를 가지고 있는 (모델, 필드), 여기에 없는 저장소 파일은 미사용으로 봄
+# (채팅 보관 파일은 별도 비공개 저장소 STORAGES["chat_archive"]에 있어 검사 대상 아님)
+STORAGE_REFERENCES = [
+    ("upload.File", "file"),
+    ("upload.File", "thumbnail"),
+    ("upload.FileVariant", "image"),
+    ("upload.FileBlob", "file"),
+    ("upload.FileBlob", "thumbnail"),
+]
+
+
+def get_s3_client():
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION_NAME,
+    )
+
+
+def binary_order(field):
+    """
+    S3 목록과 같은 바이트 순서로 정렬하는 식
+    PostgreSQL 기본 collation은 로케일 순서라 "C"로 지정 (SQLite 기본값은 이미 바이트 순서)
+    """
+    if connection.vendor == "postgresql":
+        return Collate(F(field), "C")
+    return F(field)
+
+
+def merge_join(left, right):
+    """
+    키 순서로 정렬된 두 (키, 값) 스트림을 한 번씩만 훑어 (키, 왼쪽 값 목록, 오른쪽 값 목록) 생성
+    한쪽에만 있는 키는 다른 쪽 목록이 비어 있고, 메모리는 같은 키의 값만큼만 사용
+    """
+    left = itertools.groupby(left, key=itemgetter(0))
+    right = itertools.groupby(right, key=itemgetter(0))
+    l, r = next(left, None), next(right, None)
+    while l is not None or r is not None:
+        if r is None or (l is not None and l[0] < r[0]):
+            yield l[0], [value for _, value in l[1]], []
+            l = next(left, None)
+        elif l is None or r[0] < l[0]:
+            yield r[0], [], [value for _, value in r[1]]
+            r = next(right, None)
+        else:
+            yield l[0], [value for _, value in l[1]], [value for _, value in r[1]]
+            l, r = next(left, None), next(right, None)
+
+
+@dataclass
+class ReconcileStats:
+    scanned_s3: int = 0  # 비교한 S3 객체 수
+    scanned_db: int = 0  # 비교한 DB 경로 수
+    orphans: int = 0  # 한쪽에만 있어 삭제 대상인 수 (dry-run이면 삭제 예정)
+    deleted: int = 0
+    batches: int = 0
+    elapsed: float = 0.0  # 초
+    last_key: str = ""  # 마지막으로 처리한 키
+    resumed_from: str = ""  # 체크포인트에서 이어서 시작한 키
+    failed: list = field(default_factory=list)  # 삭제하지 못한 대상
+
+
+class StorageReconciler:
+    """
+    S3 객체 목록과 DB의 파일 경로를 모두 키 순서로 흘려 보내며 merge-join으로 비교
+    - S3는 list_objects_v2 페이지 순서(바이트 순), DB는 같은 순서로 정렬한 iterator
+    - 양쪽을 메모리에 모으지 않고 한쪽에만 있는 키를 batch_size개씩 모아 삭제
+    - 배치를 처리할 때마다 마지막 키를 캐시에 체크포인트로 저장해 중단돼도 이어서 실행
+    - 삭제에 실패한 대상이 있으면 그 배치부터는 체크포인트를 옮기지 않아 다음 실행에서 다시 시도
+
+    예) StorageReconciler("s3", get_s3_client(), bucket, prefix="post/").delete_s3_orphans()
+    """
+
+    def __init__(
+        self,
+        name,
+        client,
+        bucket,
+        location="media",
+        prefix="",
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        if not 0 < batch_size <= DEFAULT_BATCH_SIZE:
+            raise ValueError(f"batch_size는 1~{DEFAULT_BATCH_SIZE}이어야 합니다.")
+        self.name = name
+        self.client = client
+        self.bucket = bucket
+        self.location = location.strip("/")
+        self.prefix = prefix
+        self.batch_size = batch_size
+
+    @property
+    def checkpoint_key(self):
+        return f"reconcile:{self.name}:{self.prefix}:last_key"
+
+    def get_checkpoint(self):
+        return cache.get(self.checkpoint_key, "")
+
+    def reset(self):
+        cache.delete(self.checkpoint_key)
+
+    def to_s3_key(self, name):
+        return f"{self.location}/{name}" if self.location else name
+
+    def s3_stream(self, start_after=""):
+        """(저장소 경로, LastModified)를 키 순서대로 (S3 키에서 location을 뺀 경로)"""
+        strip = len(self.location) + 1 if self.location else 0
+        params = {"Bucket": self.bucket, "Prefix": self.to_s3_key(self.prefix)}
+        if start_after:
+            params["StartAfter"] = self.to_s3_key(start_after)
+        for page in self.client.get_paginator("list_objects_v2").paginate(**params):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][strip:], obj["LastModified"]
+
+    def db_stream(self, model, field, queryset=None, value="pk", start_after=""):
+        """(저장소 경로, value)를 S3와 같은 키 순서대로"""
+        queryset = model._base_manager.all() if queryset is None else queryset
+        queryset = (
+            queryset.annotate(sort_key=binary_order(field))
+            .filter(**{f"{field}__isnull": False, f"{field}__startswith": self.prefix})
+            .exclude(**{field: ""})
+        )
+        if start_after:
+            queryset = queryset.filter(sort_key__gt=start_after)
+        return (
+            queryset.order_by("sort_key")
+            .values_list(field, value)
+            .iterator(chunk_size=DB_CHUNK_SIZE)
+        )
+
+    def run(self, pairs, select, handle, dry_run=False, on_batch=None):
+        """
+        merge_join 결과에서 select(키, S3 값, DB 값)가 돌려준 대상을 모아 handle(대상 목록)로
+        batch_size개씩 삭제하고 ReconcileStats 반환 (dry-run이면 handle 없이 셈만)
+        handle은 (삭제한 수, 실패한 대상 목록)을 반환
+        on_batch(stats, 대상 목록)는 배치마다 호출 (진행 상황 출력용)
+        """
+        stats = ReconcileStats(last_key=self.get_checkpoint())
+        stats.resumed_from = stats.last_key
+        started = time.monotonic()
+        batch = []
+
+        def flush(key):
+            if not dry_run:
+                deleted, failed = handle(batch)
+                stats.deleted += deleted
+                stats.failed.extend(failed)
+                # 실패한 대상을 건너뛰지 않도록 첫 실패 이후로는 체크포인트 고정
+                if not stats.failed:
+                    cache.set(self.checkpoint_key, key, CHECKPOINT_TIMEOUT)
+            stats.batches += 1
+            stats.last_key = key
+            stats.elapsed = time.monotonic() - started
+            if on_batch is not None:
+                on_batch(stats, batch)
+            batch.clear()
+
+        for key, s3_values, db_values in pairs(stats.resumed_from):
+            stats.scanned_s3 += len(s3_values)
+            stats.scanned_db += len(db_values)
+            targets = select(key, s3_values, db_values)
+            if targets:
+                batch.extend(targets)
+                stats.orphans += len(targets)
+                if len(batch) >= self.batch_size:
+                    flush(key)
+        if batch:
+            flush(key)
+
+        stats.elapsed = time.monotonic() - started
+        if not dry_run and not stats.failed:
+            self.reset()  # 실패 없이 끝까지 돌았으면 다음 실행은 처음부터
+        return stats
+
+    def delete_s3_orphans(self, dry_run=False, grace=DEFAULT_GRACE, on_batch=None):
+        """DB 어디에서도 참조하지 않는 S3 객체 삭제 (grace보다 최근에 올라온 객체는 제외)"""
+        threshold = timezone.now() - grace
+
+        def pairs(start_after):
+            db = heapq.merge(
+                *(
+                    self.db_stream(
+                        apps.get_model(label), field, start_after=start_after
+                    )
+                    for label, field in STORAGE_REFERENCES
+                ),
+                key=itemgetter(0),
+            )
+            return merge_join(self.s3_stream(start_after), db)
+
+        def select(key, s3_values, db_values):
+            if db_values or not s3_values or s3_values[0] >= threshold:
+                return []
+            return [self.to_s3_key(key)]
+
+        def handle(keys):
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": False},
+            )
+            errors = response.get("Errors", [])
+            for error in errors:
+                logger.warning(
+                    "S3 객체 삭제 실패: %s (%s: %s)",
+                    error.get("Key"),
+                    error.get("Code"),
+                    error.get("Message"),
+                )
+            return len(response.get("Deleted", [])), [e.get("Key") for e in errors]
+
+        return self.run(pairs, select, handle, dry_run, on_batch)
+
+    def delete_db_orphans(self, dry_run=False, on_batch=None):
+        """S3에 파일이 없는 File 레코드 삭제 (백그라운드 변환 중인 파일은 제외)"""
+        files = File.objects.exclude(status=FileStatus.PROCESSING)
+
+        def pairs(start_after):
+            db = self.db_stream(File, "file", files, start_after=start_after)
+            return merge_join(self.s3_stream(start_after), db)
+
+        def select(key, s3_values, db_values):
+            return [] if s3_values else db_values
+
+        def handle(file_ids):
+            # QuerySet.delete()라 blob 참조 수, 변환본 정리 시그널은 그대로 동작
+            _, per_model = File.objects.filter(id__in=file_ids).delete()
+            return per_model.get(File._meta.label, 0), []
+
+        return self.run(pairs, select, handle, dry_run, on_batch)
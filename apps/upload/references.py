@@ -0,0 +1,83 @@
+import logging
+
+from django.apps import apps as django_apps
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# file 필드로 File을 가리키는 모델, 여기에 등록된 연결만 File.ref_count에 반영
+FILE_REFERENCES = [
+    "user.User",
+    "posts.Post",
+    "posts.PostImage",
+    "meet.Meet",
+    "leaders.LeaderCertificate",
+]
+REBUILD_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def get_reference_models(apps=django_apps):
+    return [apps.get_model(label) for label in FILE_REFERENCES]
+
+
+def adjust_ref_count(file_id, delta):
+    """File 참조 수 증감 (0 아래로는 내려가지 않음, 어긋난 값은 rebuild_ref_counts로 복구)"""
+    File = django_apps.get_model("upload", "File")
+    files = File.objects.filter(id=file_id)
+    if delta < 0:
+        files = files.filter(ref_count__gte=-delta)
+    updated = files.update(ref_count=F("ref_count") + delta)
+    if not updated and delta < 0:
+        logger.warning(
+            "File %s 참조 수를 %s만큼 줄이지 못함 (0 아래로 내려가거나 없는 파일), "
+            "rebuild_file_ref_counts로 복구 필요",
+            file_id,
+            delta,
+        )
+    return updated
+
+
+def expected_ref_count(apps=django_apps):
+    """File마다 실제 참조 수를 세는 식 (참조 모델별 COUNT 서브쿼리의 합)"""
+    total = Value(0, output_field=IntegerField())
+    for model in get_reference_models(apps):
+        count = (
+            model._base_manager.filter(file=OuterRef("pk"))
+            .order_by()
+            .values("file")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        total = total + Coalesce(Subquery(count), 0)
+    return total
+
+
+def rebuild_ref_counts(apps=django_apps, dry_run=False):
+    """
+    실제 참조 수와 다른 File만 찾아 일괄로 다시 계산하고 바로잡은 File 수 반환
+    (queryset.update, bulk_create 등 시그널 없이 바뀐 연결 복구용)
+    """
+    File = apps.get_model("upload", "File")
+    drifted = list(
+        File.objects.annotate(expected=expected_ref_count(apps))
+        .exclude(ref_count=F("expected"))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if not dry_run:
+        for start in range(0, len(drifted), REBUILD_BATCH_SIZE):
+            File.objects.filter(
+                id__in=drifted[start : start + REBUILD_BATCH_SIZE]
+            ).update(ref_count=expected_ref_count(apps))
+    return len(drifted)
+
+
+def unreferenced_files(older_than):
+    """
+    어디에서도 쓰지 않는 파일 (ref_count = 0 부분 인덱스 사용)
+    업로드 직후 아직 연결되지 않은 파일은 older_than(timedelta)으로 제외
+    """
+    File = django_apps.get_model("upload", "File")
+    return File.objects.filter(ref_count=0, uploaded_at__lt=timezone.now() - older_than)
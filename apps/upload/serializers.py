@@ -1,9 +1,69 @@
+import os
+
+from django.db import transaction
 from rest_framework import serializers
 
-from .models import File
+from .images import copy_to_temp_file
+from .models import (
+    File,
+    FileBlob,
+    FileStatus,
+    get_blob_options,
+    get_file_type,
+    get_image_variants_config,
+)
+from .tasks import submit_image_job, use_background
+
+
+def get_image_hint(context):
+    """요청의 ?img= 힌트 (설정된 변환본 이름만, 없으면 None)"""
+    request = context.get("request") if context else None
+    if request is None:
+        return None
+    hint = request.query_params.get("img")
+    return hint if hint in get_image_variants_config()["SIZES"] else None
+
+
+def prefetch_variants(queryset, request, *lookups):
+    """?img= 힌트가 있을 때만 변환본을 함께 조회 (lookups는 File까지의 경로)"""
+    if get_image_hint({"request": request}) is None:
+        return queryset
+    return queryset.prefetch_related(*(f"{lookup}__variants" for lookup in lookups))
+
+
+def pick_variant(file, hint, request=None):
+    """
+    힌트에 맞는 변환본 (클라이언트가 AVIF를 받으면 AVIF 우선, 없으면 None)
+    prefetch_related("variants")로 불러왔으면 추가 쿼리 없음
+    """
+    accept = request.META.get("HTTP_ACCEPT", "") if request else ""
+    variants = [variant for variant in file.variants.all() if variant.name == hint]
+    variants.sort(key=lambda v: v.format == "AVIF" and "image/avif" in accept)
+    return variants[-1] if variants else None
+
 
+class ImageHintMixin:
+    """
+    ?img=thumb|small|large 힌트가 있으면 file을 해당 크기 변환본 URL로 바꾸고
+    thumbnail은 빼서 목록 응답과 클라이언트가 받는 이미지 크기를 줄임
+    변환본이 없는 파일(이전 데이터, 이미지가 아닌 파일)은 그대로 반환
+    """
 
-class FileSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        hint = get_image_hint(self.context)
+        if hint is None or instance.file_type != "image":
+            return data
+        request = self.context.get("request")
+        variant = pick_variant(instance, hint, request)
+        if variant is not None:
+            url = variant.image.url
+            data["file"] = request.build_absolute_uri(url) if request else url
+            data.pop("thumbnail", None)
+        return data
+
+
+class FileSerializer(ImageHintMixin, serializers.ModelSerializer):
 
     class Meta:
         model = File
@@ -16,6 +76,7 @@ class FileSerializer(serializers.ModelSerializer):
             "file_name",
             "file_size",
             "thumbnail",
+            "status",
             "uploaded_at",
         ]
         read_only_fields = [
@@ -25,6 +86,7 @@ class FileSerializer(serializers.ModelSerializer):
             "file_name",
             "file_size",
             "thumbnail",
+            "status",
             "uploaded_at",
         ]
 
@@ -37,18 +99,68 @@ class FileSerializer(serializers.ModelSerializer):
             )  # None, "", 0, [] 등 Falsy 값이면
             category = category.lower()
 
-            for upload_file in request.FILES.getlist("file"):
+            options = {
+                "format": request.data.get("format", "webp").upper(),
+                "quality": int(request.data.get("quality", 85)),
+                "size": int(request.data.get("size", 500)) or None,
+            }
+            jobs = []
 
-                file = File(
-                    file=upload_file,
-                    user=request.user,
-                    category=category,
-                )
-                file.prepare(
-                    format=request.data.get("format", "webp").upper(),
-                    quality=int(request.data.get("quality", 85)),
-                    size=int(request.data.get("size", 500)) or None,
+            try:
+                for upload_file in request.FILES.getlist("file"):
+                    file_type = get_file_type(upload_file.name)
+
+                    # 큰 이미지는 백그라운드에서 변환 (원본은 저장하지 않고 변환 결과만 저장)
+                    # 업로드는 요청이 끝나면 사라지므로 청크 단위로 임시 파일에 복사해서 넘김
+                    if use_background(upload_file, file_type):
+                        file = File(
+                            user=request.user,
+                            category=category,
+                            file_name=upload_file.name,
+                            file_size=upload_file.size,
+                            file_type=file_type,
+                        )
+                        # 복사하면서 계산한 SHA-256으로 같은 내용이 이미 있으면 변환 없이 공유
+                        path, sha256 = copy_to_temp_file(upload_file)
+                        blob = FileBlob.acquire(
+                            sha256, get_blob_options(file_type, category, **options)
+                        )
+                        if blob:
+                            os.unlink(path)
+                            file.use_blob(blob)
+                        else:
+                            file.status = FileStatus.PROCESSING
+                            jobs.append((file, path, sha256))
+                        files.append(file)
+                        continue
+
+                    file = File(
+                        file=upload_file,
+                        user=request.user,
+                        category=category,
+                    )
+                    file.prepare(**options)
+                    files.append(file)
+
+                files = File.objects.bulk_create(files)
+                for file in files:
+                    file.save_pending()
+            except Exception:
+                # 저장하지 못한 파일이 미리 가져간 blob 참조는 돌려줌
+                for file in files:
+                    if file.pk is None:
+                        file.release_pending()
+                raise
+
+            # 커밋된 뒤에 변환 시작 (업로드의 여러 파일을 동시에 변환)
+            if jobs:
+                transaction.on_commit(
+                    lambda: [
+                        submit_image_job(
+                            file.id, path, sha256, category=file.category, **options
+                        )
+                        for file, path, sha256 in jobs
+                    ]
                 )
-                files.append(file)
 
-        return File.objects.bulk_create(files)  # 리스트 반환
+        return files  # 리스트 반환
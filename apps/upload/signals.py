@@ -1,60 +1,89 @@
-from django.contrib.auth import get_user_model
-from django.db.models.signals import post_delete, pre_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-
-from apps.leaders.models import LeaderApplication, LeaderCertificate
-from apps.meet.models import Meet
-from apps.posts.models import Post, PostImage
-
-User = get_user_model()
+from django.utils import timezone
+
+from apps.upload.models import File, FileBlob, FileVariant
+from apps.upload.references import adjust_ref_count, get_reference_models
+
+UNCHANGED = object()  # 이번 저장에서 file을 바꾸지 않음
+
+
+# File을 가리키는 모델(FILE_REFERENCES)이 파일을 연결/해제할 때마다 File.ref_count 갱신
+# 불러올 때마다 값을 기억하지 않고 저장 직전에만 DB의 기존 file_id를 조회
+def remember_file_id(sender, instance, raw=False, update_fields=None, **kwargs):
+    # update_fields는 필드 이름, 지연 로딩 인스턴스 저장 시에는 attname(file_id)으로 전달됨
+    if raw or (update_fields is not None and not {"file", "file_id"} & update_fields):
+        instance._old_file_id = UNCHANGED
+    elif instance._state.adding:
+        instance._old_file_id = None
+    else:
+        instance._old_file_id = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("file_id", flat=True)
+            .first()
+        )
+
+
+def update_file_ref_count(sender, instance, **kwargs):
+    old = instance.__dict__.pop("_old_file_id", UNCHANGED)
+    new = instance.__dict__.get("file_id")
+    if old is UNCHANGED or old == new:
+        return
+    if old is not None:
+        adjust_ref_count(old, -1)
+    if new is not None:
+        adjust_ref_count(new, 1)
 
 
-@receiver(post_delete, sender=User)
-@receiver(pre_delete, sender=Post)
-@receiver(pre_delete, sender=LeaderApplication)
-@receiver(post_delete, sender=Meet)
+# 연결한 레코드가 삭제되면 (유저/모임 삭제, 게시글/리더 신청 삭제 CASCADE 포함)
+# 참조 수를 줄이고 더 이상 쓰는 곳이 없으면 소프트 딜리트
+# 예전처럼 네 테이블을 UNION으로 확인하지 않고 참조 수만 봄
 def auto_delete_file_if_unused(sender, instance, **kwargs):
-    files_to_check = []
-
-    if sender == User or sender == Meet:
-        if instance.file:
-            files_to_check.append(instance.file)
-
-    elif sender == Post:
-        # Post가 삭제되기 전 관련 PostImage 객체에서 파일 수집
-        related_files = PostImage.objects.filter(post=instance)
-        for file in related_files:
-            files_to_check.append(file.file)
-
-    elif sender == LeaderApplication:
-        # LeaderApplication가 삭제되기 전 관련 LeaderCertificate 객체에서 파일 수집
-        related_files = LeaderCertificate.objects.filter(leader_application=instance)
-        for file in related_files:
-            files_to_check.append(file.file)
-
-    # 삭제할 파일이 없으면 종료
-    if not files_to_check:
+    file_id = instance.__dict__.get("file_id")
+    if file_id is None:
         return
+    adjust_ref_count(file_id, -1)
+    # 소프트 딜리트만 하므로 같은 blob을 쓰는 다른 File에는 영향 없음
+    # (하드 딜리트 시 blob 참조 수가 0이 되어야 저장소 파일 삭제)
+    File.objects.filter(id=file_id, ref_count=0, is_deleted=False).update(
+        is_deleted=True, deleted_at=timezone.now()
+    )
 
-    file_ids = [file.id for file in files_to_check]
 
-    queryset1 = User.objects.filter(file__in=file_ids).values_list("file_id", flat=True)
-    queryset2 = PostImage.objects.filter(file__in=file_ids).values_list(
-        "file_id", flat=True
-    )
-    queryset3 = LeaderCertificate.objects.filter(file__in=file_ids).values_list(
-        "file_id", flat=True
-    )
-    queryset4 = Meet.objects.filter(file__in=file_ids).values_list("file_id", flat=True)
+for model in get_reference_models():
+    pre_save.connect(remember_file_id, sender=model)
+    post_save.connect(update_file_ref_count, sender=model)
+    post_delete.connect(auto_delete_file_if_unused, sender=model)
+
+
+# 변환본 레코드가 삭제되면 (File 하드 딜리트 CASCADE 포함) 저장소의 파일도 삭제
+# 같은 blob을 쓰는 다른 File의 변환본이 같은 경로를 가리키면 남겨둠
+@receiver(post_delete, sender=FileVariant)
+def delete_variant_file(sender, instance, **kwargs):
+    def delete():
+        if not FileVariant.objects.filter(image=instance.image.name).exists():
+            instance.image.delete(save=False)
+
+    transaction.on_commit(delete)
+
 
-    used_file_ids = queryset1.union(queryset2, queryset3, queryset4)
+# File이 하드 딜리트되면 (queryset.delete() 포함) blob 참조 수 감소
+@receiver(post_delete, sender=File)
+def release_file_blob(sender, instance, **kwargs):
+    if instance.blob_id:
+        FileBlob.release(instance.blob_id)
 
-    # 실제로 삭제 대상인 파일만 추리기
-    unused_files = [file for file in files_to_check if file.id not in used_file_ids]
 
-    for file in unused_files:
+# 마지막 참조가 사라져 blob이 삭제되면 저장소 파일 삭제
+@receiver(post_delete, sender=FileBlob)
+def delete_blob_files(sender, instance, **kwargs):
+    def delete():
+        instance.file.delete(save=False)
+        if instance.thumbnail:
+            instance.thumbnail.delete(save=False)
 
-        file.delete()
+    transaction.on_commit(delete)
 
 
 # 모델의 삭제 동작 시그널 발생
@@ -76,7 +105,7 @@ def auto_delete_file_if_unused(sender, instance, **kwargs):
 
 # any() = or
 
-# 쿼리 직접 실행
+# 쿼리 직접 실행 (이전 방식, 지금은 File.ref_count 사용)
 # # 각각의 파일이 다른 모델에서도 사용 중인지 확인하고 미사용이면 삭제
 # from django.db import connection
 #     with connection.cursor() as cursor:
@@ -1,3 +1,183 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.upload.images import TEMP_FILE_PREFIX, transcode_image_file
+from apps.upload.models import (
+    File,
+    FileBlob,
+    FileStatus,
+    get_blob_options,
+    get_image_variants,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_PIPELINE = {
+    "ENABLED": True,
+    "WORKERS": 2,  # 이미지 변환 프로세스 수 (워커 프로세스마다)
+    "SYNC_MAX_BYTES": 256 * 1024,  # 이보다 작은 이미지는 요청 안에서 바로 변환
+    "STALE_AFTER": 30 * 60,  # 이 시간(초)이 지나도 처리 중이면 작업이 사라진 것으로 봄
+}
+
+_process_pool = None
+_thread_pool = None
+_pool_pid = None
+_lock = Lock()
+
+
+def get_image_pipeline_config():
+    return {**DEFAULT_IMAGE_PIPELINE, **getattr(settings, "IMAGE_PIPELINE", {})}
+
+
+def use_background(upload_file, file_type):
+    """요청 안에서 바로 변환하지 않고 백그라운드로 넘길 파일인지"""
+    config = get_image_pipeline_config()
+    return (
+        config["ENABLED"]
+        and file_type == "image"
+        and upload_file.size > config["SYNC_MAX_BYTES"]
+    )
+
+
+def get_pools():
+    """
+    (이미지 변환 프로세스 풀, 저장 스레드 풀)
+    gunicorn 워커처럼 fork된 프로세스에서는 부모의 풀을 쓰지 않고 새로 만듦
+    """
+    global _process_pool, _thread_pool, _pool_pid
+    with _lock:
+        if _process_pool is None or _pool_pid != os.getpid():
+            workers = get_image_pipeline_config()["WORKERS"]
+            # 자식 프로세스는 Django 없이 apps.upload.images만 불러서 실행
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="image-pipeline"
+            )
+            _pool_pid = os.getpid()
+        return _process_pool, _thread_pool
+
+
+def submit_image_job(
+    file_id,
+    source_path,
+    sha256,
+    format="WEBP",
+    quality=85,
+    size=None,
+    category=None,
+):
+    """
+    이미지 변환(카테고리별 변환본 포함)은 프로세스 풀에서, 변환 결과 업로드와 상태 저장은
+    스레드 풀에서 실행
+    프로세스 사이에는 임시 파일 경로만 주고받고, 저장까지 끝나면 완료되는 Future 반환
+    source_path 임시 파일은 작업이 끝나면 삭제, 저장한 결과는 원본 SHA-256의 blob으로 등록
+    """
+    process_pool, thread_pool = get_pools()
+    variants, variant_formats = get_image_variants(category)
+    transcoding = process_pool.submit(
+        transcode_image_file,
+        source_path,
+        format=format,
+        quality=quality,
+        size=size,
+        variants=variants,
+        variant_formats=variant_formats,
+    )
+    blob_key = (sha256, get_blob_options("image", category, format, quality, size))
+    return thread_pool.submit(
+        _finish_image_job, file_id, source_path, transcoding, format, blob_key
+    )
+
+
+def _finish_image_job(file_id, source_path, transcoding, format, blob_key):
+    paths = [source_path]
+    file = None
+    try:
+        image_path, thumb_path, renditions = transcoding.result()
+        paths += [image_path, thumb_path, *(r.out for r in renditions)]
+        file = File.objects.get(id=file_id)
+        # 변환하는 동안 같은 내용이 먼저 저장됐으면 업로드하지 않고 공유
+        if blob := FileBlob.acquire(*blob_key):
+            file.use_blob(blob)
+        else:
+            with open(image_path, "rb") as image, open(thumb_path, "rb") as thumbnail:
+                file.save_transcoded(image, thumbnail, format=format)
+            file.save_variants(renditions)
+            file.pending_blob = blob_key
+        file.status = FileStatus.READY
+        # save()에서 blob 등록 또는 참조 추가 (save_pending)
+        file.save(
+            update_fields=[
+                "file",
+                "file_name",
+                "file_size",
+                "thumbnail",
+                "status",
+                "blob",
+            ]
+        )
+    except Exception:
+        logger.exception("이미지 변환 실패: file_id=%s", file_id)
+        if file is not None:
+            file.release_pending()
+        File.objects.filter(id=file_id).update(status=FileStatus.FAILED)
+    finally:
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        close_old_connections()
+
+
+def sweep_stale_image_jobs(stale_after=None, dry_run=False):
+    """
+    변환 작업은 프로세스 안의 풀에서만 돌아서 서버가 재시작/비정상 종료되면 사라짐
+    stale_after(timedelta)가 지나도 처리 중인 파일은 실패로 바꾸고 남은 임시 파일을 삭제
+    (실패 처리된 파일은 클라이언트가 다시 업로드), (실패 처리한 파일 수, 삭제한 임시 파일 수) 반환
+    """
+    if stale_after is None:
+        stale_after = timedelta(seconds=get_image_pipeline_config()["STALE_AFTER"])
+    threshold = timezone.now() - stale_after
+    files = File.objects.filter(status=FileStatus.PROCESSING, uploaded_at__lt=threshold)
+
+    temp_dir = tempfile.gettempdir()
+    temp_paths = []
+    for entry in os.scandir(temp_dir):
+        if not entry.name.startswith(TEMP_FILE_PREFIX):
+            continue
+        try:
+            if entry.stat().st_mtime < time.time() - stale_after.total_seconds():
+                temp_paths.append(entry.path)
+        except OSError:  # 그 사이 작업이 끝나 삭제됨
+            continue
+
+    if dry_run:
+        return files.count(), len(temp_paths)
+
+    failed = files.update(status=FileStatus.FAILED)
+    removed = 0
+    for path in temp_paths:
+        try:
+            os.unlink(path)
+            removed += 1
+        except OSError:
+            pass
+    return failed, removed
+
+
 # from celery import shared_task
 # from django.utils.timezone import now
 # from datetime import timedelta
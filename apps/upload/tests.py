@@ -1,3 +1,479 @@
-from django.test import TestCase
+import os
+import time
+from datetime import timedelta
+from io import BytesIO
 
-# Create your tests here.
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PilImage
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.upload.models import File, FileBlob, FileStatus, FileVariant
+from apps.upload.serializers import FileSerializer
+
+User = get_user_model()
+
+
+def create_image(name, size):
+    buffer = BytesIO()
+    # 압축이 잘 안 되도록 무작위 픽셀
+    PilImage.frombytes("RGB", (size, size), os.urandom(size * size * 3)).save(
+        buffer, format="PNG"
+    )
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_images_are_transcoded_in_background(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_PIPELINE = {"SYNC_MAX_BYTES": 10 * 1024}
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.post(
+        "/api/files/upload",
+        {
+            "file": [
+                create_image("small.png", 10),
+                create_image("large1.png", 300),
+                create_image("large2.png", 300),
+            ],
+            "category": "post",
+        },
+        format="multipart",
+    )
+    assert response.status_code == 201
+    small_id, *large_ids = response.data["ids"]
+    assert response.data["processing"] == large_ids  # 작은 이미지는 요청 안에서 변환
+
+    # 변환이 끝날 때까지 상태 조회
+    url = f"/api/files/status?ids={','.join(map(str, response.data['ids']))}"
+    deadline = time.monotonic() + 30
+    while True:
+        results = client.get(url).data["results"]
+        if all(f["status"] != FileStatus.PROCESSING for f in results):
+            break
+        assert time.monotonic() < deadline
+        time.sleep(0.2)
+
+    assert {f["status"] for f in results} == {FileStatus.READY}
+    for f in results:
+        assert f["file_name"].endswith(".webp") and f["thumbnail"]
+    # 백그라운드 변환에서도 변환본 생성
+    assert FileVariant.objects.filter(file_id__in=large_ids).count() == 8
+
+
+@pytest.mark.django_db
+def test_stale_image_jobs_are_failed_and_temp_files_removed(tmp_path, monkeypatch):
+    import tempfile
+    from io import StringIO
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from apps.upload.images import TEMP_FILE_PREFIX
+
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    stale, running = File.objects.bulk_create(
+        [
+            File(user=user, status=FileStatus.PROCESSING),
+            File(user=user, status=FileStatus.PROCESSING),
+        ]
+    )
+    File.objects.filter(id=stale.id).update(
+        uploaded_at=timezone.now() - timedelta(hours=1)
+    )
+    leftover = tmp_path / f"{TEMP_FILE_PREFIX}leftover"
+    leftover.write_bytes(b"x")
+    an_hour_ago = time.time() - 60 * 60
+    os.utime(leftover, (an_hour_ago, an_hour_ago))
+    in_use = tmp_path / f"{TEMP_FILE_PREFIX}in-use"
+    in_use.write_bytes(b"x")
+    other = tmp_path / "other"
+    other.write_bytes(b"x")
+    os.utime(other, (an_hour_ago, an_hour_ago))
+
+    out = StringIO()
+    call_command("cleanup_stale_image_jobs", stdout=out)
+    assert "파일 1개 실패 처리, 임시 파일 1개 삭제" in out.getvalue()
+    assert dict(File.objects.values_list("id", "status")) == {
+        stale.id: FileStatus.FAILED,
+        running.id: FileStatus.PROCESSING,
+    }
+    assert [leftover.exists(), in_use.exists(), other.exists()] == [
+        False,
+        True,
+        True,
+    ]
+
+
+@pytest.mark.django_db
+def test_image_variants_are_selected_by_hint(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_PIPELINE = {"ENABLED": False}  # 요청 안에서 바로 변환
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.post(
+        "/api/files/upload",
+        {"file": [create_image("photo.png", 600)], "category": "post"},
+        format="multipart",
+    )
+    assert response.status_code == 201
+    file = File.objects.get(id=response.data["ids"][0])
+
+    # 한 번 디코딩해서 크기별로 생성 (원본보다 크게 늘리지 않음)
+    sizes = {v.name: (v.width, v.height) for v in file.variants.all()}
+    assert sizes == {
+        "icon": (64, 64),
+        "thumb": (160, 160),
+        "small": (500, 500),
+        "large": (600, 600),
+    }
+
+    factory = APIRequestFactory()
+    request = Request(factory.get("/"))
+    data = FileSerializer(file, context={"request": request}).data
+    assert data["file"].endswith(".webp") and "thumbnail" in data
+
+    request = Request(factory.get("/", {"img": "thumb"}))
+    data = FileSerializer(file, context={"request": request}).data
+    assert data["file"].endswith("_thumb.webp") and "thumbnail" not in data
+
+    # 프로필은 설정된 크기만
+    profile = File(file=create_image("profile.png", 300), user=user, category="profile")
+    profile.prepare()
+    profile.save()
+    assert set(profile.variants.values_list("name", flat=True)) == {
+        "icon",
+        "thumb",
+        "small",
+    }
+
+
+@pytest.mark.django_db
+def test_duplicate_uploads_share_blob(
+    settings, tmp_path, django_capture_on_commit_callbacks
+):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_PIPELINE = {"SYNC_MAX_BYTES": 100 * 1024}
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    client = APIClient()
+    client.force_authenticate(user)
+    image = create_image("photo.png", 100)
+    content = image.read()
+
+    def upload(name):
+        response = client.post(
+            "/api/files/upload",
+            {
+                "file": [SimpleUploadedFile(name, content, "image/png")],
+                "category": "post",
+            },
+            format="multipart",
+        )
+        assert response.status_code == 201 and response.data["processing"] == []
+        return File.objects.get(id=response.data["ids"][0])
+
+    first = upload("a.png")
+    stored = sorted(p for p in tmp_path.rglob("*") if p.is_file())
+    second = upload("b.png")
+
+    # 변환/업로드 없이 같은 저장소 파일을 가리킴
+    assert sorted(p for p in tmp_path.rglob("*") if p.is_file()) == stored
+    assert second.file.name == first.file.name
+    assert second.thumbnail.name == first.thumbnail.name
+    assert second.file_name == "b.webp"
+    assert second.blob_id == first.blob_id
+    assert second.blob.ref_count == 2
+    assert sorted(second.variants.values_list("image", flat=True)) == sorted(
+        first.variants.values_list("image", flat=True)
+    )
+
+    # 참조가 남아 있으면 저장소 파일 유지, 마지막 참조가 사라지면 삭제
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete(soft=False)
+    assert all(p.exists() for p in stored)
+    assert FileBlob.objects.get(id=second.blob_id).ref_count == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        File.objects.filter(id=second.id).delete()
+    assert not any(p.exists() for p in stored)
+    assert not FileBlob.objects.exists()
+
+
+@pytest.mark.django_db
+def test_blob_references_are_taken_atomically():
+    sha256 = "a" * 64
+    blob = FileBlob.objects.create(
+        sha256=sha256, options="post", file="a.webp", ref_count=1
+    )
+    assert FileBlob.acquire(sha256, "post").id == blob.id
+    FileBlob.release(blob.id)
+    blob.refresh_from_db()
+    assert blob.ref_count == 1
+
+    # 마지막 참조를 해제하는 중(0)인 blob은 가져가지 않고 새로 변환
+    FileBlob.objects.filter(id=blob.id).update(ref_count=0)
+    assert FileBlob.acquire(sha256, "post") is None
+
+    FileBlob.objects.filter(id=blob.id).update(ref_count=1)
+    FileBlob.release(blob.id)
+    assert not FileBlob.objects.exists()
+    FileBlob.release(blob.id)  # 이미 해제됨
+
+
+def test_download_from_url_returns_sha256(monkeypatch, caplog):
+    import hashlib
+
+    import requests
+
+    content = create_image("profile.png", 50).read()
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield content
+
+    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: FakeResponse())
+    file = File()
+    assert file.download_from_url("https://example.com/a.png") == (
+        hashlib.sha256(content).hexdigest()
+    )
+    assert file.file.read() == content
+
+    def fail(*args, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests, "get", fail)
+    assert File().download_from_url("https://example.com/a.png") is None
+    assert "URL 파일 다운로드 실패" in caplog.text
+
+
+@pytest.mark.django_db
+def test_file_ref_count_follows_references(caplog):
+    from django.utils import timezone
+
+    from apps.meet.models import Meet
+    from apps.upload.references import rebuild_ref_counts
+
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    first, second = File.objects.bulk_create([File(user=user), File(user=user)])
+
+    user.file = first
+    user.save()
+    meet = Meet.objects.create(
+        user=user, title="모임", application_deadline=timezone.now(), file=first
+    )
+    first.refresh_from_db()
+    assert first.ref_count == 2
+
+    # 불러온 인스턴스에서 파일을 바꾸면 이전 파일은 감소, 새 파일은 증가
+    user = User.objects.get(id=user.id)
+    user.file = second
+    user.save()
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.ref_count, second.ref_count) == (1, 1)
+
+    # file을 불러오지 않았거나 저장하지 않는 경우에도 DB 값과 비교
+    user = User.objects.only("id", "nickname").get(id=user.id)
+    user.nickname = "renamed"
+    user.save(update_fields=["nickname"])
+    user.file = first
+    user.save()
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.ref_count, second.ref_count) == (2, 0)
+    user.file = second
+    user.save()
+
+    # 0 아래로 내려가는 감소는 건너뛰고 로그로 남김
+    File.objects.filter(id=first.id).update(ref_count=0)
+    with caplog.at_level("WARNING", logger="apps.upload.references"):
+        meet.delete()
+    assert f"File {first.id}" in caplog.text
+
+    # 마지막 참조가 삭제되면 소프트 딜리트
+    first.refresh_from_db()
+    assert first.ref_count == 0 and first.is_deleted
+
+    # 시그널 없이 바뀐 값은 일괄로 복구
+    File.objects.update(ref_count=3)
+    assert rebuild_ref_counts(dry_run=True) == 2
+    assert rebuild_ref_counts() == 2
+    assert dict(File.objects.values_list("id", "ref_count")) == {
+        first.id: 0,
+        second.id: 1,
+    }
+
+
+@pytest.mark.django_db
+def test_cleanup_is_deleted_files_in_batches(settings, tmp_path):
+    from io import StringIO
+
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    settings.MEDIA_ROOT = tmp_path
+    settings.DJANGO_ENV = "local"
+    user = User.objects.create_user(
+        email="member@example.com", password="Testpass123!", nickname="member"
+    )
+    names = [default_storage.save(f"{i}.txt", ContentFile(b"x")) for i in range(4)]
+    files = File.objects.bulk_create(File(user=user, file=name) for name in names)
+    old = [file.id for file in files[:3]]
+    File.objects.filter(id__in=old).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=8)
+    )
+    File.objects.filter(id=files[3].id).update(
+        is_deleted=True, deleted_at=timezone.now() - timedelta(days=1)
+    )
+
+    out = StringIO()
+    call_command("cleanup_is_deleted_files", "--batch-size", "2", stdout=out)
+    assert "[배치 2] 누적 3개" in out.getvalue()
+    assert list(File.objects.values_list("id", flat=True)) == [files[3].id]
+    assert [default_storage.exists(name) for name in names] == [False] * 3 + [True]
+
+
+def test_batch_purger_checkpoint_depends_on_query():
+    from datetime import datetime, timezone
+
+    from utils.purge import BatchPurger
+
+    def purger(day):
+        cutoff = datetime(2025, 1, day, tzinfo=timezone.utc)
+        return BatchPurger("test", File.objects.filter(deleted_at__lt=cutoff))
+
+    later, earlier, same = purger(8), purger(1), purger(8)
+    # 조건이나 기준 시각이 다른 실행은 서로의 체크포인트를 이어받지 않음
+    assert later.checkpoint_key != earlier.checkpoint_key
+    assert later.checkpoint_key == same.checkpoint_key
+
+
+def test_merge_join_groups_keys_from_both_sides():
+    from apps.upload.reconcile import merge_join
+
+    left = [("a", 1), ("c", 2), ("d", 3)]
+    right = [("b", 10), ("c", 20), ("c", 21), ("e", 30)]
+    assert list(merge_join(iter(left), iter(right))) == [
+        ("a", [1], []),
+        ("b", [], [10]),
+        ("c", [2], [20, 21]),
+        ("d", [3], []),
+        ("e", [], [30]),
+    ]
+
+
+@pytest.mark.django_db
+def test_storage_reconciler_against_s3(settings):
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    from apps.upload.reconcile import StorageReconciler
+
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="bucket")
+        for key in [
+            "media/post/a.webp",
+            "media/post/a_thumb.webp",
+            "media/post/orphan1.webp",
+            "media/post/orphan2.webp",
+            "media/profile/orphan3.webp",
+        ]:
+            client.put_object(Bucket="bucket", Key=key, Body=b"x")
+        File.objects.create(file="post/a.webp", thumbnail="post/a_thumb.webp")
+        missing = File.objects.create(file="post/missing.webp")
+
+        def reconciler(**kwargs):
+            return StorageReconciler("test", client, "bucket", **kwargs)
+
+        def s3_keys():
+            response = client.list_objects_v2(Bucket="bucket")
+            return [obj["Key"] for obj in response.get("Contents", [])]
+
+        # dry-run은 세기만 함
+        stats = reconciler().delete_s3_orphans(dry_run=True, grace=timedelta(0))
+        assert (stats.orphans, stats.deleted) == (3, 0) and len(s3_keys()) == 5
+
+        # 첫 배치 뒤 중단되면 체크포인트부터 이어서 실행
+        def interrupt(stats, keys):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            reconciler(prefix="post/", batch_size=1).delete_s3_orphans(
+                grace=timedelta(0), on_batch=interrupt
+            )
+        stats = reconciler(prefix="post/", batch_size=1).delete_s3_orphans(
+            grace=timedelta(0)
+        )
+        assert stats.resumed_from == "post/orphan1.webp" and stats.deleted == 1
+        assert s3_keys() == [
+            "media/post/a.webp",
+            "media/post/a_thumb.webp",
+            "media/profile/orphan3.webp",
+        ]
+
+        # 최근에 올라온 파일은 남김
+        assert reconciler().delete_s3_orphans().deleted == 0
+
+        # 삭제에 실패한 키가 있으면 보고하고 체크포인트를 그 뒤로 옮기지 않음
+        delete_objects = client.delete_objects
+
+        def fail_profile(**kwargs):
+            objects = kwargs["Delete"]["Objects"]
+            failed = [obj for obj in objects if obj["Key"].startswith("media/profile/")]
+            kwargs["Delete"]["Objects"] = [obj for obj in objects if obj not in failed]
+            response = delete_objects(**kwargs) if kwargs["Delete"]["Objects"] else {}
+            response["Errors"] = [
+                {"Key": obj["Key"], "Code": "AccessDenied", "Message": "denied"}
+                for obj in failed
+            ]
+            return response
+
+        for key in ["media/post/orphan5.webp", "media/profile/orphan4.webp"]:
+            client.put_object(Bucket="bucket", Key=key, Body=b"x")
+        client.delete_objects = fail_profile
+        stats = reconciler(batch_size=1).delete_s3_orphans(grace=timedelta(0))
+        client.delete_objects = delete_objects
+        assert stats.failed == [
+            "media/profile/orphan3.webp",
+            "media/profile/orphan4.webp",
+        ]
+        assert stats.deleted == 1
+        assert reconciler().get_checkpoint() == "post/orphan5.webp"
+
+        stats = reconciler(batch_size=1).delete_s3_orphans(grace=timedelta(0))
+        assert stats.resumed_from == "post/orphan5.webp"
+        assert (stats.deleted, stats.failed) == (2, [])
+        assert reconciler().get_checkpoint() == ""
+
+        # S3에 없는 File 레코드 삭제
+        stats = reconciler().delete_db_orphans()
+        assert stats.deleted == 1
+        assert not File.objects.filter(id=missing.id).exists()
+        assert File.objects.count() == 1
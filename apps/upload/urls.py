@@ -1,12 +1,13 @@
 from django.urls import path
 
-from .views import FileDeleteView, FileListView, FileUploadView
+from .views import FileDeleteView, FileListView, FileStatusView, FileUploadView
 
 prefix = "files"
 
 urlpatterns = [
     path(prefix + "/list", FileListView.as_view(), name="list"),
     path(prefix + "/upload", FileUploadView.as_view(), name="upload"),
+    path(prefix + "/status", FileStatusView.as_view(), name="status"),
     path(prefix + "/delete", FileDeleteView.as_view(), name="delete"),
     # path(prefix+"/page", file_manager_view, name="file-manager-page"),
 ]
@@ -19,7 +19,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from utils.pagination import CustomPageNumberPagination
 
-from .models import File
+from .models import File, FileStatus
 from .serializers import FileSerializer
 
 logger = logging.getLogger(__name__)
@@ -78,11 +78,20 @@ class FileUploadView(CreateAPIView):
             response_serializer.data[0] if response_serializer.data else None
         )
 
-        # id만 추출하여 응답
+        # id만 추출하여 응답 (백그라운드에서 변환 중인 파일은 processing에 따로 표시)
         ids = [file["id"] for file in response_serializer.data]
+        processing = [
+            file["id"]
+            for file in response_serializer.data
+            if file["status"] == FileStatus.PROCESSING
+        ]
 
         return Response(
-            {"message": "파일 업로드를 성공했습니다.", "ids": ids},
+            {
+                "message": "파일 업로드를 성공했습니다.",
+                "ids": ids,
+                "processing": processing,
+            },
             status=status.HTTP_201_CREATED,
             headers=headers,
         )
@@ -91,6 +100,38 @@ class FileUploadView(CreateAPIView):
         return serializer.save()
 
 
+class FileStatusView(GenericAPIView):
+    queryset = File.objects.all()
+    permission_classes = [IsAuthenticated]  # 인증된 사용자만 데이터 접근 가능
+    authentication_classes = [JWTAuthentication]  # JWT 인증
+    serializer_class = FileSerializer
+
+    @swagger_auto_schema(
+        tags=["업로드"],
+        operation_summary="파일 처리 상태 조회",
+        operation_description="업로드 응답의 processing ids로 이미지 변환이 끝났는지 확인합니다. "
+        "status: processing(처리 중), ready(완료), failed(실패)",
+        manual_parameters=[
+            openapi.Parameter(
+                "ids",
+                openapi.IN_QUERY,
+                description="파일 id 목록 (쉼표로 구분)",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        try:
+            ids = [int(i) for i in request.query_params.get("ids", "").split(",") if i]
+        except ValueError:
+            return Response({"detail": "List of IDs expected."}, status=400)
+
+        files = self.get_queryset().filter(user=request.user, id__in=ids)
+        serializer = self.get_serializer(files, many=True)
+        return Response({"results": serializer.data}, status=status.HTTP_200_OK)
+
+
 class FileDeleteView(DestroyModelMixin, GenericAPIView):
     queryset = File.objects.all()
     permission_classes = [IsAuthenticated]  # 인증된 사용자만 데이터 접근 가능
@@ -158,7 +199,10 @@ class FileDeleteView(DestroyModelMixin, GenericAPIView):
             delete_objects = []
 
             # 파일과 썸네일의 S3 키 수집
+            # blob을 쓰는 파일은 다른 File과 공유하므로 제외 (참조가 0이 되면 시그널에서 삭제)
             for file in files:
+                if file.blob_id:
+                    continue
                 if file.file:
                     file_key = f"{file.file.storage.location}/{file.file.name}"
                     delete_objects.append({"Key": file_key})
@@ -3,7 +3,10 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from apps.options.models import Interest
-from apps.options.serializers.area import AreaWithFullPathSerializer
+from apps.options.serializers.area import (
+    AreaFullPathField,
+    AreaWithFullPathSerializer,
+)
 from apps.options.serializers.digital_level import DigitalLevelSerializer
 from apps.options.serializers.interest import InterestSerializer
 from apps.upload.serializers import FileSerializer
@@ -25,7 +28,7 @@ class RoleSerializer(serializers.ModelSerializer):
 
 class AdminUserListSerializer(serializers.ModelSerializer):
     # age_group = serializers.CharField(source="age_group.name", read_only=True)
-    area = serializers.CharField(source="area.full_path", read_only=True)
+    area = AreaFullPathField()
     interests = serializers.SlugRelatedField(
         slug_field="interest_name", read_only=True, many=True
     )
@@ -42,8 +42,9 @@ class AdminUserViewSet(ModelViewSet):
     def get_queryset(self):
 
         if self.action == "list":
+            # 지역 전체 경로는 메모리의 지역 트리에서 가져오므로 area 조인 불필요
             queryset = User.objects.select_related(
-                "area", "area__parent", "area__parent__parent", "digital_level", "file"
+                "digital_level", "file"
             ).prefetch_related("interests")
             query = self.request.query_params
             q = Q()
@@ -96,7 +97,7 @@ class AdminUserViewSet(ModelViewSet):
 
         elif self.action == "retrieve":
             return User.objects.select_related(
-                "area", "area__parent", "area__parent__parent", "digital_level", "file"
+                "area", "digital_level", "file"
             ).prefetch_related("interests")
 
         else:
@@ -148,12 +148,13 @@ class OAuthCallbackView(APIView, ABC):
                     category=FileCategory.PROFILE,
                 )
 
-                if file_instance.download_from_url(profile_image):
+                if sha256 := file_instance.download_from_url(profile_image):
                     # 파일 전처리
                     file_instance.prepare(
                         format=request.data.get("format", "webp").upper(),
                         quality=int(request.data.get("quality", 85)),
                         size=int(request.data.get("size", 500)) or None,
+                        sha256=sha256,
                     )
 
                 # 파일 저장
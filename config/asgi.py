@@ -16,6 +16,7 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
 from channels.routing import ProtocolTypeRouter, URLRouter
 
+from apps.chat.lifespan import lifespan_app
 from apps.chat.middleware import JWTAuthMiddleware
 from apps.chat.routing import websocket_urlpatterns
 
@@ -25,5 +26,6 @@ application = ProtocolTypeRouter(
         "websocket": JWTAuthMiddleware(  # WebSocket 요청 처리
             URLRouter(websocket_urlpatterns)
         ),
+        "lifespan": lifespan_app,  # 서버 종료 시 채팅 메시지 저장 마무리
     }
 )
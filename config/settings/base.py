@@ -152,6 +152,38 @@ CHANNEL_LAYERS = {
     },
 }
 
+# 채팅 메시지 지연 저장 (apps/chat/services/message_writer.py)
+# 메시지를 큐에 넣고 백그라운드에서 바로 bulk_create (저장 중에 들어온 메시지는 다음 배치로 묶음)
+CHAT_WRITE_BEHIND = {
+    "ENABLED": True,
+    "BATCH_SIZE": 100,
+    "MAX_QUEUE_SIZE": 10000,
+    "PUT_TIMEOUT": 1.0,  # 큐가 가득 찼을 때 기다리는 최대 시간, 초과하면 전송 거부
+}
+
+# 채팅방 접속자 (apps/chat/services/presence.py)
+# 채널 레이어가 Redis면 Redis에, InMemory면 프로세스 메모리에 저장
+CHAT_PRESENCE = {
+    "HEARTBEAT_INTERVAL": 30,  # 연결마다 접속 상태를 갱신하는 주기 (초)
+    "TTL": 90,  # 갱신이 끊긴 접속자를 정리하는 시간 (초)
+    "COALESCE_WINDOW": 0.5,  # 입장/퇴장 변경분을 모아서 보내는 간격 (초)
+}
+
+# 오래된 채팅 메시지 보관 (apps/chat/services/archive.py)
+CHAT_ARCHIVE = {
+    "AFTER_DAYS": 90,  # 이 기간이 지난 메시지를 압축 파일로 옮김 (일)
+    "SEGMENT_SIZE": 1000,  # 파일 하나에 담을 최대 메시지 수
+    "PATH_PREFIX": "chat-archive",  # 보관 파일 저장소(STORAGES["chat_archive"]) 내 경로
+}
+
+# 로컬/테스트는 프로세스 메모리 캐시 (운영은 prod.py에서 Redis로 교체)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "KEY_PREFIX": "onda",
+    },
+}
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
@@ -219,6 +251,18 @@ STATIC_ROOT = BASE_DIR / ".static_root"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# 채팅 보관 파일처럼 공개하면 안 되는 파일 (MEDIA_URL로 서빙하지 않고 앱을 통해서만 읽음)
+PRIVATE_MEDIA_ROOT = BASE_DIR / "private_media"
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    "chat_archive": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": PRIVATE_MEDIA_ROOT},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -276,6 +320,25 @@ SWAGGER_SETTINGS = {
 # DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB (요청 본문 전체 용량 제한)
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB (파일 개별 용량 제한)
 
+# 업로드 이미지 변환 (apps/upload/tasks.py)
+IMAGE_PIPELINE = {
+    "ENABLED": True,
+    "WORKERS": 2,  # 워커 프로세스마다 이미지 변환에 쓰는 프로세스 수
+    "SYNC_MAX_BYTES": 256 * 1024,  # 이보다 작은 이미지는 요청 안에서 바로 변환
+    # 이 시간(초)이 지나도 처리 중이면 cleanup_stale_image_jobs가 실패 처리 (주기적으로 실행)
+    "STALE_AFTER": 30 * 60,
+}
+
+# 업로드 이미지 크기별 변환본 (?img=thumb|small|large 힌트로 선택)
+IMAGE_VARIANTS = {
+    "SIZES": {"icon": 64, "thumb": 160, "small": 500, "large": 1280},
+    "CATEGORIES": {
+        "profile": ["icon", "thumb", "small"],
+        "certificate": [],  # 증명서는 변환본 없음
+    },
+    "FORMATS": ["WEBP"],  # "AVIF" 추가 시 Pillow AVIF 지원 필요
+}
+
 
 # Email
 # from django.core.mail.backends.smtp import EmailBackend
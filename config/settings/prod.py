@@ -26,6 +26,15 @@ DATABASES = {
     }
 }
 
+# 모든 워커가 함께 쓰는 캐시 (채널 레이어와 같은 Redis, DB 번호만 분리)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": ENV.get("REDIS_CACHE_URL", "redis://127.0.0.1:6379/1"),
+        "KEY_PREFIX": "onda",
+    },
+}
+
 # S3 사용시 설정
 # STORAGES['staticfiles'] 설정이 존재하면,
 # Django는 STATIC_ROOT를 무시하고 대신 S3에 업로드.
@@ -58,6 +67,22 @@ STORAGES = {
             "default_acl": "public-read",
         },
     },
+    # 채팅 보관 파일은 공개 ACL 없이 별도 경로에 저장하고 앱에서만 읽음 (공개 URL 없음)
+    "chat_archive": {
+        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "OPTIONS": {
+            "access_key": ENV.get("S3_ACCESS_KEY", ""),
+            "secret_key": ENV.get("S3_SECRET_ACCESS_KEY", ""),
+            "bucket_name": ENV.get(
+                "S3_PRIVATE_BUCKET_NAME", ENV.get("S3_STORAGE_BUCKET_NAME", "")
+            ),
+            "region_name": ENV.get("S3_REGION_NAME", ""),
+            "location": "private",
+            "default_acl": "private",
+            "querystring_auth": True,
+            "file_overwrite": False,
+        },
+    },
 }
 
 # custom_domain이 설정되어 있으면, 이 도메인을 사용해서 URL을 생성
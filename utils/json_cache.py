@@ -0,0 +1,61 @@
+import hashlib
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class JSONBlob(NamedTuple):
+    content: bytes  # 인코딩이 끝난 JSON
+    etag: str
+    last_modified: int | None  # epoch 초
+
+
+def encode_json_blob(data, last_modified=None):
+    """data를 JSON 바이트로 인코딩하고 내용 해시로 강한 ETag를 만듦"""
+    content = JSONRenderer().render(data)
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return JSONBlob(content, etag, last_modified)
+
+
+def get_or_build_json_blob(key, build, last_modified=None, timeout=None):
+    """
+    캐시에 저장된 JSON 바이트를 꺼내고, 없을 때만 build() 결과를 한 번 인코딩해서 저장
+    key에는 데이터 버전이 포함되어 있어야 함 (버전이 바뀌면 새로 만들어짐)
+    """
+    if (cached := cache.get(key)) is not None:
+        return JSONBlob(*cached)
+
+    blob = encode_json_blob(build(), last_modified)
+    cache.set(key, tuple(blob), timeout)
+    return blob
+
+
+class PrebuiltJSONResponse(Response):
+    """미리 인코딩해 둔 JSON 바이트를 렌더러를 거치지 않고 그대로 내려보내는 응답"""
+
+    def __init__(self, blob, data=None, **kwargs):
+        super().__init__(data, **kwargs)
+        self.blob = blob
+        self["ETag"] = blob.etag
+        if blob.last_modified is not None:
+            self["Last-Modified"] = http_date(blob.last_modified)
+
+    @property
+    def rendered_content(self):
+        self["Content-Type"] = "application/json"
+        return self.blob.content
+
+
+def json_blob_response(request, blob, data=None, headers=None):
+    """If-None-Match / If-Modified-Since가 맞으면 304, 아니면 저장된 바이트 그대로 응답"""
+    response = PrebuiltJSONResponse(blob, data, headers=headers)
+    return get_conditional_response(
+        request,
+        etag=blob.etag,
+        last_modified=blob.last_modified,
+        response=response,
+    )
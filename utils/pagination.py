@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -8,3 +15,161 @@ class CustomPageNumberPagination(PageNumberPagination):
 
 
 # 클라이언트가 ?page_size=20 식으로 요청 가능
+
+
+class CreatedAtCursorPagination(BasePagination):
+    """
+    (created_at, id) 키셋 기반 커서 페이지네이션 (최신순)
+    OFFSET 없이 마지막으로 본 행 다음부터 인덱스로 바로 읽으므로 뒤 페이지도 첫 페이지와 속도가 같음
+    모델에 (created_at, id) 복합 인덱스가 있어야 함
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    count_query_param = "count"  # ?count=false 면 전체 개수(COUNT 쿼리) 생략
+    include_count = True
+    ordering = ("-created_at", "-id")
+
+    invalid_cursor_message = "잘못된 커서입니다."
+    cursor_query_description = "이전 응답의 next/previous에 들어 있는 커서 값"
+    page_size_query_description = "페이지당 개수 (max_page_size까지)"
+    count_query_description = "false면 전체 개수(count) 생략"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        self.count = None
+        if self.get_include_count(request):
+            self.count = queryset.count()
+
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by(*self.ordering)
+        else:
+            reverse, created_at, pk = cursor
+            if reverse:
+                # 이전 페이지: 기준보다 최신인 행을 오래된 순으로 읽은 뒤 뒤집음
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by("created_at", "id")
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by(*self.ordering)
+
+        # 한 건 더 읽어서 다음 페이지가 있는지 확인 (COUNT 없이)
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None and (has_more if reverse else True)
+        return results
+
+    def get_paginated_response(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            response = {"count": self.count, **response}
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        """스웨거(drf_yasg) 응답 스키마, count는 ?count=false면 빠지므로 필수가 아님"""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """스웨거(drf_yasg) 쿼리 파라미터"""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.page_size_query_description,
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.count_query_description,
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_include_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() not in ("false", "0", "no")
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, instance, reverse):
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(instance, reverse),
+        )
+
+    def encode_cursor(self, instance, reverse):
+        raw = f"{int(reverse)}|{instance.created_at.isoformat()}|{instance.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            reverse, created_at, pk = (
+                base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+            )
+            return reverse == "1", datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,112 @@
+import hashlib
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULT_BATCH_SIZE = 1000
+CHECKPOINT_TIMEOUT = 60 * 60 * 24 * 7  # 중단된 작업을 이어갈 수 있는 기간
+
+
+@dataclass
+class PurgeStats:
+    deleted: int = 0  # 대상 모델에서 지운 행 수 (CASCADE 제외)
+    batches: int = 0
+    elapsed: float = 0.0  # 초
+    last_id: int = 0  # 마지막으로 처리한 id (체크포인트)
+    resumed_from: int = 0  # 체크포인트에서 이어서 시작한 id
+
+    @property
+    def rate(self):
+        """초당 삭제 행 수"""
+        return self.deleted / self.elapsed if self.elapsed else 0.0
+
+
+class BatchPurger:
+    """
+    대상 쿼리셋을 id 순으로 batch_size개씩 끊어서 삭제하는 범용 삭제 작업
+    - 배치마다 (마지막 id, 배치 끝 id] 구간만 지우므로 한 번에 잠그는 범위가 제한됨
+    - 배치가 끝날 때마다 마지막 id를 캐시에 체크포인트로 저장해 중단돼도 이어서 실행
+    - 체크포인트 키에 쿼리(조건, 기준 시각 포함)의 해시를 넣어 조건이 같은 실행만 이어받음
+      기준 시각을 매번 now()로 잡으면 이어받을 수 없으므로 날짜 단위로 잘라서 넘길 것
+    - QuerySet.delete()를 사용하므로 CASCADE와 삭제 시그널은 그대로 동작
+
+    예) BatchPurger("upload.file", File.objects.filter(is_deleted=True, ...)).run()
+    """
+
+    def __init__(self, name, queryset, batch_size=DEFAULT_BATCH_SIZE, sleep=0.0):
+        if batch_size <= 0:
+            raise ValueError("batch_size는 1 이상이어야 합니다.")
+        self.name = name
+        self.queryset = queryset.order_by()
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.scope = hashlib.sha1(str(self.queryset.query).encode()).hexdigest()[:12]
+
+    @property
+    def checkpoint_key(self):
+        return f"purge:{self.name}:{self.scope}:last_id"
+
+    def get_checkpoint(self):
+        return cache.get(self.checkpoint_key, 0)
+
+    def reset(self):
+        cache.delete(self.checkpoint_key)
+
+    def estimate(self):
+        """삭제 예정 행 수 (dry-run, 체크포인트 이후만)"""
+        return self.queryset.filter(pk__gt=self.get_checkpoint()).count()
+
+    def next_upper_bound(self, last_id):
+        """이번 배치의 마지막 id (남은 행이 batch_size보다 적으면 None)"""
+        return (
+            self.queryset.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[self.batch_size - 1 : self.batch_size]
+            .first()
+        )
+
+    def run(self, on_batch=None, before_delete=None):
+        """
+        끝까지 삭제하고 PurgeStats 반환
+        on_batch(stats)는 배치마다 호출 (진행 상황 출력용)
+        before_delete(배치 쿼리셋)는 배치를 지우기 직전에 호출 (저장소 파일 정리 등)
+        """
+        stats = PurgeStats(last_id=self.get_checkpoint())
+        stats.resumed_from = stats.last_id
+        started = time.monotonic()
+
+        while True:
+            upper = self.next_upper_bound(stats.last_id)
+            batch = self.queryset.filter(pk__gt=stats.last_id)
+            if upper is not None:
+                batch = batch.filter(pk__lte=upper)
+            else:
+                # 마지막 배치: 남은 행의 최대 id까지
+                upper = batch.order_by("-pk").values_list("pk", flat=True).first()
+                if upper is None:
+                    break
+
+            if before_delete is not None:
+                before_delete(batch)
+            # 조건은 서브쿼리로 넘겨 id 목록을 메모리에 올리지 않음
+            model = self.queryset.model
+            with transaction.atomic():
+                _, per_model = model._base_manager.filter(
+                    pk__in=batch.values("pk")
+                ).delete()
+            stats.deleted += per_model.get(model._meta.label, 0)
+            stats.batches += 1
+            stats.last_id = upper
+            stats.elapsed = time.monotonic() - started
+            cache.set(self.checkpoint_key, upper, CHECKPOINT_TIMEOUT)
+
+            if on_batch is not None:
+                on_batch(stats)
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        stats.elapsed = time.monotonic() - started
+        self.reset()  # 끝까지 돌았으면 다음 실행은 처음부터
+        return stats